@@ -1,16 +1,23 @@
-from langgraph.graph import StateGraph, END, START
 from agentic.utils.model_loader import load_model
-from agentic.prompt_library.prompt import SYSTEM_PROMPT
+from agentic.utils.llm_cache import CachedChatModel
+from agentic.utils.json_stream import TicketStreamParser
+from agentic.prompt_library.prompt import (
+    SYSTEM_PROMPT, TICKET_GENERATION_PROMPT, ROLLING_STANDUP_SUMMARY_PROMPT, FULL_STANDUP_SUMMARY_PROMPT
+)
+import contextvars
 import datetime
+import os
+import re
 import time
 import json
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 # Tool imports
 from agentic.tool.firebase_tool import (
     write_project_summary, get_dev_profiles, create_ticket, 
     get_project_tickets, get_scrum_history, save_scrum_cycle_summary,
-    get_project_config, update_project_config
+    get_project_config, update_project_config, update_ticket_status
 )
 from agentic.tool.vector_retriever import get_vector_retriever
 from agentic.tool.scrum_timer import (
@@ -24,11 +31,36 @@ from agentic.tool.ticket_generator import (
     optimize_ticket_assignment, create_sprint_plan
 )
 from agentic.utils.firebase_client import get_firestore
+from agentic.utils.firestore_batch import atomic_writes, write_buffer, doc_set
+from agentic.utils.workload_aggregates import record_ticket_created
+from agentic.utils.ticket_store import server_stamped, ticket_ref
+from agentic.utils.project_view import get_project_view
+from agentic.utils.checkpoint_store import checkpoint_node, get_checkpoint_store
+from agentic.utils.concurrency import run_concurrently
+from agentic.logger.metrics import instrument_node, instrument_tools
+from agentic.utils.firestore_cache import snapshot_cache, cached_get
+from agentic.utils.prompt_packer import pack_sections, record_llm_latency
+from agentic.utils.standup_watcher import get_standup_watcher
+from agentic.utils.rolling_summary import (
+    SCRUM_SUMMARY_MODE, get_rolling_context, format_rolling_history, make_digest, update_rollups
+)
+
+
+# Stream ticket generation and persist tickets as they are parsed
+TICKET_STREAMING = os.getenv("TICKET_STREAMING", "true").lower() in ("1", "true", "yes")
+
+# Graph nodes in cycle order. A run enters at one of them (see `_entry_node`) and ends after ManageCycle.
+GRAPH_NODES = (
+    "StoreProjectContext", "GatherContext", "GenerateTickets", "WaitForStandups", "SummarizeStandups", "ManageCycle"
+)
 
-# Agent helpers
-from langchain.agents import create_openai_functions_agent, AgentExecutor
-from langgraph.prebuilt import ToolNode, tools_condition
-from langchain_core.prompts import ChatPromptTemplate
+def graph_node_name(name):
+    """The graph node for a `next_node` value, which nodes write in snake_case ("gather_context"); None if unknown."""
+    if not name:
+        return None
+    if "_" in name or name.islower():
+        name = "".join(part.capitalize() for part in name.split("_"))
+    return name if name in GRAPH_NODES else None
 
 
 class ScrumGraphBuilder:
@@ -40,58 +72,207 @@ class ScrumGraphBuilder:
         self.tools = [
             write_project_summary, get_dev_profiles, create_ticket, 
             get_project_tickets, get_scrum_history, save_scrum_cycle_summary,
-            get_project_config, update_project_config,
+            get_project_config, update_project_config, update_ticket_status,
             is_scrum_time_reached, get_cycle_timing_info, set_cycle_start_time,
             get_all_standups, get_standup_status, get_standup_summary_data,
             generate_project_tickets, analyze_developer_workload, 
             optimize_ticket_assignment, create_sprint_plan
         ]
+        # Every tool call is timed in scrum_tool_duration_seconds
+        instrument_tools(self.tools)
 
         self.llm_with_tools = self.llm.bind_tools(tools=self.tools)
+        # Node inputs and outputs are checkpointed per project and cycle, so runs can resume (CHECKPOINTS_ENABLED)
+        self.checkpoints = get_checkpoint_store()
         self.graph = None
 
     def _log(self, message):
         now = datetime.datetime.now(datetime.timezone.utc).isoformat()
         print(f"[SCRUM-WORKFLOW][{now}] {message}")
 
+    def _stream_llm(self, prompt, state=None):
+        if state and state.get("bypass_llm_cache") and isinstance(self.llm, CachedChatModel):
+            return self.llm.stream(prompt, bypass_cache=True)
+        return self.llm.stream(prompt)
+
+    @staticmethod
+    def _parse_ticket_map(content):
+        try:
+            return json.loads(content)
+        except Exception:
+            # fallback: try to extract JSON from the response
+            match = re.search(r'\{[\s\S]*\}', content)
+            if match:
+                return json.loads(match.group(0))
+            return {}
+
+    @staticmethod
+    def _make_ticket_doc(dev_id, ticket):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return {
+            "id": str(uuid.uuid4()),
+            "title": ticket.get("title", ""),
+            "description": ticket.get("description", ""),
+            "priority": ticket.get("priority", "medium"),
+            "estimated_hours": ticket.get("estimated_hours", 8),
+            "assigned_dev_id": dev_id,
+            "status": "todo",
+            "created_at": now,
+            "updated_at": now
+        }
+
+    @staticmethod
+    def _store_ticket(db, project_id, ticket_doc):
+        # The ticket and its developer's workload counters are committed in the same batch
+        with atomic_writes(db):
+            doc_set(ticket_ref(db, project_id, ticket_doc["id"]), server_stamped(ticket_doc))
+            record_ticket_created(db, project_id, ticket_doc)
+
+    def _invoke_llm(self, prompt, state=None):
+        # Set "bypass_llm_cache" in the graph state to force fresh completions for a run
+        start = time.perf_counter()
+        if state and state.get("bypass_llm_cache") and isinstance(self.llm, CachedChatModel):
+            response = self.llm.invoke(prompt, bypass_cache=True)
+        else:
+            response = self.llm.invoke(prompt)
+        # Cache hits say nothing about model latency, so only real calls feed the prompt packer
+        if not (getattr(response, "response_metadata", None) or {}).get("cache_hit"):
+            record_llm_latency(time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def _project_summary_prompt(project_description):
+        return f"""
+        Summarize the following project description for a software engineering team. Focus on the main goals, features, and technical stack. Be concise and clear.
+        
+        Project Description:
+        {project_description}
+        """
+
+    def _ticket_prompt(self, dev_profiles, project_context_docs):
+        # Truncate each doc to 300 chars
+        project_context = "\n".join([doc.page_content[:300] for doc in project_context_docs])
+        # Pack dev profiles and project context into the token budget
+        sections, packing = pack_sections([
+            {"name": "dev_profiles", "text": json.dumps(dev_profiles, indent=2), "priority": 2},
+            {"name": "project_context", "text": project_context, "priority": 1}
+        ], fixed_text=TICKET_GENERATION_PROMPT.format(project_context="", dev_profiles=""))
+        self._log_packing(packing)
+        return TICKET_GENERATION_PROMPT.format(**sections)
+
+    def _standup_summary_prompt(self, current_cycle, standup_data, project_summary, context):
+        """Build the SummarizeStandups prompt from the node's reads, packed into the token budget (current standups matter most)."""
+        if "rolling_context" in context:
+            template = ROLLING_STANDUP_SUMMARY_PROMPT
+            sections = [
+                {"name": "current_standups", "text": str(standup_data['standups']), "priority": 4},
+                {"name": "project_summary", "text": project_summary, "priority": 3},
+                {"name": "rolling_history", "text": format_rolling_history(context["rolling_context"]), "priority": 2},
+                {"name": "current_tickets", "text": str(standup_data['tickets']), "priority": 1}
+            ]
+        else:
+            scrum_history = context["scrum_history"]
+            all_tickets = context["all_tickets"]
+            all_standups = context["all_standups"]
+
+            scrum_history_str = "\n".join([
+                f"Cycle {c.get('cycle_number', '?')}: {c.get('summary', '')}" for c in scrum_history
+            ]) if scrum_history else "No previous cycles."
+
+            all_tickets_str = "\n".join([
+                f"{t.get('title', '')} (Assigned: {t.get('assigned_dev_id', '')}, Status: {t.get('status', '')})" for t in all_tickets
+            ]) if all_tickets else "No tickets."
+
+            all_standups_str = "\n".join([
+                f"Cycle {s.get('cycle', '?')} - {s.get('dev_id', '')}: {s.get('text', s.get('yesterday_work', ''))}" for s in all_standups
+            ]) if all_standups else "No standups."
+
+            template = FULL_STANDUP_SUMMARY_PROMPT
+            sections = [
+                {"name": "current_standups", "text": str(standup_data['standups']), "priority": 5},
+                {"name": "project_summary", "text": project_summary, "priority": 4},
+                {"name": "current_tickets", "text": str(standup_data['tickets']), "priority": 3},
+                {"name": "scrum_history", "text": scrum_history_str, "priority": 2},
+                {"name": "all_tickets", "text": all_tickets_str, "priority": 1},
+                {"name": "all_standups", "text": all_standups_str, "priority": 0}
+            ]
+        packed, packing = pack_sections(
+            sections, fixed_text=template.format(current_cycle=current_cycle, **{s["name"]: "" for s in sections})
+        )
+        self._log_packing(packing)
+        return template.format(current_cycle=current_cycle, **packed)
+
+    @staticmethod
+    def _cycle_metrics(state, standup_data):
+        # Get participant list
+        participants = [standup.get("dev_id") for standup in standup_data["standups"]]
+        metrics = {
+            "total_standups": standup_data["total_standups"],
+            "cycle_number": state["scrum_cycle"],
+            "completion_rate": len(participants) / len(state["dev_profiles"]) * 100 if state["dev_profiles"] else 0
+        }
+        return participants, metrics
+
+    def _log_upsert(self, upsert_report):
+        self._log(
+            f"Re-indexed project: {upsert_report['added']} chunks added, {upsert_report['removed']} removed, "
+            f"{upsert_report['unchanged']} unchanged{' (rebuild for a new embedding model)' if upsert_report['rebuild'] else ''}"
+        )
+        self._log(
+            f"Upserted {upsert_report['vectors']} vectors in {upsert_report['batches']} batches "
+            f"(wall {upsert_report['wall_time_s']:.2f}s, slowest batch {upsert_report['max_batch_latency_s']:.2f}s, "
+            f"retries {upsert_report['total_retries']})"
+        )
+
+    def _log_packing(self, packing):
+        dropped = ", ".join(f"{name}: {n}" for name, n in packing["dropped_by_section"].items()) or "none"
+        self._log(
+            f"Prompt packed: {packing['used_tokens']}/{packing['budget']} tokens, "
+            f"{packing['dropped_tokens']} dropped ({dropped})"
+        )
+
+    def _log_reads(self, reads):
+        self._log(
+            f"Concurrent reads: critical path {reads['critical_path_s']:.2f}s ({reads['critical_call']}), "
+            f"wall {reads['wall_time_s']:.2f}s vs {reads['sequential_sum_s']:.2f}s sequential"
+        )
+
+    def _log_writes(self, writes):
+        stats = writes.stats()
+        self._log(
+            f"Firestore writes: {stats['requested_ops']} requested, {stats['committed_ops']} committed "
+            f"in {stats['batches']} batch(es), {stats['saved_ops']} saved by merging"
+        )
+
     def store_project_context_node(self, state):
         self._log("Entering node: StoreProjectContext")
         start_time = time.time()
         from agentic.utils.text_splitter import split_project_markdown
-        from agentic.utils.embedding import embed_documents
-        from agentic.utils.pinecone_client import init_pinecone
+        from agentic.utils.embedding import EMBEDDING_MODEL_NAME, embed_documents
+        from agentic.utils.vector_store import get_vector_store
+        from agentic.utils.vector_index import reindex_project
 
         project_id = state["project_id"]
         project_description = state["project_description"]
-        
-        # Split and embed project description
+
+        # Split the project description; only chunks missing from the project's vector
+        # manifest are embedded and upserted, and chunks no longer present are deleted
         docs = split_project_markdown(project_description)
-        vectors = embed_documents(docs)
-        index = init_pinecone()
-        namespace = project_id
-        
-        # Store in Pinecone
-        for i, doc in enumerate(docs):
-            index.upsert(vectors=[{
-                "id": f"{namespace}-{i}",
-                "values": vectors[i],
-                "metadata": {"text": doc.page_content}
-            }], namespace=namespace)
+        store = get_vector_store()
+        index_report = reindex_project(get_firestore(), project_id, docs, store, embed_documents, EMBEDDING_MODEL_NAME)
+        self._log_upsert(index_report)
 
         # --- Use LLM to generate a project summary ---
-        summary_prompt = f"""
-        Summarize the following project description for a software engineering team. Focus on the main goals, features, and technical stack. Be concise and clear.
-        
-        Project Description:
-        {project_description}
-        """
-        summary_response = self.llm.invoke(summary_prompt)
+        summary_response = self._invoke_llm(self._project_summary_prompt(project_description), state)
         summary = summary_response.content.strip()
-        write_project_summary.invoke({"project_id": project_id, "summary": summary})
-        
-        # Initialize project configuration
-        update_project_config.invoke({"project_id": project_id, "scrum_cycle_duration_minutes": 1440, "max_cycles": 10})
-        
+        # Both tools update projects/{id}; the buffer merges them into one write
+        with write_buffer(get_firestore()) as writes:
+            write_project_summary.invoke({"project_id": project_id, "summary": summary})
+
+            # Initialize project configuration
+            update_project_config.invoke({"project_id": project_id, "scrum_cycle_duration_minutes": 1440, "max_cycles": 10})
+        self._log_writes(writes)
+
         state["project_summary"] = summary
         state["vector_stored"] = True
         state["next_node"] = "gather_context"
@@ -106,23 +287,20 @@ class ScrumGraphBuilder:
         start_time = time.time()
         project_id = state["project_id"]
         
-        # Get developer profiles
-        dev_profiles = get_dev_profiles.invoke({"project_id": project_id})
-        
-        # Get project configuration
-        project_config = get_project_config.invoke({"project_id": project_id})
-        
-        # Get scrum history
-        scrum_history = get_scrum_history.invoke({"project_id": project_id, "limit": 5})
-        
-        # Get existing tickets
-        existing_tickets = get_project_tickets.invoke({"project_id": project_id})
-        
+        # Developer profiles, project config, scrum history and existing tickets are independent reads
+        context, reads = run_concurrently({
+            "dev_profiles": lambda: get_dev_profiles.invoke({"project_id": project_id}),
+            "project_config": lambda: get_project_config.invoke({"project_id": project_id}),
+            "scrum_history": lambda: get_scrum_history.invoke({"project_id": project_id, "limit": 5}),
+            "existing_tickets": lambda: get_project_tickets.invoke({"project_id": project_id, "open_only": True})
+        })
+        self._log_reads(reads)
+
         # Store context in state
-        state["dev_profiles"] = dev_profiles
-        state["project_config"] = project_config
-        state["scrum_history"] = scrum_history
-        state["existing_tickets"] = existing_tickets
+        state["dev_profiles"] = context["dev_profiles"]
+        state["project_config"] = context["project_config"]
+        state["scrum_history"] = context["scrum_history"]
+        state["existing_tickets"] = context["existing_tickets"]
         state["context_gathered"] = True
         state["next_node"] = "generate_tickets"
         
@@ -139,80 +317,64 @@ class ScrumGraphBuilder:
         dev_profiles = state["dev_profiles"]
         scrum_cycle_duration = state["project_config"].get("scrum_cycle_duration_minutes", 1440) // 60  # Convert to hours
 
-        # --- Get project context from Pinecone ---
-        retriever = get_vector_retriever(project_id)
-        # Limit to top 3 relevant docs
-        if hasattr(retriever, "invoke"):
-            project_context_docs = retriever.invoke(project_description, k=3)
-        else:
-            try:
-                project_context_docs = retriever.get_relevant_documents(project_description, k=3)
-            except TypeError:
-                project_context_docs = retriever.get_relevant_documents(project_description)[:3]
-        # Truncate each doc to 300 chars
-        project_context = "\n".join([doc.page_content[:300] for doc in project_context_docs])
+        # --- Get project context: top 3 chunks, vector search fused with BM25 over the description ---
+        retriever = get_vector_retriever(project_id, k=3, corpus_text=project_description)
+        project_context_docs = retriever.invoke(project_description)
 
-        # --- Prepare LLM prompt for ticket generation ---
-        llm_ticket_prompt = f"""
-        You are a Scrum Master AI. Given the following project context and developer profiles, break down the project into actionable tickets for each developer.
-        
-        STRICT INSTRUCTIONS:
-        - ONLY return a valid JSON object mapping dev_id to a list of tickets for that developer.
-        - DO NOT include any explanation, markdown, or extra text before or after the JSON.
-        - Each ticket must have: title, description, priority (high/medium/low), estimated_hours.
-        - Use the project context for technical and feature details.
-        - Use developer skills and roles to assign relevant tickets.
-        - If you do not know what to assign, return an empty list for that dev_id.
-        - WARNING: Any extra text, explanation, or formatting will break the system.
-        
-        Project Context:
-        {project_context}
-        
-        Developer Profiles:
-        {json.dumps(dev_profiles, indent=2)}
-        
-        Example output (and ONLY this, no explanation):
-        {{
-          "dev1": [{{"title": "Setup project structure", "description": "Initialize the repo and dependencies", "priority": "high", "estimated_hours": 4}}],
-          "dev2": [{{"title": "Implement backend API", "description": "Create FastAPI endpoints", "priority": "high", "estimated_hours": 8}}],
-          "dev3": []
-        }}
-        """
-        llm_response = self.llm.invoke(llm_ticket_prompt)
-        try:
-            dev_ticket_map = json.loads(llm_response.content)
-        except Exception:
-            # fallback: try to extract JSON from the response
-            import re
-            match = re.search(r'\{[\s\S]*\}', llm_response.content)
-            if match:
-                dev_ticket_map = json.loads(match.group(0))
-            else:
-                dev_ticket_map = {}
-
-        # --- Store tickets in Firestore under each dev's subcollection ---
+        # --- Prepare LLM prompt for ticket generation, packed into the token budget ---
+        llm_ticket_prompt = self._ticket_prompt(dev_profiles, project_context_docs)
         db = get_firestore()
         created_tickets = []
         ticket_assignments = {}  # dev_id -> list of ticket dicts
-        for dev_id, tickets in dev_ticket_map.items():
-            ticket_assignments[dev_id] = []
-            for ticket in tickets:
-                ticket_id = str(uuid.uuid4())
-                ticket_doc = {
-                    "id": ticket_id,
-                    "title": ticket.get("title", ""),
-                    "description": ticket.get("description", ""),
-                    "priority": ticket.get("priority", "medium"),
-                    "estimated_hours": ticket.get("estimated_hours", 8),
-                    "assigned_dev_id": dev_id,
-                    "status": "todo",
-                    "created_at": datetime.datetime.now(datetime.timezone.utc),
-                    "updated_at": datetime.datetime.now(datetime.timezone.utc)
-                }
-                # Store in dev_profiles/{dev_id}/tickets
-                db.collection("projects").document(project_id).collection("dev_profiles").document(dev_id).collection("tickets").document(ticket_id).set(ticket_doc)
-                created_tickets.append(ticket_doc)
-                ticket_assignments[dev_id].append(ticket_doc)
+
+        if TICKET_STREAMING:
+            # --- Stream the response and store each ticket as soon as its JSON object closes ---
+            parser = TicketStreamParser()
+            writes = []
+            llm_start = time.perf_counter()
+            first_ticket_s = None
+            response_text = []
+            cache_hit = False
+            with ThreadPoolExecutor(max_workers=4, thread_name_prefix="ticket-writes") as persist_pool:
+                try:
+                    for chunk in self._stream_llm(llm_ticket_prompt, state):
+                        cache_hit = cache_hit or (getattr(chunk, "response_metadata", None) or {}).get("cache_hit", False)
+                        response_text.append(chunk.content)
+                        for dev_id, ticket in parser.feed(chunk.content):
+                            ticket_doc = self._make_ticket_doc(dev_id, ticket)
+                            writes.append(persist_pool.submit(
+                                contextvars.copy_context().run, self._store_ticket, db, project_id, ticket_doc
+                            ))
+                            if first_ticket_s is None:
+                                first_ticket_s = time.perf_counter() - llm_start
+                                self._log(f"First ticket stored after {first_ticket_s:.2f}s")
+                            created_tickets.append(ticket_doc)
+                            ticket_assignments.setdefault(dev_id, []).append(ticket_doc)
+                except Exception as e:
+                    # A truncated response keeps every ticket that was already complete
+                    self._log(f"Ticket stream interrupted after {parser.tickets_parsed} tickets: {e}")
+                for future in writes:
+                    future.result()
+            if not cache_hit:
+                record_llm_latency(time.perf_counter() - llm_start)
+            for dev_id in parser.dev_ids:
+                ticket_assignments.setdefault(dev_id, [])
+            dev_ticket_map = {} if parser.dev_ids else self._parse_ticket_map("".join(response_text))
+        else:
+            llm_response = self._invoke_llm(llm_ticket_prompt, state)
+            dev_ticket_map = self._parse_ticket_map(llm_response.content)
+
+        # --- Store tickets in the project's ticket store (non-streaming path) ---
+        if dev_ticket_map:
+            with write_buffer(db) as writes:
+                for dev_id, tickets in dev_ticket_map.items():
+                    ticket_assignments[dev_id] = []
+                    for ticket in tickets:
+                        ticket_doc = self._make_ticket_doc(dev_id, ticket)
+                        self._store_ticket(db, project_id, ticket_doc)
+                        created_tickets.append(ticket_doc)
+                        ticket_assignments[dev_id].append(ticket_doc)
+            self._log_writes(writes)
         state["generated_tickets"] = created_tickets
         state["ticket_assignments"] = ticket_assignments
         state["tickets_created"] = True
@@ -232,8 +394,16 @@ class ScrumGraphBuilder:
         if current_cycle == 0:
             set_cycle_start_time.invoke({"project_id": project_id, "cycle_number": current_cycle})
 
-        # DEMO MODE: Do not wait, immediately check standup status and proceed
-        standup_status = get_standup_status.invoke({"project_id": project_id, "cycle_number": current_cycle})
+        # Wait until the last expected standup arrives or STANDUP_WAIT_TIMEOUT_SECONDS passes
+        # (0 by default: DEMO MODE, report the current status and proceed)
+        watcher = get_standup_watcher()
+        standup_watch = None
+        try:
+            standup_watch = watcher.watch(project_id, current_cycle, [dev.get("id") for dev in state["dev_profiles"]])
+            standup_status = standup_watch.wait()
+        finally:
+            if standup_watch is not None:
+                watcher.release(standup_watch)
         timing_info = get_cycle_timing_info.invoke({"project_id": project_id})
 
         state["standup_status"] = standup_status
@@ -252,62 +422,61 @@ class ScrumGraphBuilder:
         project_id = state["project_id"]
         current_cycle = state["scrum_cycle"]
 
-        # Get all standup data for summarization (current cycle)
-        standup_data = get_standup_summary_data.invoke({"project_id": project_id, "cycle_number": current_cycle})
-
-        # Fetch project summary
+        # Current cycle standup data and the project summary are always needed. Rolling mode adds
+        # only the compact roll-ups and recent cycle digests; full mode reads the last 5 cycle
+        # summaries, and takes all tickets and all standups (all cycles) from the project view
+        # that get_standup_summary_data has just brought up to date. All of them are independent reads.
         db = get_firestore()
-        project_doc = db.collection("projects").document(project_id).get()
-        project_summary = project_doc.to_dict().get("summary", "") if project_doc.exists else ""
+        project_ref = db.collection("projects").document(project_id)
+        rolling = SCRUM_SUMMARY_MODE == "rolling"
+        calls = {
+            "standup_data": lambda: get_standup_summary_data.invoke({"project_id": project_id, "cycle_number": current_cycle}),
+            "project_doc": lambda: cached_get(project_ref)
+        }
+        if rolling:
+            calls["rolling_context"] = lambda: get_rolling_context(db, project_id)
+        else:
+            calls.update({
+                "scrum_history": lambda: get_scrum_history.invoke({"project_id": project_id, "limit": 5})
+            })
+        context, reads = run_concurrently(calls)
+        self._log_reads(reads)
+        if not rolling:
+            view = get_project_view(project_id)
+            context["all_tickets"] = view.tickets(db, refresh=False)
+            context["all_standups"] = view.standups(db, refresh=False)
+        standup_data = context["standup_data"]
+        project_doc = context["project_doc"]
 
-        # Fetch last 5 scrum cycle summaries
-        scrum_history = get_scrum_history.invoke({"project_id": project_id, "limit": 5})
-        scrum_history_str = "\n".join([
-            f"Cycle {c.get('cycle_number', '?')}: {c.get('summary', '')}" for c in scrum_history
-        ]) if scrum_history else "No previous cycles."
-
-        # Fetch all tickets
-        all_tickets = get_project_tickets.invoke({"project_id": project_id})
-        all_tickets_str = "\n".join([
-            f"{t.get('title', '')} (Assigned: {t.get('assigned_dev_id', '')}, Status: {t.get('status', '')})" for t in all_tickets
-        ]) if all_tickets else "No tickets."
-
-        # Fetch all standups (all cycles)
-        all_standups = []
-        standups_collection = db.collection("projects").document(project_id).collection("standups").stream()
-        for doc in standups_collection:
-            all_standups.append(doc.to_dict())
-        all_standups_str = "\n".join([
-            f"Cycle {s.get('cycle', '?')} - {s.get('dev_id', '')}: {s.get('text', s.get('yesterday_work', ''))}" for s in all_standups
-        ]) if all_standups else "No standups."
+        project_summary = project_doc.to_dict().get("summary", "") if project_doc.exists else ""
 
         # Create summarization prompt
-        summary_prompt = f"""
-Project Summary:\n{project_summary}\n\nScrum History (last 5 cycles):\n{scrum_history_str}\n\nAll Tickets:\n{all_tickets_str}\n\nAll Standups (all cycles):\n{all_standups_str}\n\nCurrent Cycle ({current_cycle}) Standups:\n{standup_data['standups']}\nCurrent Cycle Tickets:\n{standup_data['tickets']}\n\nProvide a comprehensive summary including:\n1. Overall progress made\n2. Key achievements\n3. Blockers and issues\n4. Next steps and priorities\n5. Team velocity insights\n"""
+        summary_prompt = self._standup_summary_prompt(current_cycle, standup_data, project_summary, context)
 
         # Generate summary using LLM
-        summary_response = self.llm.invoke(summary_prompt)
+        summary_response = self._invoke_llm(summary_prompt, state)
         summary = summary_response.content
-
-        # Get participant list
-        participants = [standup.get("dev_id") for standup in standup_data["standups"]]
-
-        # Calculate metrics
-        metrics = {
-            "total_standups": standup_data["total_standups"],
-            "cycle_number": current_cycle,
-            "completion_rate": len(participants) / len(state["dev_profiles"]) * 100 if state["dev_profiles"] else 0
-        }
-
-        # Save scrum cycle summary, including ticket_assignments
-        save_scrum_cycle_summary.invoke({
-            "project_id": project_id,
-            "cycle_number": current_cycle,
-            "summary": summary,
-            "participants": participants,
-            "metrics": metrics,
-            "ticket_assignments": state.get("ticket_assignments", {})
-        })
+        digest = make_digest(summary)
+
+        # Get participant list and calculate metrics
+        participants, metrics = self._cycle_metrics(state, standup_data)
+
+        # Save scrum cycle summary, including ticket_assignments, and fold it into the roll-ups
+        with write_buffer(db) as writes:
+            save_scrum_cycle_summary.invoke({
+                "project_id": project_id,
+                "cycle_number": current_cycle,
+                "summary": summary,
+                "digest": digest,
+                "participants": participants,
+                "metrics": metrics,
+                "ticket_assignments": state.get("ticket_assignments", {})
+            })
+            if rolling:
+                rollups = update_rollups(self.llm, db, project_id, context["rolling_context"], current_cycle, digest)
+                for rollup in rollups:
+                    self._log(f"Rolled up cycles {rollup['start_cycle']}-{rollup['end_cycle']} (level {rollup['level']})")
+        self._log_writes(writes)
 
         state["cycle_summary"] = summary
         state["cycle_metrics"] = metrics
@@ -337,8 +506,8 @@ Project Summary:\n{project_summary}\n\nScrum History (last 5 cycles):\n{scrum_hi
             state["done"] = True
             state["next_node"] = "end"
         else:
-            # Continue to next cycle
-            state["next_node"] = "wait_for_standups"
+            # The next run starts the next cycle on the cycle-only path
+            state["next_node"] = "gather_context"
         
         self._log("Managing cycle progression and determining next steps")
         elapsed = time.time() - start_time
@@ -348,42 +517,120 @@ Project Summary:\n{project_summary}\n\nScrum History (last 5 cycles):\n{scrum_hi
     def build_graph(self):
         self._log("Initiating ScrumGraphBuilder workflow graph construction")
         start_time = time.time()
+        # langgraph is imported here, not at module import, to keep startup light
+        from langgraph.graph import StateGraph
         graph_builder = StateGraph(dict)
+        nodes = {
+            "StoreProjectContext": self.store_project_context_node,
+            "GatherContext": self.gather_context_node,
+            "GenerateTickets": self.generate_tickets_node,
+            "WaitForStandups": self.wait_for_standups_node,
+            "SummarizeStandups": self.summarize_standups_node,
+            "ManageCycle": self.manage_cycle_node
+        }
 
-        # Add all nodes
-        graph_builder.add_node("StoreProjectContext", self.store_project_context_node)
-        graph_builder.add_node("GatherContext", self.gather_context_node)
-        graph_builder.add_node("GenerateTickets", self.generate_tickets_node)
-        graph_builder.add_node("WaitForStandups", self.wait_for_standups_node)
-        graph_builder.add_node("SummarizeStandups", self.summarize_standups_node)
-        graph_builder.add_node("ManageCycle", self.manage_cycle_node)
-
-        # Set entry point
-        graph_builder.set_entry_point("StoreProjectContext")
-
-        # Add edges based on next_node logic
-        def route_to_next(state):
-            next_node = state.get("next_node", "end")
-            if next_node == "end" or state.get("done", False):
-                return "End"
-            return next_node
-
-        # Add conditional edges
-        graph_builder.add_conditional_edges("StoreProjectContext", lambda s: "GatherContext")
-        graph_builder.add_conditional_edges("GatherContext", lambda s: "GenerateTickets")
-        graph_builder.add_conditional_edges("GenerateTickets", lambda s: "WaitForStandups")
-        graph_builder.add_conditional_edges("WaitForStandups", lambda s: "SummarizeStandups")
-        graph_builder.add_conditional_edges("SummarizeStandups", lambda s: "ManageCycle")
-        graph_builder.add_conditional_edges("ManageCycle", route_to_next)
-
-        # Add end node
+        # Add all nodes, each checkpointed and timed in scrum_node_duration_seconds
+        for name in GRAPH_NODES:
+            graph_builder.add_node(name, instrument_node(name, checkpoint_node(name, nodes[name], self.checkpoints)))
         graph_builder.add_node("End", lambda x: x)
 
+        # Enter at the node the state names, or onboard / run the cycle-only path
+        graph_builder.set_conditional_entry_point(self._entry_node)
+
+        # Each node leads to the next; a run ends after ManageCycle, when done, or after `stop_after`
+        def route_after(name, successor):
+            def route(state):
+                if state.get("done", False) or state.get("stop_after") == name:
+                    return "End"
+                return successor
+            return route
+
+        for name, successor in zip(GRAPH_NODES, GRAPH_NODES[1:] + ("End",)):
+            graph_builder.add_conditional_edges(name, route_after(name, successor))
+
         self.graph = graph_builder.compile()
         elapsed = time.time() - start_time
         self._log(f"Workflow graph constructed (took {elapsed:.2f}s)")
         return self.graph
 
+    @staticmethod
+    def _entry_node(state):
+        """
+        Where a run enters the graph: the node named by `next_node` (as the previous
+        run left it, or set by the caller); otherwise StoreProjectContext for a new
+        project and GatherContext, the cycle-only path, for every later cycle.
+        """
+        if state.get("done", False):
+            return "End"
+        node = graph_node_name(state.get("next_node"))
+        if node:
+            return node
+        if state.get("scrum_cycle", 0) == 0 and not state.get("vector_stored"):
+            return "StoreProjectContext"
+        return "GatherContext"
+
+    def _resume_state(self, project_id, node=None, cycle=None, updates=None):
+        if self.checkpoints is None:
+            raise RuntimeError("Checkpoints are disabled (CHECKPOINTS_ENABLED=false)")
+        if node:
+            entry = graph_node_name(node)
+            if entry is None:
+                raise ValueError(f"Unknown graph node: {node}")
+            checkpoint = self.checkpoints.get(project_id, entry, cycle)
+            if checkpoint is None:
+                raise ValueError(f"No checkpoint of {entry} for project {project_id}" + (f" in cycle {cycle}" if cycle is not None else ""))
+            state = checkpoint["input"]
+        else:
+            checkpoint = self.checkpoints.latest(project_id)
+            if checkpoint is None:
+                raise ValueError(f"No checkpoints for project {project_id}")
+            if checkpoint["status"] == "done":
+                # Carry on from where the last node left the state
+                state = checkpoint["output"]
+                entry = graph_node_name(state.get("next_node"))
+            else:
+                # The node was interrupted or failed: run it again on the same input
+                state = checkpoint["input"]
+                entry = checkpoint["node"]
+        self._log(f"Resuming project {project_id} at {entry or 'End'} (cycle {state.get('scrum_cycle')})")
+        return {**state, "stop_after": None, **(updates or {}), "next_node": entry}
+
+    def resume(self, project_id, node=None, cycle=None, **updates):
+        """
+        Run the graph from a checkpoint.
+
+        Args:
+            project_id (str): Project to resume.
+            node (str, optional): Node to re-enter, on the input state it had in
+                `cycle` (default: its latest cycle). Without it, the run picks up
+                where the project's most recent checkpoint left off.
+            cycle (int, optional): Cycle of the checkpoint to use with `node`.
+            **updates: State keys to override before running.
+
+        Returns:
+            dict: The final state of the run.
+        """
+        return self.invoke(self._resume_state(project_id, node, cycle, updates))
+
+    def invoke(self, state):
+        """Run the compiled graph once, sharing one Firestore snapshot cache across all nodes of the run."""
+        if self.graph is None:
+            self.build_graph()
+        with snapshot_cache() as cache:
+            result = self.graph.invoke(state)
+        stats = cache.stats()
+        self._log(
+            f"Firestore snapshot cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['invalidations']} invalidations"
+        )
+        if isinstance(self.llm, CachedChatModel):
+            llm_stats = self.llm.cache_stats()
+            self._log(
+                f"LLM response cache: {llm_stats['hits']} hits, {llm_stats['misses']} misses "
+                f"(hit rate {llm_stats['hit_rate']:.0%}), {llm_stats['entries']} entries"
+            )
+        return result
+
     def __call__(self):
         self._log("ScrumGraphBuilder workflow initiated")
         return self.build_graph()
@@ -0,0 +1,345 @@
+import asyncio
+import time
+
+from agent.agenticworkflow import ScrumGraphBuilder, TICKET_STREAMING
+from agentic.utils.llm_cache import CachedChatModel
+from agentic.utils.json_stream import TicketStreamParser
+from agentic.tool.firebase_tool import asave_scrum_cycle_summary, aupdate_project_config, awrite_project_summary
+from agentic.tool.vector_retriever import get_vector_retriever
+from agentic.tool.scrum_timer import aget_cycle_timing_info, aset_cycle_start_time
+from agentic.utils.firebase_client import get_async_firestore
+from agentic.utils.firestore_batch import async_write_buffer, adoc_set
+from agentic.utils.firestore_cache import snapshot_cache, astream_dicts, cached_aget, cached_aquery
+from agentic.utils.prompt_packer import record_llm_latency
+from agentic.utils.workload_aggregates import record_ticket_created
+from agentic.utils.ticket_store import server_stamped, ticket_ref
+from agentic.utils.project_view import get_project_view
+from agentic.utils.standup_watcher import get_standup_watcher
+from agentic.utils.rolling_summary import SCRUM_SUMMARY_MODE, aget_rolling_context, aupdate_rollups, make_digest
+
+
+class AsyncScrumGraphBuilder(ScrumGraphBuilder):
+    """
+    The Scrum workflow graph with native async nodes, for `ainvoke`.
+
+    Firestore reads and writes go through the async Firestore client (the tools'
+    `a*` counterparts, such as `asave_scrum_cycle_summary`) and LLM calls through
+    `ainvoke`/`astream`, so many projects can progress concurrently on one event
+    loop. CPU-bound steps (embedding, local vector search) run in worker threads.
+    Prompt building and state handling are shared with `ScrumGraphBuilder`.
+    """
+
+    async def _ainvoke_llm(self, prompt, state=None):
+        start = time.perf_counter()
+        if state and state.get("bypass_llm_cache") and isinstance(self.llm, CachedChatModel):
+            response = await self.llm.ainvoke(prompt, bypass_cache=True)
+        else:
+            response = await self.llm.ainvoke(prompt)
+        if not (getattr(response, "response_metadata", None) or {}).get("cache_hit"):
+            record_llm_latency(time.perf_counter() - start)
+        return response
+
+    def _astream_llm(self, prompt, state=None):
+        if state and state.get("bypass_llm_cache") and isinstance(self.llm, CachedChatModel):
+            return self.llm.astream(prompt, bypass_cache=True)
+        return self.llm.astream(prompt)
+
+    async def _astore_ticket(self, db, project_id, ticket_doc):
+        # The ticket and its developer's workload counters are committed in the same batch
+        async with async_write_buffer(db):
+            await adoc_set(ticket_ref(db, project_id, ticket_doc["id"]), server_stamped(ticket_doc))
+            record_ticket_created(db, project_id, ticket_doc)
+
+    @staticmethod
+    async def _gather_timed(calls):
+        """`run_concurrently()` for coroutines: await them together and report the same timings."""
+        async def timed(coro):
+            start = time.perf_counter()
+            result = await coro
+            return result, time.perf_counter() - start
+
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*(timed(coro) for coro in calls.values()))
+        results = {name: result for name, (result, _) in zip(calls, outcomes)}
+        timings = {name: elapsed for name, (_, elapsed) in zip(calls, outcomes)}
+        critical_call = max(timings, key=timings.get) if timings else None
+        return results, {
+            "wall_time_s": time.perf_counter() - start,
+            "critical_path_s": timings.get(critical_call, 0.0),
+            "critical_call": critical_call,
+            "sequential_sum_s": sum(timings.values()),
+            "timings_s": timings
+        }
+
+    async def store_project_context_node(self, state):
+        self._log("Entering node: StoreProjectContext")
+        start_time = time.time()
+        from agentic.utils.text_splitter import split_project_markdown
+        from agentic.utils.embedding import EMBEDDING_MODEL_NAME, embed_documents
+        from agentic.utils.vector_store import get_vector_store
+        from agentic.utils.vector_index import aplan_reindex, apply_reindex, asave_manifest
+
+        project_id = state["project_id"]
+        project_description = state["project_description"]
+        db = get_async_firestore()
+
+        # Diff the description's chunks against the project's vector manifest
+        docs = split_project_markdown(project_description)
+        store = get_vector_store()
+        plan = await aplan_reindex(db, project_id, docs, EMBEDDING_MODEL_NAME)
+
+        # Embed and upsert the added chunks (CPU-bound, off the event loop) while the LLM writes the project summary
+        index_report, summary_response = await asyncio.gather(
+            asyncio.to_thread(apply_reindex, plan, store, project_id, embed_documents),
+            self._ainvoke_llm(self._project_summary_prompt(project_description), state)
+        )
+        self._log_upsert(index_report)
+        summary = summary_response.content.strip()
+        async with async_write_buffer(db) as writes:
+            await asave_manifest(db, project_id, plan, EMBEDDING_MODEL_NAME)
+            await awrite_project_summary(db, project_id, summary)
+            await aupdate_project_config(db, project_id, scrum_cycle_duration_minutes=1440, max_cycles=10)
+        self._log_writes(writes)
+
+        state["project_summary"] = summary
+        state["vector_stored"] = True
+        state["next_node"] = "gather_context"
+
+        self._log(f"Project summary: {summary[:120]}{'...' if len(summary) > 120 else ''}")
+        elapsed = time.time() - start_time
+        self._log(f"Exiting node: StoreProjectContext (took {elapsed:.2f}s)")
+        return state
+
+    async def gather_context_node(self, state):
+        self._log("Entering node: GatherContext")
+        start_time = time.time()
+        project_id = state["project_id"]
+        db = get_async_firestore()
+        project_ref = db.collection("projects").document(project_id)
+        dev_collection = project_ref.collection("dev_profiles")
+        history_collection = project_ref.collection("scrum_cycles")
+        history_query = history_collection.order_by("cycle_number", direction="DESCENDING").limit(5)
+
+        async def open_tickets():
+            # get_project_tickets: the open-ticket slice from the project view
+            return await get_project_view(project_id).atickets(db, open_only=True)
+
+        # Same reads (and cache keys) as the get_dev_profiles, get_project_config,
+        # get_scrum_history and get_project_tickets tools
+        context, reads = await self._gather_timed({
+            "dev_profiles": cached_aquery(dev_collection, "all", lambda: astream_dicts(dev_collection)),
+            "project_config": cached_aget(project_ref),
+            "scrum_history": cached_aquery(history_collection, ("latest", 5), lambda: astream_dicts(history_query)),
+            "existing_tickets": open_tickets()
+        })
+        self._log_reads(reads)
+        project_doc = context["project_config"]
+
+        state["dev_profiles"] = context["dev_profiles"]
+        state["project_config"] = project_doc.to_dict() if project_doc.exists else None
+        state["scrum_history"] = context["scrum_history"]
+        state["existing_tickets"] = context["existing_tickets"]
+        state["context_gathered"] = True
+        state["next_node"] = "generate_tickets"
+
+        self._log("Gathering developer profiles, project config, scrum history, and existing tickets")
+        elapsed = time.time() - start_time
+        self._log(f"Exiting node: GatherContext (took {elapsed:.2f}s)")
+        return state
+
+    async def generate_tickets_node(self, state):
+        self._log("Entering node: GenerateTickets")
+        start_time = time.time()
+        project_id = state["project_id"]
+        project_description = state["project_description"]
+
+        retriever = get_vector_retriever(project_id, k=3, corpus_text=project_description)
+        project_context_docs = await retriever.ainvoke(project_description)
+        llm_ticket_prompt = self._ticket_prompt(state["dev_profiles"], project_context_docs)
+        db = get_async_firestore()
+        created_tickets = []
+        ticket_assignments = {}  # dev_id -> list of ticket dicts
+
+        if TICKET_STREAMING:
+            # --- Stream the response and store each ticket as soon as its JSON object closes ---
+            parser = TicketStreamParser()
+            writes = []
+            llm_start = time.perf_counter()
+            first_ticket_s = None
+            response_text = []
+            cache_hit = False
+            try:
+                async for chunk in self._astream_llm(llm_ticket_prompt, state):
+                    cache_hit = cache_hit or (getattr(chunk, "response_metadata", None) or {}).get("cache_hit", False)
+                    response_text.append(chunk.content)
+                    for dev_id, ticket in parser.feed(chunk.content):
+                        ticket_doc = self._make_ticket_doc(dev_id, ticket)
+                        writes.append(asyncio.ensure_future(self._astore_ticket(db, project_id, ticket_doc)))
+                        if first_ticket_s is None:
+                            first_ticket_s = time.perf_counter() - llm_start
+                            self._log(f"First ticket stored after {first_ticket_s:.2f}s")
+                        created_tickets.append(ticket_doc)
+                        ticket_assignments.setdefault(dev_id, []).append(ticket_doc)
+            except Exception as e:
+                # A truncated response keeps every ticket that was already complete
+                self._log(f"Ticket stream interrupted after {parser.tickets_parsed} tickets: {e}")
+            await asyncio.gather(*writes)
+            if not cache_hit:
+                record_llm_latency(time.perf_counter() - llm_start)
+            for dev_id in parser.dev_ids:
+                ticket_assignments.setdefault(dev_id, [])
+            dev_ticket_map = {} if parser.dev_ids else self._parse_ticket_map("".join(response_text))
+        else:
+            llm_response = await self._ainvoke_llm(llm_ticket_prompt, state)
+            dev_ticket_map = self._parse_ticket_map(llm_response.content)
+
+        if dev_ticket_map:
+            async with async_write_buffer(db) as writes:
+                for dev_id, tickets in dev_ticket_map.items():
+                    ticket_assignments[dev_id] = []
+                    for ticket in tickets:
+                        ticket_doc = self._make_ticket_doc(dev_id, ticket)
+                        await adoc_set(ticket_ref(db, project_id, ticket_doc["id"]), server_stamped(ticket_doc))
+                        record_ticket_created(db, project_id, ticket_doc)
+                        created_tickets.append(ticket_doc)
+                        ticket_assignments[dev_id].append(ticket_doc)
+            self._log_writes(writes)
+        state["generated_tickets"] = created_tickets
+        state["ticket_assignments"] = ticket_assignments
+        state["tickets_created"] = True
+        state["next_node"] = "wait_for_standups"
+        self._log(f"Tickets generated: {sum(len(v) for v in ticket_assignments.values())}")
+        elapsed = time.time() - start_time
+        self._log(f"Exiting node: GenerateTickets (took {elapsed:.2f}s)")
+        return state
+
+    async def wait_for_standups_node(self, state):
+        self._log("Entering node: WaitForStandups")
+        start_time = time.time()
+        project_id = state["project_id"]
+        current_cycle = state["scrum_cycle"]
+        db = get_async_firestore()
+
+        if current_cycle == 0:
+            async with async_write_buffer(db):
+                await aset_cycle_start_time(db, project_id, current_cycle)
+
+        # The watch's initial read (or listener) runs off the loop; waiting suspends without holding a thread
+        watcher = get_standup_watcher()
+        dev_ids = [dev.get("id") for dev in state["dev_profiles"]]
+        # Both calls run to the end, so a watch that was registered is released even if the timing read fails
+        standup_watch, timing_info = await asyncio.gather(
+            asyncio.to_thread(watcher.watch, project_id, current_cycle, dev_ids),
+            aget_cycle_timing_info(db, project_id),
+            return_exceptions=True
+        )
+        try:
+            for outcome in (standup_watch, timing_info):
+                if isinstance(outcome, BaseException):
+                    raise outcome
+            standup_status = await standup_watch.await_complete()
+        finally:
+            if not isinstance(standup_watch, BaseException):
+                watcher.release(standup_watch)
+
+        state["standup_status"] = standup_status
+        state["timing_info"] = timing_info
+        state["standups_ready"] = True
+        state["next_node"] = "summarize_standups"
+        self._log(f"Standup status: {standup_status}")
+        self._log(f"Timing info: {timing_info}")
+        elapsed = time.time() - start_time
+        self._log(f"Exiting node: WaitForStandups (took {elapsed:.2f}s)")
+        return state
+
+    async def summarize_standups_node(self, state):
+        self._log("Entering node: SummarizeStandups")
+        start_time = time.time()
+        project_id = state["project_id"]
+        current_cycle = state["scrum_cycle"]
+
+        db = get_async_firestore()
+        project_ref = db.collection("projects").document(project_id)
+        rolling = SCRUM_SUMMARY_MODE == "rolling"
+        # The same project view slices as get_standup_summary_data: this cycle's standups, open
+        # tickets and those completed since the last cycle (which needs the project document first)
+        view = get_project_view(project_id)
+
+        async def project_and_tickets():
+            project_doc = await cached_aget(project_ref)
+            since = project_doc.to_dict().get("last_scrum_timestamp") if project_doc.exists else None
+            return project_doc, await view.acycle_tickets(db, since)
+
+        calls = {
+            "standups": view.astandups(db, current_cycle),
+            "project_and_tickets": project_and_tickets()
+        }
+        if rolling:
+            calls["rolling_context"] = aget_rolling_context(db, project_id)
+        else:
+            history_collection = project_ref.collection("scrum_cycles")
+            history_query = history_collection.order_by("cycle_number", direction="DESCENDING").limit(5)
+            calls["scrum_history"] = cached_aquery(history_collection, ("latest", 5), lambda: astream_dicts(history_query))
+        context, reads = await self._gather_timed(calls)
+        self._log_reads(reads)
+        project_doc, tickets = context["project_and_tickets"]
+        standups = context["standups"]
+        standup_data = {
+            "cycle_number": current_cycle,
+            "total_standups": len(standups),
+            "standups": standups,
+            "tickets": tickets
+        }
+        if not rolling:
+            context["all_tickets"], context["all_standups"] = await asyncio.gather(
+                view.atickets(db, refresh=False), view.astandups(db, refresh=False)
+            )
+        project_summary = project_doc.to_dict().get("summary", "") if project_doc.exists else ""
+
+        summary_prompt = self._standup_summary_prompt(current_cycle, standup_data, project_summary, context)
+        summary_response = await self._ainvoke_llm(summary_prompt, state)
+        summary = summary_response.content
+        digest = make_digest(summary)
+        participants, metrics = self._cycle_metrics(state, standup_data)
+
+        async with async_write_buffer(db) as writes:
+            await asave_scrum_cycle_summary(
+                db, project_id, current_cycle, summary, participants, metrics=metrics, digest=digest
+            )
+            if rolling:
+                # Roll-ups are rare (every SCRUM_ROLLUP_EVERY cycles); their writes still join the buffer
+                rollups = await aupdate_rollups(
+                    self.llm, db, project_id, context["rolling_context"], current_cycle, digest
+                )
+                for rollup in rollups:
+                    self._log(f"Rolled up cycles {rollup['start_cycle']}-{rollup['end_cycle']} (level {rollup['level']})")
+        self._log_writes(writes)
+
+        state["cycle_summary"] = summary
+        state["cycle_metrics"] = metrics
+        state["summary_saved"] = True
+        state["next_node"] = "manage_cycle"
+        self._log(f"Summary generated (first 120 chars): {summary[:120]}{'...' if len(summary) > 120 else ''}")
+        elapsed = time.time() - start_time
+        self._log(f"Exiting node: SummarizeStandups (took {elapsed:.2f}s)")
+        return state
+
+    async def manage_cycle_node(self, state):
+        return super().manage_cycle_node(state)
+
+    async def aresume(self, project_id, node=None, cycle=None, **updates):
+        """`resume()` on the running event loop."""
+        return await self.ainvoke(self._resume_state(project_id, node, cycle, updates))
+
+    async def ainvoke(self, state):
+        """Run the compiled graph once on the running event loop, with a per-run Firestore snapshot cache."""
+        if self.graph is None:
+            self.build_graph()
+        with snapshot_cache() as cache:
+            result = await self.graph.ainvoke(state)
+        stats = cache.stats()
+        self._log(
+            f"Firestore snapshot cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['invalidations']} invalidations"
+        )
+        return result
@@ -0,0 +1,83 @@
+import time
+from agentic.logger.metrics import LLM_FIRST_TOKEN_SECONDS, LLM_PROMPT_TOKENS, LLM_SECONDS, LLM_TOKENS
+from agentic.utils.llm_cache import normalize_prompt
+from agentic.utils.prompt_packer import count_tokens
+
+def _usage(message):
+    usage = getattr(message, "usage_metadata", None) or {}
+    return usage.get("input_tokens"), usage.get("output_tokens")
+
+def _record(mode, start, prompt, content, usage):
+    LLM_SECONDS.observe(time.perf_counter() - start, mode)
+    prompt_tokens, completion_tokens = usage
+    # Providers that report no usage get the prompt packer's estimate
+    if prompt_tokens is None:
+        prompt_tokens = count_tokens(normalize_prompt(prompt))
+    if completion_tokens is None:
+        completion_tokens = count_tokens(content)
+    LLM_TOKENS.inc(prompt_tokens, "prompt")
+    LLM_TOKENS.inc(completion_tokens, "completion")
+    LLM_PROMPT_TOKENS.observe(prompt_tokens)
+
+class _StreamUsage:
+    """Collects streamed text and the last usage report while chunks pass through."""
+
+    def __init__(self):
+        self.parts = []
+        self.chunks = 0
+        self.usage = (None, None)
+
+    def add(self, chunk):
+        self.chunks += 1
+        if isinstance(chunk.content, str):
+            self.parts.append(chunk.content)
+        usage = _usage(chunk)
+        if usage != (None, None):
+            self.usage = usage
+
+class MeteredChatModel:
+    """
+    Wraps a LangChain chat model to record call latency, time to first token
+    (streaming) and prompt/completion tokens in the metrics registry.
+
+    Sits directly around the provider model, inside `CachedChatModel`, so only
+    real model calls are measured. Everything else is delegated to the wrapped model.
+    """
+
+    def __init__(self, model):
+        self.model = model
+
+    def invoke(self, prompt, config=None, **kwargs):
+        start = time.perf_counter()
+        response = self.model.invoke(prompt, config=config, **kwargs)
+        _record("invoke", start, prompt, response.content if isinstance(response.content, str) else "", _usage(response))
+        return response
+
+    def stream(self, prompt, config=None, **kwargs):
+        start = time.perf_counter()
+        collected = _StreamUsage()
+        for chunk in self.model.stream(prompt, config=config, **kwargs):
+            if not collected.chunks:
+                LLM_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - start)
+            collected.add(chunk)
+            yield chunk
+        _record("stream", start, prompt, "".join(collected.parts), collected.usage)
+
+    async def ainvoke(self, prompt, config=None, **kwargs):
+        start = time.perf_counter()
+        response = await self.model.ainvoke(prompt, config=config, **kwargs)
+        _record("invoke", start, prompt, response.content if isinstance(response.content, str) else "", _usage(response))
+        return response
+
+    async def astream(self, prompt, config=None, **kwargs):
+        start = time.perf_counter()
+        collected = _StreamUsage()
+        async for chunk in self.model.astream(prompt, config=config, **kwargs):
+            if not collected.chunks:
+                LLM_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - start)
+            collected.add(chunk)
+            yield chunk
+        _record("stream", start, prompt, "".join(collected.parts), collected.usage)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
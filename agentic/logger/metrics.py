@@ -0,0 +1,319 @@
+import bisect
+import functools
+import inspect
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+# The metrics endpoint has no auth; set 0.0.0.0 only where a scraper on another host needs it
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+# Seconds: 1ms .. 60s, covering Firestore RPCs through full LLM completions
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+class Counter:
+    """Monotonic counter, one series per label values tuple."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *labels):
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def series(self):
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+class Histogram:
+    """
+    Fixed-bucket histogram, one series per label values tuple.
+
+    `observe()` is a bisect plus three additions under a lock, so it is cheap
+    enough for every Firestore call and LLM chunk on the hot path.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket counts (+Inf last), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        if not METRICS_ENABLED:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def series(self):
+        with self._lock:
+            return {labels: (list(counts), total, count) for labels, (counts, total, count) in self._series.items()}
+
+    def quantile(self, q, counts, count):
+        """Estimate a quantile from bucket counts by linear interpolation within the bucket."""
+        if not count:
+            return None
+        rank = q * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index >= len(self.buckets):
+                    return lower  # +Inf bucket: the best bound is the largest finite one
+                return lower + (self.buckets[index] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+class MetricsRegistry:
+    """Named counters and histograms, exported as Prometheus text or a JSON snapshot."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def metrics(self):
+        with self._lock:
+            return list(self._metrics.values())
+
+    def reset(self):
+        for metric in self.metrics():
+            metric.reset()
+
+    def render_prometheus(self):
+        """The Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for labels, value in sorted(metric.series().items()):
+                label_text = _labels(metric.labelnames, labels)
+                if metric.kind == "counter":
+                    lines.append(f"{metric.name}{_braces(label_text)} {_number(value)}")
+                    continue
+                counts, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip(metric.buckets + (math.inf,), counts):
+                    cumulative += bucket_count
+                    le = 'le="+Inf"' if bound == math.inf else f'le="{_number(bound)}"'
+                    lines.append(f"{metric.name}_bucket{_braces(label_text, le)} {cumulative}")
+                lines.append(f"{metric.name}_sum{_braces(label_text)} {_number(total)}")
+                lines.append(f"{metric.name}_count{_braces(label_text)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """
+        Every series as plain data: counter values, and histogram count, sum, mean
+        and bucket-estimated p50/p95/p99.
+
+        Returns:
+            Dict[str, dict]: Metric name -> {"type", "help", "series": [...]}.
+        """
+        result = {}
+        for metric in self.metrics():
+            series = []
+            for labels, value in sorted(metric.series().items()):
+                entry = {"labels": dict(zip(metric.labelnames, labels))}
+                if metric.kind == "counter":
+                    entry["value"] = value
+                else:
+                    counts, total, count = value
+                    entry.update({
+                        "count": count,
+                        "sum": total,
+                        "mean": total / count if count else None,
+                        "p50": metric.quantile(0.5, counts, count),
+                        "p95": metric.quantile(0.95, counts, count),
+                        "p99": metric.quantile(0.99, counts, count)
+                    })
+                series.append(entry)
+            result[metric.name] = {"type": metric.kind, "help": metric.help, "series": series}
+        return result
+
+    def snapshot_json(self, **kwargs):
+        return json.dumps(self.snapshot(), **kwargs)
+
+def _labels(names, values):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+def _braces(*parts):
+    text = ",".join(part for part in parts if part)
+    return "{" + text + "}" if text else ""
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+REGISTRY = MetricsRegistry()
+
+NODE_SECONDS = REGISTRY.histogram("scrum_node_duration_seconds", "Workflow node wall time.", ("node",))
+NODE_ERRORS = REGISTRY.counter("scrum_node_errors_total", "Workflow node runs that raised.", ("node",))
+TOOL_SECONDS = REGISTRY.histogram("scrum_tool_duration_seconds", "Tool call wall time.", ("tool",))
+TOOL_ERRORS = REGISTRY.counter("scrum_tool_errors_total", "Tool calls that raised.", ("tool",))
+FIRESTORE_SECONDS = REGISTRY.histogram("firestore_operation_duration_seconds", "Firestore RPC latency.", ("op",))
+FIRESTORE_DOCUMENTS = REGISTRY.counter(
+    "firestore_documents_total", "Documents read (get/query) or written (set/update/batch_commit).", ("op",)
+)
+EMBEDDING_BATCH = REGISTRY.histogram("embedding_batch_size", "Texts per embed_documents call.", (), SIZE_BUCKETS)
+EMBEDDING_COMPUTED = REGISTRY.counter("embedding_texts_computed_total", "Texts sent to the embedding model (cache misses).")
+EMBEDDING_SECONDS = REGISTRY.histogram("embedding_duration_seconds", "embed_documents wall time, cache lookups included.")
+RETRIEVAL_SECONDS = REGISTRY.histogram(
+    "retrieval_duration_seconds", "Retrieval wall time by stage (embed, vector, lexical, total).", ("stage",)
+)
+RETRIEVAL_QUERY_EMBEDDINGS = REGISTRY.counter(
+    "retrieval_query_embeddings_total", "Query embedding lookups, by cache result.", ("result",)
+)
+ASSIGNMENT_TICKETS = REGISTRY.counter(
+    "assignment_tickets_total", "Tickets given to solve_assignment, by result (assigned, unassigned).", ("result",)
+)
+LLM_SECONDS = REGISTRY.histogram("llm_request_duration_seconds", "LLM call wall time (to the last chunk when streaming).", ("mode",))
+LLM_FIRST_TOKEN_SECONDS = REGISTRY.histogram("llm_time_to_first_token_seconds", "Time from a streaming call to its first chunk.")
+LLM_TOKENS = REGISTRY.counter("llm_tokens_total", "LLM tokens, from usage metadata or estimated.", ("kind",))
+LLM_PROMPT_TOKENS = REGISTRY.histogram("llm_prompt_tokens", "Prompt tokens per LLM call.", (), TOKEN_BUCKETS)
+
+def get_metrics():
+    return REGISTRY
+
+def observe_firestore(op, start, documents=1):
+    """Record one Firestore RPC started at `start` (a `perf_counter()` value) that touched `documents` documents."""
+    FIRESTORE_SECONDS.observe(time.perf_counter() - start, op)
+    FIRESTORE_DOCUMENTS.inc(documents, op)
+
+def instrument_node(name, node):
+    """Wrap a graph node (sync or async) so every run feeds `scrum_node_duration_seconds`."""
+    if inspect.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def timed(state):
+            start = time.perf_counter()
+            try:
+                return await node(state)
+            except BaseException:
+                NODE_ERRORS.inc(1, name)
+                raise
+            finally:
+                NODE_SECONDS.observe(time.perf_counter() - start, name)
+        return timed
+
+    @functools.wraps(node)
+    def timed(state):
+        start = time.perf_counter()
+        try:
+            return node(state)
+        except BaseException:
+            NODE_ERRORS.inc(1, name)
+            raise
+        finally:
+            NODE_SECONDS.observe(time.perf_counter() - start, name)
+    return timed
+
+def instrument_tools(tools):
+    """
+    Time every call of the given LangChain tools (`invoke` and `ainvoke` alike) in
+    `scrum_tool_duration_seconds`. The tools are patched in place, once.
+    """
+    for tool in tools:
+        func = getattr(tool, "func", None)
+        if func is None or getattr(func, "_metered", False):
+            continue
+
+        def timed(*args, _func=func, _name=tool.name, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _func(*args, **kwargs)
+            except BaseException:
+                TOOL_ERRORS.inc(1, _name)
+                raise
+            finally:
+                TOOL_SECONDS.observe(time.perf_counter() - start, _name)
+
+        timed._metered = True
+        functools.update_wrapper(timed, func)
+        tool.func = timed
+    return tools
+
+def start_metrics_server(port, host=None):
+    """
+    Serve `/metrics` (Prometheus text) and `/metrics.json` (the snapshot) from a
+    daemon thread, on localhost unless `host` (env `METRICS_HOST`) says otherwise.
+    Returns the server; call `shutdown()` to stop it.
+    """
+    host = host or METRICS_HOST
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/metrics.json"):
+                body, content_type = REGISTRY.snapshot_json().encode("utf-8"), "application/json"
+            elif self.path.startswith("/metrics"):
+                body, content_type = REGISTRY.render_prometheus().encode("utf-8"), "text/plain; version=0.0.4"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    print(f"[METRICS] Serving /metrics and /metrics.json on {host}:{server.server_address[1]}")
+    return server
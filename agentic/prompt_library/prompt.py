@@ -30,3 +30,35 @@ Your responsibilities include:
 Always return your response in a structured format if needed.
 Avoid generic advice — act like a real Scrum Master embedded in a dev team.
 """
+
+TICKET_GENERATION_PROMPT = """
+        You are a Scrum Master AI. Given the following project context and developer profiles, break down the project into actionable tickets for each developer.
+        
+        STRICT INSTRUCTIONS:
+        - ONLY return a valid JSON object mapping dev_id to a list of tickets for that developer.
+        - DO NOT include any explanation, markdown, or extra text before or after the JSON.
+        - Each ticket must have: title, description, priority (high/medium/low), estimated_hours.
+        - Use the project context for technical and feature details.
+        - Use developer skills and roles to assign relevant tickets.
+        - If you do not know what to assign, return an empty list for that dev_id.
+        - WARNING: Any extra text, explanation, or formatting will break the system.
+        
+        Project Context:
+        {project_context}
+        
+        Developer Profiles:
+        {dev_profiles}
+        
+        Example output (and ONLY this, no explanation):
+        {{
+          "dev1": [{{"title": "Setup project structure", "description": "Initialize the repo and dependencies", "priority": "high", "estimated_hours": 4}}],
+          "dev2": [{{"title": "Implement backend API", "description": "Create FastAPI endpoints", "priority": "high", "estimated_hours": 8}}],
+          "dev3": []
+        }}
+        """
+
+STANDUP_SUMMARY_INSTRUCTIONS = "Provide a comprehensive summary including:\n1. Overall progress made\n2. Key achievements\n3. Blockers and issues\n4. Next steps and priorities\n5. Team velocity insights\n"
+
+ROLLING_STANDUP_SUMMARY_PROMPT = "\nProject Summary:\n{project_summary}\n\nScrum History (roll-ups and recent cycle digests):\n{rolling_history}\n\nCurrent Cycle ({current_cycle}) Standups:\n{current_standups}\nCurrent Cycle Tickets:\n{current_tickets}\n\n" + STANDUP_SUMMARY_INSTRUCTIONS
+
+FULL_STANDUP_SUMMARY_PROMPT = "\nProject Summary:\n{project_summary}\n\nScrum History (last 5 cycles):\n{scrum_history}\n\nAll Tickets:\n{all_tickets}\n\nAll Standups (all cycles):\n{all_standups}\n\nCurrent Cycle ({current_cycle}) Standups:\n{current_standups}\nCurrent Cycle Tickets:\n{current_tickets}\n\n" + STANDUP_SUMMARY_INSTRUCTIONS
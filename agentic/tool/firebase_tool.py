@@ -1,30 +1,44 @@
-from langchain.tools import tool
+from langchain_core.tools import tool
 from agentic.utils.firebase_client import get_firestore
+from agentic.utils.firestore_batch import adoc_set, adoc_update, atomic_writes, doc_set, doc_update
+from agentic.utils.workload_aggregates import record_ticket_created, record_ticket_status_change
+from agentic.utils.ticket_store import server_stamped, ticket_ref
+from agentic.utils.project_view import get_project_view
+from agentic.utils.firestore_cache import cached_get, cached_query, invalidate
 import datetime
 import uuid
 import sys
 
-db = get_firestore()
+def _project_summary(summary):
+    return {
+        "summary": summary,
+        "created_at": datetime.datetime.utcnow(),
+        "status": "active"
+    }
 
 @tool
 def write_project_summary(project_id: str, summary: str):
     """Store a short summary for the given project in Firestore."""
-    db.collection("projects").document(project_id).update({
-        "summary": summary,
-        "created_at": datetime.datetime.utcnow(),
-        "status": "active"
-    })
+    db = get_firestore()
+    doc_update(db.collection("projects").document(project_id), _project_summary(summary))
+    return f"Summary saved for {project_id}"
+
+async def awrite_project_summary(db, project_id, summary):
+    """`write_project_summary` on the async Firestore client."""
+    await adoc_update(db.collection("projects").document(project_id), _project_summary(summary))
     return f"Summary saved for {project_id}"
 
 @tool
 def get_dev_profiles(project_id: str):
     """Retrieve the developer profiles for a given project from Firestore."""
-    docs = db.collection("projects").document(project_id).collection("dev_profiles").stream()
-    return [doc.to_dict() for doc in docs]
+    db = get_firestore()
+    collection = db.collection("projects").document(project_id).collection("dev_profiles")
+    return cached_query(collection, "all", lambda: [doc.to_dict() for doc in collection.stream()])
 
 @tool
 def create_ticket(project_id: str, title: str, description: str, assigned_dev_id: str, priority: str = "medium", estimated_hours: int = 8):
     """Create a new ticket in Firebase for the given project and assign it to a developer."""
+    db = get_firestore()
     ticket_id = str(uuid.uuid4())
     ticket_data = {
         "id": ticket_id,
@@ -34,32 +48,60 @@ def create_ticket(project_id: str, title: str, description: str, assigned_dev_id
         "priority": priority,
         "estimated_hours": estimated_hours,
         "status": "todo",
-        "created_at": datetime.datetime.utcnow(),
-        "updated_at": datetime.datetime.utcnow()
+        "created_at": datetime.datetime.now(datetime.timezone.utc)
     }
     
-    db.collection("projects").document(project_id).collection("tickets").document(ticket_id).set(ticket_data)
+    # The ticket and its developer's workload counters are written in one batch
+    with atomic_writes(db):
+        doc_set(ticket_ref(db, project_id, ticket_id), server_stamped(ticket_data))
+        record_ticket_created(db, project_id, ticket_data)
     return f"Ticket '{title}' created and assigned to dev {assigned_dev_id}"
 
 @tool
-def get_project_tickets(project_id: str, status: str = None):
-    """Get all tickets for a project, optionally filtered by status."""
-    query = db.collection("projects").document(project_id).collection("tickets")
-    if status:
-        query = query.where("status", "==", status)
-    
-    docs = query.stream()
-    return [doc.to_dict() for doc in docs]
+def update_ticket_status(project_id: str, ticket_id: str, status: str):
+    """Change a ticket's status (todo, in_progress, completed) and update the developer's workload counters."""
+    from google.cloud.firestore import transactional
+    db = get_firestore()
+    ref = ticket_ref(db, project_id, ticket_id)
+
+    @transactional
+    def change_status(transaction):
+        # Read the ticket uncached, in the transaction: if another status change commits first
+        # this one is retried against the new status, so the counters never move twice
+        doc = ref.get(transaction=transaction)
+        if not doc.exists or doc.to_dict().get("deleted"):
+            return None
+        ticket = doc.to_dict()
+        if ticket.get("status") != status:
+            transaction.update(ref, server_stamped({"status": status}))
+            record_ticket_status_change(db, project_id, ticket, status, transaction=transaction)
+        return ticket.get("status")
+
+    old_status = change_status(db.transaction())
+    invalidate(ref.path)
+    if old_status is None:
+        return f"Ticket {ticket_id} not found"
+    if old_status == status:
+        return f"Ticket {ticket_id} is already {status}"
+    return f"Ticket {ticket_id} moved to {status}"
+
+@tool
+def get_project_tickets(project_id: str, status: str = None, assigned_dev_id: str = None, open_only: bool = False):
+    """Get tickets for a project, optionally only one status, one developer's, or only open (todo/in_progress) ones."""
+    db = get_firestore()
+    # The slice's indexed query runs once; later calls read only the tickets changed since
+    return get_project_view(project_id).tickets(db, status=status, assigned_dev_id=assigned_dev_id, open_only=open_only)
 
 @tool
 def get_scrum_history(project_id: str, limit: int = 5):
     """Get recent scrum cycle summaries for the project."""
-    docs = db.collection("projects").document(project_id).collection("scrum_cycles").order_by("cycle_number", direction="DESCENDING").limit(limit).stream()
-    return [doc.to_dict() for doc in docs]
+    db = get_firestore()
+    collection = db.collection("projects").document(project_id).collection("scrum_cycles")
+    query = collection.order_by("cycle_number", direction="DESCENDING").limit(limit)
+    return cached_query(collection, ("latest", limit), lambda: [doc.to_dict() for doc in query.stream()])
 
-@tool
-def save_scrum_cycle_summary(project_id: str, cycle_number: int, summary: str, participants: list, metrics: dict = None):
-    """Save a scrum cycle summary to Firebase."""
+def _scrum_cycle_summary(cycle_number, summary, participants, metrics=None, digest=None):
+    """The scrum_cycles document and the project update for `save_scrum_cycle_summary`."""
     # Truncate summary if too long
     if len(summary) > 5000:
         summary = summary[:5000] + '... (truncated)'
@@ -73,31 +115,58 @@ def save_scrum_cycle_summary(project_id: str, cycle_number: int, summary: str, p
         "metrics": metrics or {},
         "timestamp": datetime.datetime.utcnow()
     }
+    if digest:
+        cycle_data["digest"] = digest
     print(f"[DEBUG] Saving scrum cycle summary, size: {sys.getsizeof(str(cycle_data))} bytes")
-    db.collection("projects").document(project_id).collection("scrum_cycles").document(f"cycle_{cycle_number}").set(cycle_data)
     # Update project with last scrum timestamp
-    db.collection("projects").document(project_id).update({
+    project_update = {
         "last_scrum_timestamp": datetime.datetime.utcnow(),
         "current_cycle": cycle_number
-    })
+    }
+    return cycle_data, project_update
+
+@tool
+def save_scrum_cycle_summary(project_id: str, cycle_number: int, summary: str, participants: list, metrics: dict = None, digest: str = None):
+    """Save a scrum cycle summary (and optional compact digest for rolling summarization) to Firebase."""
+    db = get_firestore()
+    cycle_data, project_update = _scrum_cycle_summary(cycle_number, summary, participants, metrics, digest)
+    project_ref = db.collection("projects").document(project_id)
+    doc_set(project_ref.collection("scrum_cycles").document(f"cycle_{cycle_number}"), cycle_data)
+    doc_update(project_ref, project_update)
+    return f"Scrum cycle {cycle_number} summary saved"
+
+async def asave_scrum_cycle_summary(db, project_id, cycle_number, summary, participants, metrics=None, digest=None):
+    """`save_scrum_cycle_summary` on the async Firestore client."""
+    cycle_data, project_update = _scrum_cycle_summary(cycle_number, summary, participants, metrics, digest)
+    project_ref = db.collection("projects").document(project_id)
+    await adoc_set(project_ref.collection("scrum_cycles").document(f"cycle_{cycle_number}"), cycle_data)
+    await adoc_update(project_ref, project_update)
     return f"Scrum cycle {cycle_number} summary saved"
 
 @tool
 def get_project_config(project_id: str):
     """Get project configuration including scrum cycle duration and other settings."""
-    doc = db.collection("projects").document(project_id).get()
+    db = get_firestore()
+    doc = cached_get(db.collection("projects").document(project_id))
     if doc.exists:
         return doc.to_dict()
     return None
 
-@tool
-def update_project_config(project_id: str, scrum_cycle_duration_minutes: int = 1440, max_cycles: int = 10):
-    """Update project configuration with scrum settings."""
-    config = {
+def _project_config(scrum_cycle_duration_minutes, max_cycles):
+    return {
         "scrum_cycle_duration_minutes": scrum_cycle_duration_minutes,
         "max_cycles": max_cycles,
         "updated_at": datetime.datetime.utcnow()
     }
-    
-    db.collection("projects").document(project_id).update(config)
+
+@tool
+def update_project_config(project_id: str, scrum_cycle_duration_minutes: int = 1440, max_cycles: int = 10):
+    """Update project configuration with scrum settings."""
+    db = get_firestore()
+    doc_update(db.collection("projects").document(project_id), _project_config(scrum_cycle_duration_minutes, max_cycles))
+    return f"Project config updated for {project_id}"
+
+async def aupdate_project_config(db, project_id, scrum_cycle_duration_minutes=1440, max_cycles=10):
+    """`update_project_config` on the async Firestore client."""
+    await adoc_update(db.collection("projects").document(project_id), _project_config(scrum_cycle_duration_minutes, max_cycles))
     return f"Project config updated for {project_id}"
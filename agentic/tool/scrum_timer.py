@@ -1,12 +1,14 @@
-from langchain.tools import tool
+from langchain_core.tools import tool
 import datetime
 from agentic.utils.firebase_client import get_firestore
+from agentic.utils.firestore_batch import adoc_update, doc_update
+from agentic.utils.firestore_cache import cached_aget, cached_get
 
 @tool
 def is_scrum_time_reached(project_id: str) -> bool:
     """Check if the scrum time is reached for the given project"""
     db = get_firestore()
-    doc = db.collection("projects").document(project_id).get()
+    doc = cached_get(db.collection("projects").document(project_id))
     if not doc.exists:
         return True
     
@@ -32,11 +34,8 @@ def is_scrum_time_reached(project_id: str) -> bool:
     
     return minutes_passed >= duration_minutes
 
-@tool
-def get_cycle_timing_info(project_id: str) -> dict:
-    """Get detailed timing information for the current scrum cycle"""
-    db = get_firestore()
-    doc = db.collection("projects").document(project_id).get()
+def _cycle_timing(doc):
+    """The `get_cycle_timing_info` report from a project snapshot."""
     if not doc.exists:
         return {"error": "Project not found"}
     
@@ -78,16 +77,32 @@ def get_cycle_timing_info(project_id: str) -> dict:
         "next_cycle_time": (last_time + datetime.timedelta(minutes=duration_minutes)).isoformat()
     }
 
-@tool
-def set_cycle_start_time(project_id: str, cycle_number: int):
-    """Set the start time for a new scrum cycle"""
-    db = get_firestore()
+def _cycle_start(cycle_number):
     now = datetime.datetime.now(datetime.timezone.utc)
-    
-    db.collection("projects").document(project_id).update({
+    return {
         "last_scrum_timestamp": now,
         "current_cycle": cycle_number,
         "cycle_start_time": now
-    })
-    
+    }
+
+@tool
+def get_cycle_timing_info(project_id: str) -> dict:
+    """Get detailed timing information for the current scrum cycle"""
+    db = get_firestore()
+    return _cycle_timing(cached_get(db.collection("projects").document(project_id)))
+
+async def aget_cycle_timing_info(db, project_id):
+    """`get_cycle_timing_info` on the async Firestore client."""
+    return _cycle_timing(await cached_aget(db.collection("projects").document(project_id)))
+
+@tool
+def set_cycle_start_time(project_id: str, cycle_number: int):
+    """Set the start time for a new scrum cycle"""
+    db = get_firestore()
+    doc_update(db.collection("projects").document(project_id), _cycle_start(cycle_number))
+    return f"Cycle {cycle_number} start time set for {project_id}"
+
+async def aset_cycle_start_time(db, project_id, cycle_number):
+    """`set_cycle_start_time` on the async Firestore client."""
+    await adoc_update(db.collection("projects").document(project_id), _cycle_start(cycle_number))
     return f"Cycle {cycle_number} start time set for {project_id}"
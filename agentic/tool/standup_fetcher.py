@@ -1,16 +1,20 @@
-from langchain.tools import tool
+from langchain_core.tools import tool
 from agentic.utils.firebase_client import get_firestore
+from agentic.utils.firestore_batch import atomic_writes, doc_set
+from agentic.utils.firestore_cache import cached_get, cached_query
+from agentic.utils.project_view import get_project_view
+from agentic.utils.ticket_store import server_stamped
+from agentic.utils.standup_watcher import get_standup_watcher, standup_status
+from agentic.utils.workload_aggregates import record_standup
 import datetime
 
 @tool
 def get_all_standups(project_id: str, cycle_number: int):
     """Get all standups for the given project and cycle number"""
     db = get_firestore()
-    docs = db.collection("projects")\
-             .document(project_id)\
-             .collection("standups")\
-             .where("cycle", "==", cycle_number).stream()
-    return [doc.to_dict() for doc in docs]
+    collection = db.collection("projects").document(project_id).collection("standups")
+    query = collection.where("cycle", "==", cycle_number)
+    return cached_query(collection, ("cycle", cycle_number), lambda: [doc.to_dict() for doc in query.stream()])
 
 @tool
 def get_standup_status(project_id: str, cycle_number: int):
@@ -18,40 +22,26 @@ def get_standup_status(project_id: str, cycle_number: int):
     db = get_firestore()
     
     # Get all developers for the project
-    dev_docs = db.collection("projects").document(project_id).collection("dev_profiles").stream()
-    all_devs = [doc.to_dict() for doc in dev_docs]
-    
+    dev_collection = db.collection("projects").document(project_id).collection("dev_profiles")
+    all_devs = cached_query(dev_collection, "all", lambda: [doc.to_dict() for doc in dev_collection.stream()])
+
     # Get submitted standups for this cycle
-    standup_docs = db.collection("projects")\
-                    .document(project_id)\
-                    .collection("standups")\
-                    .where("cycle", "==", cycle_number).stream()
-    submitted_standups = [doc.to_dict() for doc in standup_docs]
-    
-    # Create status report
-    submitted_dev_ids = [s.get("dev_id") for s in submitted_standups]
-    missing_devs = [dev for dev in all_devs if dev.get("id") not in submitted_dev_ids]
+    standup_collection = db.collection("projects").document(project_id).collection("standups")
+    standup_query = standup_collection.where("cycle", "==", cycle_number)
+    submitted_standups = cached_query(standup_collection, ("cycle", cycle_number),
+                                      lambda: [doc.to_dict() for doc in standup_query.stream()])
     
-    return {
-        "cycle_number": cycle_number,
-        "total_developers": len(all_devs),
-        "submitted_standups": len(submitted_standups),
-        "missing_standups": len(missing_devs),
-        "submitted_devs": [s.get("dev_id") for s in submitted_standups],
-        "missing_devs": [dev.get("id") for dev in missing_devs],
-        "is_complete": len(submitted_standups) >= len(all_devs)
-    }
+    # Create status report (set membership, not a scan of the standup list per developer)
+    submitted_dev_ids = {s.get("dev_id") for s in submitted_standups}
+    return standup_status(cycle_number, [dev.get("id") for dev in all_devs], submitted_dev_ids)
 
 @tool
 def create_standup_template(project_id: str, cycle_number: int, dev_id: str):
     """Create a standup template for a developer in a specific cycle"""
     db = get_firestore()
     
-    # Get current tickets for this developer
-    ticket_docs = db.collection("projects").document(project_id).collection("tickets")\
-                   .where("assigned_dev_id", "==", dev_id)\
-                   .where("status", "in", ["in_progress", "todo"]).stream()
-    current_tickets = [doc.to_dict() for doc in ticket_docs]
+    # Get current (open) tickets for this developer
+    current_tickets = get_project_view(project_id).tickets(db, assigned_dev_id=dev_id, open_only=True)
     
     template = {
         "cycle": cycle_number,
@@ -83,13 +73,17 @@ def save_standup(project_id: str, cycle_number: int, dev_id: str, standup_data:
     standup_data.update({
         "cycle": cycle_number,
         "dev_id": dev_id,
-        "timestamp": datetime.datetime.utcnow(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc),
         "status": "completed"
     })
     
     # Save to Firebase
     doc_id = f"{dev_id}_cycle_{cycle_number}"
-    db.collection("projects").document(project_id).collection("standups").document(doc_id).set(standup_data)
+    with atomic_writes(db):
+        doc_set(db.collection("projects").document(project_id).collection("standups").document(doc_id), server_stamped(standup_data))
+        record_standup(db, project_id, dev_id, cycle_number, doc_id, standup_data["timestamp"])
+    # Release a WaitForStandups in this process that is waiting on this cycle
+    get_standup_watcher().notify(project_id, cycle_number, dev_id)
     
     return f"Standup saved for dev {dev_id} in cycle {cycle_number}"
 
@@ -98,16 +92,16 @@ def get_standup_summary_data(project_id: str, cycle_number: int):
     """Get all standup data formatted for summarization"""
     db = get_firestore()
     
+    # The project view reads each slice with its indexed query once, then only what changed
+    view = get_project_view(project_id)
+
     # Get all standups for this cycle
-    standup_docs = db.collection("projects")\
-                    .document(project_id)\
-                    .collection("standups")\
-                    .where("cycle", "==", cycle_number).stream()
-    standups = [doc.to_dict() for doc in standup_docs]
-    
-    # Get current tickets for context
-    ticket_docs = db.collection("projects").document(project_id).collection("tickets").stream()
-    tickets = [doc.to_dict() for doc in ticket_docs]
+    standups = view.standups(db, cycle_number)
+
+    # Get current tickets for context: open ones, and those completed since the last cycle ended
+    project_doc = cached_get(db.collection("projects").document(project_id))
+    since = project_doc.to_dict().get("last_scrum_timestamp") if project_doc.exists else None
+    tickets = view.cycle_tickets(db, since)
     
     # Format data for summarization
     summary_data = {
@@ -1,18 +1,25 @@
-import warnings
-from langchain_pinecone import Pinecone
-from langchain_huggingface import HuggingFaceEmbeddings
-from agentic.utils.pinecone_client import init_pinecone
+import asyncio
+from typing import Any, Optional
+from langchain_core.retrievers import BaseRetriever
+from agentic.utils.retrieval import get_retrieval_engine
 
-def get_vector_retriever(project_id: str):
-    """get the vector retriever for the given project"""
-    # Suppress Pinecone LangChainDeprecationWarning
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", category=UserWarning, message=".*Pinecone.*deprecated.*")
-        warnings.filterwarnings("ignore", category=DeprecationWarning, message=".*Pinecone.*deprecated.*")
-        index = init_pinecone()  # This is a Pinecone Index object
-        return Pinecone(
-            index=index,
-            embedding=HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2"),
-            text_key="text",  # Required parameter for the new API
-            namespace=project_id
-        ).as_retriever()
+class HybridRetriever(BaseRetriever):
+    """LangChain retriever over a project's `RetrievalEngine`; `k` and `filter` may be passed per call."""
+
+    engine: Any
+    k: int = 4
+    filter: Optional[dict] = None
+
+    def _get_relevant_documents(self, query: str, *, run_manager=None, k: Optional[int] = None, filter: Optional[dict] = None):
+        return self.engine.search(query, k=k or self.k, filter=filter or self.filter)
+
+    async def _aget_relevant_documents(self, query: str, *, run_manager=None, k: Optional[int] = None, filter: Optional[dict] = None):
+        # Embedding the query and scanning the store are blocking; keep them off the event loop
+        return await asyncio.to_thread(self._get_relevant_documents, query, k=k, filter=filter)
+
+def get_vector_retriever(project_id: str, k: int = 4, filter: Optional[dict] = None, corpus_text: Optional[str] = None):
+    """get the vector retriever for the given project; pass `corpus_text` (the description) to add BM25 scoring"""
+    engine = get_retrieval_engine(project_id)
+    if corpus_text:
+        engine.index_text(corpus_text)
+    return HybridRetriever(engine=engine, k=k, filter=filter)
@@ -0,0 +1,150 @@
+import os
+import time
+import numpy as np
+
+# Hours of work a developer can hold at once (open tickets plus new assignments)
+DEV_CAPACITY_HOURS = float(os.getenv("DEV_CAPACITY_HOURS", "80"))
+# Score lost per open ticket, as in the original workload heuristic
+TODO_PENALTY = 0.2
+
+def _skills(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    return [str(s).strip().lower() for s in value if str(s).strip()]
+
+def build_skill_index(developers):
+    """Inverted index from lower-cased skill to the array of developer positions that have it."""
+    index = {}
+    for position, dev in enumerate(developers):
+        for skill in set(_skills(dev.get("tech"))):
+            index.setdefault(skill, []).append(position)
+    return {skill: np.asarray(positions, dtype=np.int64) for skill, positions in index.items()}
+
+def skill_match_matrix(tickets, developers, skill_index=None):
+    """
+    Tickets x developers skill match in [1, 2]: 1 plus the fraction of the ticket's
+    `tech_requirements` the developer has. Tickets without requirements score 1 for everyone.
+    """
+    skill_index = skill_index if skill_index is not None else build_skill_index(developers)
+    rows, cols, weights = [], [], []
+    for t, ticket in enumerate(tickets):
+        requirements = set(_skills(ticket.get("tech_requirements")))
+        if not requirements:
+            continue
+        weight = 1.0 / len(requirements)
+        for requirement in requirements:
+            positions = skill_index.get(requirement)
+            if positions is not None:
+                rows.append(np.full(len(positions), t, dtype=np.int64))
+                cols.append(positions)
+                weights.append(np.full(len(positions), weight, dtype=np.float32))
+    matrix = np.ones((len(tickets), len(developers)), dtype=np.float32)
+    if rows:
+        np.add.at(matrix, (np.concatenate(rows), np.concatenate(cols)), np.concatenate(weights))
+    return matrix
+
+def workload_vectors(developers, workloads):
+    """Per-developer open ticket count, completion rate (0-1) and open hours, in `developers` order."""
+    todo = np.zeros(len(developers), dtype=np.float32)
+    completion = np.zeros(len(developers), dtype=np.float32)
+    open_hours = np.zeros(len(developers), dtype=np.float32)
+    for position, dev in enumerate(developers):
+        workload = workloads.get(dev.get("id")) or {}
+        todo[position] = workload.get("todo_tickets", 0)
+        completion[position] = workload.get("completion_rate", 0) / 100
+        open_hours[position] = workload.get("total_estimated_hours", 0) - workload.get("completed_hours", 0)
+    return todo, completion, open_hours
+
+def solve_assignment(tickets, developers, workloads, capacity_hours=None):
+    """
+    Assign tickets to developers, maximizing skill match and track record while
+    keeping every developer within `capacity_hours` of open work.
+
+    Scores follow the original heuristic (skill match + workload + completion rate),
+    but each assignment adds to the developer's load, lowering their score for the
+    next ticket. Assigning tickets with hour capacities is a generalized assignment
+    problem (NP-hard), so this is a regret-ordered greedy heuristic, not a solver:
+    tickets whose best and second-best developers differ most are placed first,
+    each on the best developer that still has room. Every assignment respects the
+    capacities, but the total score is not guaranteed to be optimal, and a ticket
+    may be left unassigned although a different packing would have fit it.
+
+    Args:
+        tickets (List[dict]): Tickets with optional `tech_requirements` and `estimated_hours` (default 8).
+        developers (List[dict]): Developer profiles with `id` and `tech`.
+        workloads (Dict[str, dict]): Current workload per dev id (as from `analyze_developer_workload`).
+        capacity_hours (float): Per-developer capacity (env `DEV_CAPACITY_HOURS`).
+
+    Returns:
+        Tuple[List[dict], dict]: One assignment per ticket, in input order (`assigned_dev_id`
+        is None when nobody has room), and stats with timing and totals.
+    """
+    start = time.perf_counter()
+    capacity_hours = DEV_CAPACITY_HOURS if capacity_hours is None else capacity_hours
+    if not tickets or not developers:
+        return [
+            {"ticket": ticket, "assigned_dev_id": None, "assignment_score": None, "reasoning": "No developers available"}
+            for ticket in tickets
+        ], {"tickets": len(tickets), "developers": len(developers), "assigned": 0, "unassigned": len(tickets),
+              "assigned_hours": 0.0, "solve_time_s": 0.0}
+
+    todo, completion, open_hours = workload_vectors(developers, workloads)
+    skill = skill_match_matrix(tickets, developers)
+    scores = skill + (1.0 - TODO_PENALTY * todo) + completion
+    hours = np.asarray([float(t.get("estimated_hours", 8) or 0) for t in tickets], dtype=np.float32)
+    remaining = capacity_hours - open_hours
+    assigned_count = np.zeros(len(developers), dtype=np.float32)
+
+    # Regret: how much a ticket loses if it can't have its favourite developer
+    if len(developers) > 1:
+        top_two = -np.partition(-scores, 1, axis=1)[:, :2]
+        regret = top_two[:, 0] - top_two[:, 1]
+    else:
+        regret = np.zeros(len(tickets), dtype=np.float32)
+    order = np.lexsort((-hours, -regret))
+
+    choice = np.full(len(tickets), -1, dtype=np.int64)
+    chosen_score = np.zeros(len(tickets), dtype=np.float32)
+    # Tickets the chosen developer already had from this batch when this one was placed
+    batch_load = np.zeros(len(tickets), dtype=np.int64)
+    for t in order:
+        row = scores[t] - TODO_PENALTY * assigned_count
+        row = np.where(remaining >= hours[t], row, -np.inf)
+        d = int(np.argmax(row))
+        if row[d] == -np.inf:
+            continue
+        choice[t] = d
+        chosen_score[t] = row[d]
+        batch_load[t] = assigned_count[d]
+        remaining[d] -= hours[t]
+        assigned_count[d] += 1
+
+    assignments = []
+    for t, ticket in enumerate(tickets):
+        d = choice[t]
+        if d < 0:
+            assignments.append({
+                "ticket": ticket, "assigned_dev_id": None, "assignment_score": None,
+                "reasoning": f"No developer has {hours[t]:.0f} free hours within the {capacity_hours:.0f}h capacity"
+            })
+            continue
+        assignments.append({
+            "ticket": ticket,
+            "assigned_dev_id": developers[d].get("id"),
+            "assignment_score": float(chosen_score[t]),
+            "reasoning": (
+                f"Best match based on skills ({skill[t, d] - 1:.0%} of requirements), workload "
+                f"({todo[d]:.0f} open tickets, {batch_load[t]} already assigned in this batch) and completion rate ({completion[d]:.0%})"
+            )
+        })
+    assigned = int((choice >= 0).sum())
+    return assignments, {
+        "tickets": len(tickets),
+        "developers": len(developers),
+        "assigned": assigned,
+        "unassigned": len(tickets) - assigned,
+        "assigned_hours": float(hours[choice >= 0].sum()),
+        "solve_time_s": time.perf_counter() - start
+    }
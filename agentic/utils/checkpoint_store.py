@@ -0,0 +1,199 @@
+import datetime
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CHECKPOINTS_ENABLED = os.getenv("CHECKPOINTS_ENABLED", "true").lower() in ("1", "true", "yes")
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", os.path.join(".cache", "checkpoints.sqlite"))
+# Cycles of checkpoints kept per project; older cycles are pruned as new ones start
+CHECKPOINT_KEEP_CYCLES = int(os.getenv("CHECKPOINT_KEEP_CYCLES", "5"))
+
+def _encode(value):
+    # Firestore timestamps come back as datetimes; keep them datetimes across a resume
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    return str(value)
+
+def _decode(obj):
+    if len(obj) == 1 and "__datetime__" in obj:
+        return datetime.datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+def dumps_state(state):
+    return json.dumps(state, default=_encode)
+
+def loads_state(text):
+    return json.loads(text, object_hook=_decode) if text is not None else None
+
+class CheckpointStore:
+    """
+    SQLite store of workflow graph state, one row per (project, cycle, node).
+
+    Each node's input state is saved before it runs (status "running") and its
+    output after it returns ("done", or "failed" if it raised), so a run can be
+    resumed at any node of any kept cycle, or from wherever it stopped.
+    """
+
+    def __init__(self, path=CHECKPOINT_PATH, keep_cycles=CHECKPOINT_KEEP_CYCLES):
+        self.keep_cycles = keep_cycles
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL with normal sync: a checkpoint costs a page write, not an fsync per node
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "project_id TEXT, cycle INTEGER, node TEXT, status TEXT, input TEXT, output TEXT, "
+            "error TEXT, updated_at REAL, PRIMARY KEY (project_id, cycle, node))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS checkpoints_recent ON checkpoints (project_id, updated_at)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.saves = 0
+
+    def start(self, project_id, cycle, node, state):
+        """Record that `node` is about to run on `state`."""
+        text = dumps_state(state)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (project_id, cycle, node, status, input, output, error, updated_at) "
+                "VALUES (?, ?, ?, 'running', ?, NULL, NULL, ?)",
+                (project_id, cycle, node, text, time.time())
+            )
+            if self.keep_cycles > 0:
+                self._conn.execute(
+                    "DELETE FROM checkpoints WHERE project_id = ? AND cycle <= ?", (project_id, cycle - self.keep_cycles)
+                )
+            self._conn.commit()
+            self.saves += 1
+
+    def finish(self, project_id, cycle, node, state=None, error=None):
+        """Record the node's output state, or the error it raised."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE checkpoints SET status = ?, output = ?, error = ?, updated_at = ? "
+                "WHERE project_id = ? AND cycle = ? AND node = ?",
+                ("failed" if error is not None else "done", dumps_state(state) if error is None else None,
+                 None if error is None else repr(error), time.time(), project_id, cycle, node)
+            )
+            self._conn.commit()
+            self.saves += 1
+
+    @staticmethod
+    def _row(row):
+        if row is None:
+            return None
+        project_id, cycle, node, status, input_text, output_text, error, updated_at = row
+        return {
+            "project_id": project_id,
+            "cycle": cycle,
+            "node": node,
+            "status": status,
+            "input": loads_state(input_text),
+            "output": loads_state(output_text),
+            "error": error,
+            "updated_at": updated_at
+        }
+
+    def get(self, project_id, node, cycle=None):
+        """
+        The checkpoint of one node, in `cycle` or the latest cycle it ran in.
+
+        Returns:
+            dict | None: project_id, cycle, node, status, input and output state, error, updated_at.
+        """
+        query = "SELECT * FROM checkpoints WHERE project_id = ? AND node = ?"
+        params = [project_id, node]
+        if cycle is not None:
+            query += " AND cycle = ?"
+            params.append(cycle)
+        with self._lock:
+            row = self._conn.execute(query + " ORDER BY cycle DESC LIMIT 1", params).fetchone()
+        return self._row(row)
+
+    def latest(self, project_id):
+        """The most recently written checkpoint of a project, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM checkpoints WHERE project_id = ? ORDER BY updated_at DESC LIMIT 1", (project_id,)
+            ).fetchone()
+        return self._row(row)
+
+    def history(self, project_id, cycle=None):
+        """(cycle, node, status, updated_at) of a project's checkpoints, oldest first."""
+        query = "SELECT cycle, node, status, updated_at FROM checkpoints WHERE project_id = ?"
+        params = [project_id]
+        if cycle is not None:
+            query += " AND cycle = ?"
+            params.append(cycle)
+        with self._lock:
+            return self._conn.execute(query + " ORDER BY updated_at", params).fetchall()
+
+    def delete(self, project_id, cycle=None):
+        with self._lock:
+            if cycle is None:
+                self._conn.execute("DELETE FROM checkpoints WHERE project_id = ?", (project_id,))
+            else:
+                self._conn.execute("DELETE FROM checkpoints WHERE project_id = ? AND cycle = ?", (project_id, cycle))
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+        return {"entries": entries, "saves": self.saves}
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_checkpoint_store():
+    """The process-wide `CheckpointStore` at CHECKPOINT_PATH, or None when CHECKPOINTS_ENABLED is false."""
+    global _store
+    if not CHECKPOINTS_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CheckpointStore()
+    return _store
+
+def checkpoint_node(name, node, store):
+    """Wrap a graph node (sync or async) so its input and output are checkpointed in `store`."""
+    if store is None:
+        return node
+
+    def begin(state):
+        project_id, cycle = state.get("project_id"), state.get("scrum_cycle", 0)
+        store.start(project_id, cycle, name, state)
+        return project_id, cycle
+
+    if inspect.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def checkpointed(state):
+            project_id, cycle = begin(state)
+            try:
+                result = await node(state)
+            except Exception as e:
+                store.finish(project_id, cycle, name, error=e)
+                raise
+            store.finish(project_id, cycle, name, result)
+            return result
+        return checkpointed
+
+    @functools.wraps(node)
+    def checkpointed(state):
+        project_id, cycle = begin(state)
+        try:
+            result = node(state)
+        except Exception as e:
+            store.finish(project_id, cycle, name, error=e)
+            raise
+        store.finish(project_id, cycle, name, result)
+        return result
+    return checkpointed
@@ -0,0 +1,55 @@
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+FIRESTORE_READ_CONCURRENCY = int(os.getenv("FIRESTORE_READ_CONCURRENCY", "8"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=FIRESTORE_READ_CONCURRENCY, thread_name_prefix="fan-out")
+    return _executor
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def run_concurrently(calls):
+    """
+    Run independent calls on the shared bounded read pool and wait for all of them.
+
+    Each call runs in a copy of the caller's context, so context-scoped state
+    (such as an active Firestore write buffer) is visible to it.
+
+    Args:
+        calls (Dict[str, Callable[[], Any]]): Zero-argument callables keyed by name.
+
+    Returns:
+        Tuple[dict, dict]: Results keyed by name, and a timing report with the
+        wall time, the critical path (slowest call) and the sequential sum.
+    """
+    start = time.perf_counter()
+    executor = _get_executor()
+    futures = {
+        name: executor.submit(contextvars.copy_context().run, _timed, fn)
+        for name, fn in calls.items()
+    }
+    results, timings = {}, {}
+    for name, future in futures.items():
+        results[name], timings[name] = future.result()
+    critical_call = max(timings, key=timings.get) if timings else None
+    return results, {
+        "wall_time_s": time.perf_counter() - start,
+        "critical_path_s": timings.get(critical_call, 0.0),
+        "critical_call": critical_call,
+        "sequential_sum_s": sum(timings.values()),
+        "timings_s": timings
+    }
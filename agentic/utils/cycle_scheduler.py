@@ -0,0 +1,226 @@
+import datetime
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SCHEDULER_MAX_WORKERS = int(os.getenv("SCHEDULER_MAX_WORKERS", "4"))
+SCHEDULER_RETRY_SECONDS = float(os.getenv("SCHEDULER_RETRY_SECONDS", "60"))
+DEFAULT_CYCLE_MINUTES = 1440
+
+def _to_epoch(value):
+    """Firestore timestamps arrive as datetimes (naive means UTC) or epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+class CycleScheduler:
+    """
+    Runs scrum cycles for many projects from one in-memory min-heap of due times.
+
+    Each project's `last_scrum_timestamp`, `scrum_cycle_duration_minutes`,
+    `current_cycle` and `max_cycles` are read once (`load()`, or the snapshot
+    listener from `watch()`), and the run loop sleeps on a condition variable
+    until the earliest cycle is due. No per-project polling is done. Use
+    `load()` for a one-off read, or `watch()`, whose first snapshot is that read.
+
+    Heap entries are invalidated lazily: every reschedule bumps the project's
+    version, and popped entries with an old version are skipped.
+
+    Args:
+        dispatch (Callable[[str, dict], Any]): Runs one cycle. Called with the
+            project id and the project's data, plus `next_cycle`, on a worker thread.
+        db: Firestore client; defaults to `get_firestore()`.
+        max_workers (int): Cycles run at the same time (env `SCHEDULER_MAX_WORKERS`).
+    """
+
+    def __init__(self, dispatch, db=None, max_workers=None):
+        self.dispatch = dispatch
+        self.db = db
+        self._heap = []  # (due_epoch, seq, project_id, version)
+        self._projects = {}  # project_id -> {"data", "version", "due", "running"}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._watch = None
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or SCHEDULER_MAX_WORKERS, thread_name_prefix="scrum-cycle")
+        self.dispatched = 0
+        self.failed = 0
+        self.wakeups = 0
+        self.stale_entries = 0
+
+    def _get_db(self):
+        if self.db is None:
+            from agentic.utils.firebase_client import get_firestore
+            self.db = get_firestore()
+        return self.db
+
+    def _active_projects(self):
+        return self._get_db().collection("projects").where("status", "==", "active")
+
+    @staticmethod
+    def next_cycle(data):
+        """The cycle a project runs next: 0 before its first cycle, otherwise `current_cycle + 1`."""
+        if data.get("last_scrum_timestamp") is None:
+            return 0
+        return data.get("current_cycle", 0) + 1
+
+    @staticmethod
+    def due_time(data):
+        """Epoch seconds at which the project's next cycle is due, or None when it has run all its cycles."""
+        if CycleScheduler.next_cycle(data) >= data.get("max_cycles", 10):
+            return None
+        last = _to_epoch(data.get("last_scrum_timestamp"))
+        if last is None:
+            return time.time()
+        return last + 60 * data.get("scrum_cycle_duration_minutes", DEFAULT_CYCLE_MINUTES)
+
+    def load(self):
+        """Read every active project once and schedule it. Returns the number of projects scheduled."""
+        scheduled = 0
+        for doc in self._active_projects().stream():
+            if self.update_project(doc.id, doc.to_dict()):
+                scheduled += 1
+        return scheduled
+
+    def watch(self):
+        """
+        Keep the schedule in sync with Firestore through one snapshot listener on
+        the active projects, so config edits and new projects take effect without polling.
+        """
+        def on_snapshot(_docs, changes, _read_time):
+            for change in changes:
+                if change.type.name == "REMOVED":
+                    self.remove_project(change.document.id)
+                else:
+                    self.update_project(change.document.id, change.document.to_dict())
+
+        self._watch = self._active_projects().on_snapshot(on_snapshot)
+        return self._watch
+
+    def update_project(self, project_id, data):
+        """
+        Record a project's latest config and (re)schedule its next cycle.
+
+        While the project's cycle is running only the data is recorded; it is
+        rescheduled when the cycle finishes. Returns True if a cycle was scheduled.
+        """
+        with self._cond:
+            entry = self._projects.setdefault(project_id, {"version": 0, "due": None, "running": False})
+            entry["data"] = dict(data)
+            entry["version"] += 1
+            if entry["running"]:
+                return False
+            return self._push(project_id, entry)
+
+    def remove_project(self, project_id):
+        with self._cond:
+            entry = self._projects.pop(project_id, None)
+            if entry is not None:
+                # Any queued heap entry now refers to a missing project and is skipped
+                self._cond.notify()
+
+    def _push(self, project_id, entry):
+        due = self.due_time(entry["data"])
+        if due is not None:
+            # A failed cycle is retried after SCHEDULER_RETRY_SECONDS, not immediately
+            due = max(due, entry.get("retry_at", 0))
+        entry["due"] = due
+        if due is None:
+            return False
+        heapq.heappush(self._heap, (due, next(self._seq), project_id, entry["version"]))
+        # Wake the run loop in case this is now the earliest cycle
+        self._cond.notify()
+        return True
+
+    def _pop_due(self):
+        """Pop the next due, current heap entry, or return the seconds to wait (None: nothing queued)."""
+        while self._heap:
+            due, _, project_id, version = self._heap[0]
+            entry = self._projects.get(project_id)
+            if entry is None or entry["version"] != version or entry["running"]:
+                heapq.heappop(self._heap)
+                self.stale_entries += 1
+                continue
+            wait = due - time.time()
+            if wait > 0:
+                return None, wait
+            heapq.heappop(self._heap)
+            return project_id, 0
+        return None, None
+
+    def run(self, stop_after=None):
+        """
+        Dispatch cycles as they fall due until `stop()` is called.
+
+        Args:
+            stop_after (int): Stop once this many cycles have finished (for demos and tests).
+        """
+        with self._cond:
+            while not self._stopped:
+                if stop_after is not None and self.dispatched + self.failed >= stop_after:
+                    break
+                project_id, wait = self._pop_due()
+                if project_id is None:
+                    self._cond.wait(timeout=wait)
+                    self.wakeups += 1
+                    continue
+                entry = self._projects[project_id]
+                entry["running"] = True
+                entry["dispatched_cycle"] = self.next_cycle(entry["data"])
+                data = dict(entry["data"], next_cycle=entry["dispatched_cycle"])
+                future = self._pool.submit(self.dispatch, project_id, data)
+                future.add_done_callback(lambda f, project_id=project_id: self._finished(project_id, f))
+
+    def _finished(self, project_id, future):
+        error = future.exception()
+        with self._cond:
+            if error is None:
+                self.dispatched += 1
+            else:
+                self.failed += 1
+                print(f"[SCHEDULER] Cycle for {project_id} failed: {error}")
+            entry = self._projects.get(project_id)
+            if entry is not None:
+                entry["running"] = False
+                cycle = entry.pop("dispatched_cycle", self.next_cycle(entry["data"]))
+                if error is None:
+                    # The cycle just ran; the next one is due a full duration from now. The
+                    # listener may already have delivered the cycle's own project write, so
+                    # the cycle comes from the dispatch, not from `data`.
+                    entry["data"]["current_cycle"] = cycle
+                    entry["data"]["last_scrum_timestamp"] = datetime.datetime.now(datetime.timezone.utc)
+                    entry.pop("retry_at", None)
+                else:
+                    entry["retry_at"] = time.time() + SCHEDULER_RETRY_SECONDS
+                entry["version"] += 1
+                self._push(project_id, entry)
+            self._cond.notify()
+
+    def stop(self, wait=True):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._watch is not None:
+            self._watch.unsubscribe()
+        self._pool.shutdown(wait=wait)
+
+    def stats(self):
+        with self._cond:
+            next_due = min((e["due"] for e in self._projects.values() if e["due"] is not None and not e["running"]), default=None)
+            return {
+                "projects": len(self._projects),
+                "running": sum(1 for e in self._projects.values() if e["running"]),
+                "queued": len(self._heap),
+                "dispatched": self.dispatched,
+                "failed": self.failed,
+                "wakeups": self.wakeups,
+                "stale_entries": self.stale_entries,
+                "next_due_in_s": None if next_due is None else max(0.0, next_due - time.time())
+            }
@@ -1,15 +1,115 @@
-from langchain_huggingface import HuggingFaceEmbeddings
+import os
+import threading
+import time
+import numpy as np
+from agentic.utils.embedding_cache import get_embedding_cache
+from agentic.logger.metrics import EMBEDDING_BATCH, EMBEDDING_COMPUTED, EMBEDDING_SECONDS
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_NORMALIZE = os.getenv("EMBEDDING_NORMALIZE", "false").lower() in ("1", "true", "yes")
+
+# langchain_huggingface (and torch behind it) is imported on first use; see `_embeddings_class()`
+HuggingFaceEmbeddings = None
+_embedder = None
+_embedder_lock = threading.Lock()
+_embedder_stats = {}
+
+def _max_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _embeddings_class():
+    global HuggingFaceEmbeddings
+    if HuggingFaceEmbeddings is None:
+        from langchain_huggingface import HuggingFaceEmbeddings as embeddings_class
+        HuggingFaceEmbeddings = embeddings_class
+    return HuggingFaceEmbeddings
+
+def get_embedder():
+    """
+    Return the process-wide embedding model, loading it on first use.
+
+    The model is loaded once behind a lock, so concurrent callers share a single
+    copy of the weights. Batch size and normalization come from the
+    `EMBEDDING_BATCH_SIZE` and `EMBEDDING_NORMALIZE` environment variables.
+
+    Returns:
+        HuggingFaceEmbeddings: The shared embedding model.
+    """
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                rss_before = _max_rss_mb()
+                start = time.perf_counter()
+                embedder = _embeddings_class()(
+                    model_name=EMBEDDING_MODEL_NAME,
+                    encode_kwargs={
+                        "batch_size": EMBEDDING_BATCH_SIZE,
+                        "normalize_embeddings": EMBEDDING_NORMALIZE
+                    }
+                )
+                rss_after = _max_rss_mb()
+                _embedder_stats.update({
+                    "model_name": EMBEDDING_MODEL_NAME,
+                    "batch_size": EMBEDDING_BATCH_SIZE,
+                    "normalize": EMBEDDING_NORMALIZE,
+                    "load_time_s": time.perf_counter() - start,
+                    "load_rss_delta_mb": (rss_after - rss_before) if rss_before is not None else None,
+                    "max_rss_mb": rss_after
+                })
+                print(f"🧠 Loaded embedding model {EMBEDDING_MODEL_NAME} in {_embedder_stats['load_time_s']:.2f}s")
+                _embedder = embedder
+    return _embedder
+
+def warmup_embedder():
+    """Load the embedding model and run one encode so the first real request does not pay for it."""
+    start = time.perf_counter()
+    get_embedder().embed_query("warmup")
+    _embedder_stats["warmup_time_s"] = time.perf_counter() - start
+    return get_embedder_stats()
+
+def get_embedder_stats():
+    """Return load time and memory figures for the shared embedding model (empty until loaded)."""
+    return dict(_embedder_stats)
 
 def embed_documents(docs):
     """
-    Embed documents using HuggingFace embeddings.
-    
+    Embed documents using the shared HuggingFace embedding model.
+
+    Vectors already present in the on-disk embedding cache are read back from it;
+    only the cache misses are sent to the model.
+
     Args:
         docs (List[Document]): A list of documents, each having a `page_content` attribute.
-    
+
     Returns:
-        List[List[float]]: A list of embeddings for each document.
+        List[np.ndarray]: A float32 embedding for each document.
     """
-    embedder = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
     # Each document is expected to have a 'page_content' attribute
-    return embedder.embed_documents([d.page_content for d in docs])
+    texts = [d.page_content for d in docs]
+    EMBEDDING_BATCH.observe(len(texts))
+    with EMBEDDING_SECONDS.time():
+        cache = get_embedding_cache()
+        if cache is None:
+            EMBEDDING_COMPUTED.inc(len(texts))
+            return list(np.asarray(get_embedder().embed_documents(texts), dtype=np.float32))
+
+        found, missing = cache.get_many(EMBEDDING_MODEL_NAME, texts, EMBEDDING_NORMALIZE)
+        if missing:
+            # Repeated sentences are embedded once
+            missing_texts = list(dict.fromkeys(texts[i] for i in missing))
+            EMBEDDING_COMPUTED.inc(len(missing_texts))
+            computed = np.asarray(get_embedder().embed_documents(missing_texts), dtype=np.float32)
+            cache.put_many(EMBEDDING_MODEL_NAME, missing_texts, computed, EMBEDDING_NORMALIZE)
+            by_text = dict(zip(missing_texts, computed))
+            found.update((i, by_text[texts[i]]) for i in missing)
+        return [found[i] for i in range(len(texts))]
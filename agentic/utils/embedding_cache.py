@@ -0,0 +1,210 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", os.path.join(".cache", "embeddings"))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+
+_KEY_DTYPE = np.dtype([("key", "S16"), ("slot", "<i4")])
+_INITIAL_SLOTS = 1024
+
+def cache_key(model_name, text, normalize=False):
+    """
+    Content address for one embedding: the first 16 bytes of sha256 over the model
+    name, whether vectors are normalized, the stored dtype (float32) and the text.
+    """
+    return hashlib.sha256(f"{model_name}\0{bool(normalize)}\0float32\0{text}".encode("utf-8")).digest()[:16]
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache backed by a memory-mapped float32 matrix.
+
+    Vectors live in `vectors.f32` (one row per slot) and the key index lives in
+    `index.log`, an append-only journal of (16-byte key, slot) records: each
+    `put_many` appends one record per vector it wrote, and replaying the journal
+    (a later record for a slot evicts the earlier key) rebuilds the index in
+    least to most recently used order. Once the journal holds more than twice as
+    many records as live entries it is rewritten compacted. When `max_entries` is
+    reached the least recently used slot is reused, so the vectors file never
+    grows beyond `max_entries * dim * 4` bytes.
+    """
+
+    def __init__(self, cache_dir=EMBEDDING_CACHE_DIR, max_entries=EMBEDDING_CACHE_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.vectors_path = os.path.join(cache_dir, "vectors.f32")
+        self.index_path = os.path.join(cache_dir, "index.log")
+        self.meta_path = os.path.join(cache_dir, "meta.npy")
+        self.dim = None
+        self._vectors = None
+        self._slots = 0
+        self._lru = OrderedDict()  # key -> slot, least recently used first
+        self._free = []
+        self._journal_records = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    def _load(self):
+        if not (os.path.exists(self.meta_path) and os.path.exists(self.vectors_path)):
+            return
+        try:
+            dim, slots = (int(v) for v in np.load(self.meta_path))
+            vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(slots, dim))
+            journal = b""
+            if os.path.exists(self.index_path):
+                with open(self.index_path, "rb") as f:
+                    journal = f.read()
+        except (OSError, ValueError):
+            # Corrupt or incompatible cache files: start over rather than fail the embedding call
+            return
+        self.dim, self._slots, self._vectors = dim, slots, vectors
+        # A record cut short by a crash mid-append is dropped
+        records = np.frombuffer(journal[:len(journal) - len(journal) % _KEY_DTYPE.itemsize], dtype=_KEY_DTYPE)
+        owners = {}  # slot -> key
+        for record in records:
+            # numpy strips trailing NUL bytes from "S" fields
+            key, slot = bytes(record["key"]).ljust(16, b"\0"), int(record["slot"])
+            if not 0 <= slot < slots:
+                continue
+            evicted = owners.get(slot)
+            if evicted is not None and evicted != key:
+                del self._lru[evicted]
+            previous = self._lru.pop(key, None)
+            if previous is not None and previous != slot:
+                del owners[previous]
+            self._lru[key] = slot
+            owners[slot] = key
+        self._journal_records = len(records)
+        used = set(self._lru.values())
+        self._free = [slot for slot in range(slots) if slot not in used]
+        while len(self._lru) > self.max_entries:
+            _, slot = self._lru.popitem(last=False)
+            self._free.append(slot)
+
+    def _grow(self, min_slots):
+        target = max(_INITIAL_SLOTS, self._slots)
+        while target < min_slots:
+            target *= 2
+        target = min(target, self.max_entries)
+        if target <= self._slots:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(target * self.dim * 4)
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(target, self.dim))
+        self._free.extend(range(self._slots, target))
+        self._slots = target
+        # Written after the file has grown, so the recorded shape always fits the file
+        np.save(self.meta_path + ".tmp.npy", np.array([self.dim, self._slots], dtype=np.int64))
+        os.replace(self.meta_path + ".tmp.npy", self.meta_path)
+
+    def _reset(self, dim):
+        self.dim = dim
+        self._vectors = None
+        self._slots = 0
+        self._lru.clear()
+        self._free = []
+        self._journal_records = 0
+        for path in (self.vectors_path, self.index_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def get_many(self, model_name, texts, normalize=False):
+        """
+        Look up embeddings for `texts` made by `model_name` with or without normalization.
+
+        Returns:
+            Tuple[dict, List[int]]: A mapping of input position to a float32 vector
+            (a copy, safe to keep after eviction) and the positions that missed.
+        """
+        found, missing = {}, []
+        with self._lock:
+            for i, text in enumerate(texts):
+                key = cache_key(model_name, text, normalize)
+                slot = self._lru.get(key) if self._vectors is not None else None
+                if slot is None:
+                    missing.append(i)
+                    continue
+                self._lru.move_to_end(key)
+                found[i] = np.array(self._vectors[slot])
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def put_many(self, model_name, texts, vectors, normalize=False):
+        """Store float32 vectors for `texts`, evicting least recently used entries when full."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(texts) == 0:
+            return
+        with self._lock:
+            if self.dim != vectors.shape[1]:
+                self._reset(vectors.shape[1])
+            new_keys = [cache_key(model_name, t, normalize) for t in texts]
+            needed = len(self._lru) + sum(1 for k in set(new_keys) if k not in self._lru)
+            self._grow(needed)
+            for key, vector in zip(new_keys, vectors):
+                slot = self._lru.get(key)
+                if slot is None:
+                    if self._free:
+                        slot = self._free.pop()
+                    else:
+                        _, slot = self._lru.popitem(last=False)
+                        self.evictions += 1
+                    self._lru[key] = slot
+                else:
+                    self._lru.move_to_end(key)
+                self._vectors[slot] = vector
+            self._flush([(key, self._lru[key]) for key in new_keys])
+
+    def _flush(self, written):
+        """Persist the vectors, then journal the (key, slot) records of `written`."""
+        self._vectors.flush()
+        if self._journal_records + len(written) > 2 * max(len(self._lru), _INITIAL_SLOTS):
+            # Rewrite the journal as the current index, through a temp file so a crash
+            # never leaves a half-written one behind
+            records = np.fromiter(self._lru.items(), dtype=_KEY_DTYPE, count=len(self._lru))
+            with open(self.index_path + ".tmp", "wb") as f:
+                f.write(records.tobytes())
+            os.replace(self.index_path + ".tmp", self.index_path)
+            self._journal_records = len(records)
+            return
+        # Appended only after the vectors they point to are on disk
+        with open(self.index_path, "ab") as f:
+            f.write(np.array(written, dtype=_KEY_DTYPE).tobytes())
+        self._journal_records += len(written)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._lru),
+            "slots": self._slots,
+            "dim": self.dim,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+            "bytes_on_disk": self._slots * (self.dim or 0) * 4
+        }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_embedding_cache():
+    """Return the process-wide embedding cache, or None when disabled via `EMBEDDING_CACHE_ENABLED`."""
+    global _cache
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache()
+    return _cache
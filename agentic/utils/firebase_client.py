@@ -1,16 +1,51 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
 import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
 
-cred_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-if not firebase_admin._apps:
-    cred = credentials.Certificate(cred_path)
-    firebase_admin.initialize_app(cred)
+# firebase_admin and the Firestore clients are imported and initialized on first
+# use, so importing the tools (or the workflow) costs no credentials or gRPC setup.
+_db = None
+_async_db = None
+_lock = threading.Lock()
 
-db = firestore.client()
+def _ensure_app():
+    import firebase_admin
+    from firebase_admin import credentials
+    if not firebase_admin._apps:
+        cred = credentials.Certificate(os.getenv("GOOGLE_APPLICATION_CREDENTIALS"))
+        firebase_admin.initialize_app(cred)
 
 def get_firestore():
-    return db
+    """Process-wide Firestore client, created (with the Firebase app) on first use."""
+    global _db
+    if _db is None:
+        with _lock:
+            if _db is None:
+                from firebase_admin import firestore
+                _ensure_app()
+                _db = firestore.client()
+    return _db
+
+def get_async_firestore():
+    """
+    Async Firestore client on the same Firebase app, created on first use.
+
+    The client's gRPC channel binds to the event loop it is first used on, so
+    use it from a single loop (as `AsyncScrumGraphBuilder` does).
+    """
+    global _async_db
+    if _async_db is None:
+        with _lock:
+            if _async_db is None:
+                from firebase_admin import firestore_async
+                _ensure_app()
+                _async_db = firestore_async.client()
+    return _async_db
+
+def __getattr__(name):
+    # `from agentic.utils.firebase_client import db` keeps working, but connects only when used
+    if name == "db":
+        return get_firestore()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,246 @@
+import contextvars
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from agentic.utils.firestore_cache import invalidate
+from agentic.logger.metrics import observe_firestore
+
+# Firestore rejects batched writes with more than 500 operations
+FIRESTORE_BATCH_LIMIT = 500
+
+def _merge_fields(target, data):
+    """Shallow merge where an `Increment` adds to a queued `Increment` or plain number instead of replacing it."""
+    # Imported here: google.cloud.firestore is only needed once writes are merged
+    from google.cloud.firestore_v1.transforms import Increment
+    for field, value in data.items():
+        if isinstance(value, Increment) and field in target:
+            previous = target[field]
+            if isinstance(previous, Increment):
+                value = Increment(previous.value + value.value)
+            elif isinstance(previous, (int, float)):
+                value = previous + value.value
+        target[field] = value
+
+class WriteBuffer:
+    """
+    Per-node unit of work for Firestore writes.
+
+    Writes are keyed by document path and merged, so two `update()`s to
+    `projects/{id}` become one operation. `commit()` sends the merged writes
+    through `db.batch()` in chunks of at most `FIRESTORE_BATCH_LIMIT`.
+
+    Merging is shallow: later fields overwrite earlier ones (except `Increment`s,
+    which add up), and a plain `set()` replaces everything queued before it for
+    that document.
+    """
+
+    def __init__(self, db=None):
+        self.db = db
+        self._ops = OrderedDict()  # path -> [kind, ref, data]; kind is "set", "merge" or "update"
+        self.requested_ops = 0
+        self.committed_ops = 0
+        self.batches = 0
+        self.commit_time_s = 0.0
+
+    def set(self, ref, data, merge=False):
+        self.requested_ops += 1
+        existing = self._ops.get(ref.path)
+        if existing is None or not merge:
+            self._ops[ref.path] = ["merge" if merge else "set", ref, dict(data)]
+            return
+        _merge_fields(existing[2], data)
+        if existing[0] == "update":
+            # set(merge=True) also creates the document, so the combined write must too
+            existing[0] = "merge"
+
+    def update(self, ref, data):
+        self.requested_ops += 1
+        existing = self._ops.get(ref.path)
+        if existing is None:
+            self._ops[ref.path] = ["update", ref, dict(data)]
+            return
+        _merge_fields(existing[2], data)
+
+    def __len__(self):
+        return len(self._ops)
+
+    def commit(self):
+        """Write all buffered operations and return the buffer stats."""
+        if not self._ops:
+            return self.stats()
+        if self.db is None:
+            from agentic.utils.firebase_client import get_firestore
+            self.db = get_firestore()
+        start = time.perf_counter()
+        ops = list(self._ops.values())
+        for offset in range(0, len(ops), FIRESTORE_BATCH_LIMIT):
+            batch = self.db.batch()
+            chunk = ops[offset:offset + FIRESTORE_BATCH_LIMIT]
+            for kind, ref, data in chunk:
+                if kind == "update":
+                    batch.update(ref, data)
+                else:
+                    batch.set(ref, data, merge=(kind == "merge"))
+            batch_start = time.perf_counter()
+            batch.commit()
+            observe_firestore("batch_commit", batch_start, len(chunk))
+            self.batches += 1
+        # Reads issued while the writes were buffered may have cached pre-write data
+        for _, ref, _ in ops:
+            invalidate(ref.path)
+        self.committed_ops += len(ops)
+        self._ops.clear()
+        self.commit_time_s += time.perf_counter() - start
+        return self.stats()
+
+    async def acommit(self):
+        """
+        `commit()` through the async Firestore client in `self.db`.
+
+        References queued by sync code (tools run through `ainvoke`) are
+        re-created on the async client by path.
+        """
+        if not self._ops:
+            return self.stats()
+        if self.db is None:
+            from agentic.utils.firebase_client import get_async_firestore
+            self.db = get_async_firestore()
+        start = time.perf_counter()
+        ops = list(self._ops.values())
+        for offset in range(0, len(ops), FIRESTORE_BATCH_LIMIT):
+            batch = self.db.batch()
+            chunk = ops[offset:offset + FIRESTORE_BATCH_LIMIT]
+            for kind, ref, data in chunk:
+                ref = self.db.document(ref.path)
+                if kind == "update":
+                    batch.update(ref, data)
+                else:
+                    batch.set(ref, data, merge=(kind == "merge"))
+            batch_start = time.perf_counter()
+            await batch.commit()
+            observe_firestore("batch_commit", batch_start, len(chunk))
+            self.batches += 1
+        for _, ref, _ in ops:
+            invalidate(ref.path)
+        self.committed_ops += len(ops)
+        self._ops.clear()
+        self.commit_time_s += time.perf_counter() - start
+        return self.stats()
+
+    def discard(self):
+        dropped = len(self._ops)
+        self._ops.clear()
+        return dropped
+
+    def stats(self):
+        return {
+            "requested_ops": self.requested_ops,
+            "committed_ops": self.committed_ops,
+            "saved_ops": self.requested_ops - self.committed_ops - len(self._ops),
+            "batches": self.batches,
+            "commit_time_s": self.commit_time_s
+        }
+
+_active_buffer = contextvars.ContextVar("firestore_write_buffer", default=None)
+
+@contextmanager
+def write_buffer(db=None):
+    """
+    Buffer every `doc_set`/`doc_update` issued inside the block and commit them on exit.
+
+    If the block raises, the buffered writes are discarded so a failed node
+    leaves no partial state behind.
+    """
+    buffer = WriteBuffer(db)
+    token = _active_buffer.set(buffer)
+    try:
+        yield buffer
+    except BaseException:
+        dropped = buffer.discard()
+        if dropped:
+            print(f"[FIRESTORE] Discarded {dropped} buffered writes after an error")
+        raise
+    else:
+        buffer.commit()
+    finally:
+        _active_buffer.reset(token)
+
+@asynccontextmanager
+async def async_write_buffer(db=None):
+    """`write_buffer()` for async code: the buffered writes are committed with the async client `db`."""
+    buffer = WriteBuffer(db)
+    token = _active_buffer.set(buffer)
+    try:
+        yield buffer
+    except BaseException:
+        dropped = buffer.discard()
+        if dropped:
+            print(f"[FIRESTORE] Discarded {dropped} buffered writes after an error")
+        raise
+    else:
+        await buffer.acommit()
+    finally:
+        _active_buffer.reset(token)
+
+@contextmanager
+def atomic_writes(db=None):
+    """Join the active write buffer, or open one for the block, so related writes commit in one batch."""
+    buffer = _active_buffer.get()
+    if buffer is not None:
+        yield buffer
+        return
+    with write_buffer(db) as buffer:
+        yield buffer
+
+def get_active_buffer():
+    return _active_buffer.get()
+
+def doc_set(ref, data, merge=False):
+    """`ref.set(data)`, routed through the active write buffer if there is one."""
+    invalidate(ref.path)
+    buffer = _active_buffer.get()
+    if buffer is not None:
+        buffer.set(ref, data, merge=merge)
+        return
+    start = time.perf_counter()
+    if merge:
+        ref.set(data, merge=True)
+    else:
+        ref.set(data)
+    observe_firestore("set", start)
+
+def doc_update(ref, data):
+    """`ref.update(data)`, routed through the active write buffer if there is one."""
+    invalidate(ref.path)
+    buffer = _active_buffer.get()
+    if buffer is not None:
+        buffer.update(ref, data)
+        return
+    start = time.perf_counter()
+    ref.update(data)
+    observe_firestore("update", start)
+
+async def adoc_set(ref, data, merge=False):
+    """`doc_set()` for async document references: buffered if a buffer is active, otherwise awaited."""
+    invalidate(ref.path)
+    buffer = _active_buffer.get()
+    if buffer is not None:
+        buffer.set(ref, data, merge=merge)
+        return
+    start = time.perf_counter()
+    if merge:
+        await ref.set(data, merge=True)
+    else:
+        await ref.set(data)
+    observe_firestore("set", start)
+
+async def adoc_update(ref, data):
+    """`doc_update()` for async document references."""
+    invalidate(ref.path)
+    buffer = _active_buffer.get()
+    if buffer is not None:
+        buffer.update(ref, data)
+        return
+    start = time.perf_counter()
+    await ref.update(data)
+    observe_firestore("update", start)
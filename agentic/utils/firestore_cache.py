@@ -0,0 +1,173 @@
+import contextvars
+import copy
+import threading
+import time
+from contextlib import contextmanager
+from agentic.logger.metrics import observe_firestore
+
+def _get(ref):
+    start = time.perf_counter()
+    snapshot = ref.get()
+    observe_firestore("get", start)
+    return snapshot
+
+def _run(run):
+    start = time.perf_counter()
+    results = run()
+    observe_firestore("query", start, len(results))
+    return results
+
+async def _aget(ref):
+    start = time.perf_counter()
+    snapshot = await ref.get()
+    observe_firestore("get", start)
+    return snapshot
+
+async def _arun(run):
+    start = time.perf_counter()
+    results = await run()
+    observe_firestore("query", start, len(results))
+    return results
+
+class SnapshotCache:
+    """
+    Read-through cache for Firestore reads made during a single graph run.
+
+    Document snapshots are keyed by document path; query results are keyed by
+    (collection path, query key). A write to a document drops that document's
+    snapshot and every cached query over its parent collection.
+    """
+
+    def __init__(self):
+        self._docs = {}
+        self._queries = {}  # collection path -> {query key: list of dicts}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_document(self, ref):
+        with self._lock:
+            snapshot = self._docs.get(ref.path)
+            if snapshot is not None:
+                self.hits += 1
+                return snapshot
+            self.misses += 1
+        snapshot = _get(ref)
+        with self._lock:
+            self._docs[ref.path] = snapshot
+        return snapshot
+
+    def query(self, collection_ref, key, run):
+        path = _collection_path(collection_ref)
+        with self._lock:
+            results = self._queries.get(path, {}).get(key)
+            if results is not None:
+                self.hits += 1
+                return copy.deepcopy(results)
+            self.misses += 1
+        results = _run(run)
+        with self._lock:
+            self._queries.setdefault(path, {})[key] = results
+        return copy.deepcopy(results)
+
+    async def aget_document(self, ref):
+        """`get_document()` for async document references."""
+        with self._lock:
+            snapshot = self._docs.get(ref.path)
+            if snapshot is not None:
+                self.hits += 1
+                return snapshot
+            self.misses += 1
+        snapshot = await _aget(ref)
+        with self._lock:
+            self._docs[ref.path] = snapshot
+        return snapshot
+
+    async def aquery(self, collection_ref, key, run):
+        """`query()` where `run()` returns an awaitable."""
+        path = _collection_path(collection_ref)
+        with self._lock:
+            results = self._queries.get(path, {}).get(key)
+            if results is not None:
+                self.hits += 1
+                return copy.deepcopy(results)
+            self.misses += 1
+        results = await _arun(run)
+        with self._lock:
+            self._queries.setdefault(path, {})[key] = results
+        return copy.deepcopy(results)
+
+    def invalidate(self, doc_path):
+        with self._lock:
+            dropped = self._docs.pop(doc_path, None) is not None
+            dropped = self._queries.pop(doc_path.rsplit("/", 1)[0], None) is not None or dropped
+            if dropped:
+                self.invalidations += 1
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+def _collection_path(collection_ref):
+    # CollectionReference exposes its path as a tuple of segments
+    return "/".join(collection_ref._path)
+
+_active_cache = contextvars.ContextVar("firestore_snapshot_cache", default=None)
+
+@contextmanager
+def snapshot_cache():
+    """Enable the read-through snapshot cache for everything run inside the block (one graph run)."""
+    cache = SnapshotCache()
+    token = _active_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _active_cache.reset(token)
+
+def cached_get(ref):
+    """`ref.get()`, served from the active run's snapshot cache when one is open."""
+    cache = _active_cache.get()
+    if cache is None:
+        return _get(ref)
+    return cache.get_document(ref)
+
+def cached_query(collection_ref, key, run):
+    """
+    Run `run()` (which streams a query over `collection_ref` and returns a list of dicts)
+    through the active run's snapshot cache. `key` must identify the query's filters,
+    ordering and limit within that collection.
+    """
+    cache = _active_cache.get()
+    if cache is None:
+        return _run(run)
+    return cache.query(collection_ref, key, run)
+
+async def cached_aget(ref):
+    """Async `cached_get()` for references from the async Firestore client."""
+    cache = _active_cache.get()
+    if cache is None:
+        return await _aget(ref)
+    return await cache.aget_document(ref)
+
+async def cached_aquery(collection_ref, key, run):
+    """Async `cached_query()`; `run()` returns an awaitable list of dicts."""
+    cache = _active_cache.get()
+    if cache is None:
+        return await _arun(run)
+    return await cache.aquery(collection_ref, key, run)
+
+async def astream_dicts(query):
+    """Stream an async Firestore query into a list of dicts (the usual `run` for `cached_aquery`)."""
+    return [doc.to_dict() async for doc in query.stream()]
+
+def invalidate(doc_path):
+    """Drop cached reads affected by a write to `doc_path`."""
+    cache = _active_cache.get()
+    if cache is not None:
+        cache.invalidate(doc_path)
@@ -0,0 +1,74 @@
+import json
+
+class TicketStreamParser:
+    """
+    Incremental parser for the ticket-generation output `{"dev_id": [{ticket}, ...], ...}`.
+
+    Feed it text chunks as the model streams them; `feed()` returns every
+    (dev_id, ticket) pair whose ticket object closed in that chunk. Text before
+    the first `{` (preambles, markdown fences) is ignored, and a response that
+    stops mid-way still yields every ticket that was complete.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._stack = []       # open containers: "{" or "["
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._object_start = None
+        self._dev_id = None
+        self._pos = 0
+        self.dev_ids = []
+        self.tickets_parsed = 0
+        self.errors = 0
+
+    def feed(self, chunk):
+        tickets = []
+        if not chunk:
+            return tickets
+        text = self._text + chunk
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._stack == ["{"]:
+                        # Strings directly inside the top-level object are dev_id keys
+                        self._dev_id = json.loads(text[self._string_start:i + 1])
+                        self.dev_ids.append(self._dev_id)
+                continue
+            if not self._stack and ch != "{":
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                self._stack.append(ch)
+                if ch == "{" and self._stack == ["{", "[", "{"]:
+                    self._object_start = i
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if ch == "}" and self._stack == ["{", "["] and self._object_start is not None:
+                    try:
+                        tickets.append((self._dev_id, json.loads(text[self._object_start:i + 1])))
+                        self.tickets_parsed += 1
+                    except ValueError:
+                        self.errors += 1
+                    self._object_start = None
+        self._pos = len(text)
+        # Drop text that can no longer be part of an unfinished ticket or key
+        keep_from = min(p for p in (self._object_start, self._string_start if self._in_string else None, self._pos) if p is not None)
+        self._text = text[keep_from:]
+        if keep_from:
+            self._pos -= keep_from
+            if self._object_start is not None:
+                self._object_start -= keep_from
+            if self._in_string:
+                self._string_start -= keep_from
+        return tickets
@@ -0,0 +1,181 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+def normalize_prompt(prompt):
+    """Collapse whitespace so re-indented but otherwise identical prompts share a cache entry."""
+    if not isinstance(prompt, str):
+        # Message lists: key on role and content only
+        prompt = "\n".join(f"{getattr(m, 'type', '')}: {getattr(m, 'content', m)}" for m in prompt)
+    return " ".join(prompt.split())
+
+class LLMResponseCache:
+    """SQLite store of LLM completions with TTL expiry and least-recently-used eviction."""
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl_seconds=LLM_CACHE_TTL_SECONDS, max_entries=LLM_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT, content TEXT, created_at REAL, last_access REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(model_name, temperature, prompt):
+        return hashlib.sha256(f"{model_name}\0{temperature}\0{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT content, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, model_name, content):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model_name, content, now, now)
+            )
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+                self.evictions += count - self.max_entries
+            self._conn.commit()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+class CachedChatModel:
+    """
+    Wraps a LangChain chat model so `invoke()` and `stream()` (and their async
+    counterparts) are served from `LLMResponseCache` when possible.
+
+    Entries are keyed on model name, temperature and the normalized prompt. Pass
+    `bypass_cache=True` to force a fresh completion (which then replaces the cached one).
+    Everything else (`bind_tools`, `batch`, ...) is delegated to the wrapped model.
+    """
+
+    def __init__(self, model, model_name, temperature, cache=None):
+        self.model = model
+        self.model_name = model_name
+        self.temperature = temperature
+        self.cache = cache or LLMResponseCache()
+
+    def invoke(self, prompt, config=None, bypass_cache=False, **kwargs):
+        if kwargs:
+            # Extra model arguments (stop sequences, tools, ...) change the output; don't cache them
+            return self.model.invoke(prompt, config=config, **kwargs)
+        key = self.cache.make_key(self.model_name, self.temperature, prompt)
+        if bypass_cache:
+            self.cache.bypasses += 1
+        else:
+            content = self.cache.get(key)
+            if content is not None:
+                return AIMessage(content=content, response_metadata={"cache_hit": True})
+        response = self.model.invoke(prompt, config=config)
+        if isinstance(response.content, str):
+            self.cache.put(key, self.model_name, response.content)
+        return response
+
+    def stream(self, prompt, config=None, bypass_cache=False, **kwargs):
+        """Stream from the model, or replay a cached completion as a single chunk. Only complete streams are cached."""
+        if kwargs:
+            yield from self.model.stream(prompt, config=config, **kwargs)
+            return
+        key = self.cache.make_key(self.model_name, self.temperature, prompt)
+        if bypass_cache:
+            self.cache.bypasses += 1
+        else:
+            content = self.cache.get(key)
+            if content is not None:
+                yield AIMessageChunk(content=content, response_metadata={"cache_hit": True})
+                return
+        parts = []
+        for chunk in self.model.stream(prompt, config=config):
+            if isinstance(chunk.content, str):
+                parts.append(chunk.content)
+            yield chunk
+        self.cache.put(key, self.model_name, "".join(parts))
+
+    async def ainvoke(self, prompt, config=None, bypass_cache=False, **kwargs):
+        if kwargs:
+            return await self.model.ainvoke(prompt, config=config, **kwargs)
+        key = self.cache.make_key(self.model_name, self.temperature, prompt)
+        if bypass_cache:
+            self.cache.bypasses += 1
+        else:
+            content = self.cache.get(key)
+            if content is not None:
+                return AIMessage(content=content, response_metadata={"cache_hit": True})
+        response = await self.model.ainvoke(prompt, config=config)
+        if isinstance(response.content, str):
+            self.cache.put(key, self.model_name, response.content)
+        return response
+
+    async def astream(self, prompt, config=None, bypass_cache=False, **kwargs):
+        if kwargs:
+            async for chunk in self.model.astream(prompt, config=config, **kwargs):
+                yield chunk
+            return
+        key = self.cache.make_key(self.model_name, self.temperature, prompt)
+        if bypass_cache:
+            self.cache.bypasses += 1
+        else:
+            content = self.cache.get(key)
+            if content is not None:
+                yield AIMessageChunk(content=content, response_metadata={"cache_hit": True})
+                return
+        parts = []
+        async for chunk in self.model.astream(prompt, config=config):
+            if isinstance(chunk.content, str):
+                parts.append(chunk.content)
+            yield chunk
+        self.cache.put(key, self.model_name, "".join(parts))
+
+    def cache_stats(self):
+        return self.cache.stats()
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
@@ -1,16 +1,15 @@
 import os
 from dotenv import load_dotenv
-
-# LangChain LLM wrappers
-from langchain_groq import ChatGroq
-from langchain_community.chat_models import ChatOllama
+from agentic.utils.llm_cache import LLM_CACHE_ENABLED, CachedChatModel
+from agentic.logger.llm_metrics import MeteredChatModel
 
 load_dotenv()
 
 def load_model():
     """
     Load LLM from Groq or Ollama based on environment config.
-    Returns a LangChain-compatible chat model.
+    Returns a LangChain-compatible chat model, metered (latency, tokens) and
+    wrapped in the persistent response cache unless LLM_CACHE_ENABLED is false.
     """
     provider = "groq"
 
@@ -20,19 +19,30 @@ def load_model():
         if not groq_api_key:
             raise ValueError("GROQ_API_KEY is not set.")
         print(f"🔌 Loading Groq model: {groq_model}")
-        return ChatGroq(
+        # Provider SDKs are imported only for the provider in use
+        from langchain_groq import ChatGroq
+        model = ChatGroq(
             model_name=groq_model,
             temperature=0.2,
             api_key=groq_api_key
         )
+        model_name = f"groq:{groq_model}"
 
     elif provider == "ollama":
         ollama_model = os.getenv("OLLAMA_MODEL", "deepseek-coder:14b-instruct-fp16")
         print(f"💻 Loading Ollama model: {ollama_model}")
-        return ChatOllama(
+        from langchain_community.chat_models import ChatOllama
+        model = ChatOllama(
             model=ollama_model,
             temperature=0.2
         )
+        model_name = f"ollama:{ollama_model}"
 
     else:
         raise ValueError(f"Unknown LLM provider: {provider}")
+
+    # Metered inside the cache, so cache hits don't count as model calls
+    model = MeteredChatModel(model)
+    if LLM_CACHE_ENABLED:
+        return CachedChatModel(model, model_name=model_name, temperature=0.2)
+    return model
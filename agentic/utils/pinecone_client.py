@@ -1,7 +1,16 @@
 import os
-from pinecone import Pinecone, ServerlessSpec
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Pinecone caps a single upsert request at 2MB / 1000 vectors; 100 MiniLM
+# vectors with sentence metadata stays comfortably below both limits.
+UPSERT_BATCH_SIZE = int(os.getenv("PINECONE_UPSERT_BATCH_SIZE", "100"))
+UPSERT_MAX_WORKERS = int(os.getenv("PINECONE_UPSERT_CONCURRENCY", "4"))
+UPSERT_MAX_RETRIES = int(os.getenv("PINECONE_UPSERT_MAX_RETRIES", "3"))
+UPSERT_MAX_BATCH_BYTES = int(os.getenv("PINECONE_UPSERT_MAX_BATCH_BYTES", str(2 * 1024 * 1024)))
 
 def init_pinecone(index_name="projectembeddings"):
+    from pinecone import Pinecone
     pinecone_api_key = os.getenv("PINECONE_API_KEY")
     pc = Pinecone(api_key=pinecone_api_key)
     # Check if index exists, if not create it
@@ -12,3 +21,102 @@ def init_pinecone(index_name="projectembeddings"):
             metric='cosine'
         )
     return pc.Index(index_name)
+
+def _estimate_vector_bytes(vector):
+    # values are sent as JSON floats (~10 bytes each); metadata text dominates the rest
+    metadata = vector.get("metadata") or {}
+    return len(vector["values"]) * 10 + sum(len(str(v)) for v in metadata.values()) + len(vector["id"]) + 64
+
+def make_upsert_batches(vectors, batch_size=None, max_batch_bytes=None):
+    """
+    Group vectors into batches bounded by both vector count and payload size.
+
+    Args:
+        vectors (List[dict]): Pinecone vector dicts with `id`, `values` and optional `metadata`.
+        batch_size (int): Maximum number of vectors per batch.
+        max_batch_bytes (int): Approximate upper bound for the request payload of one batch.
+
+    Returns:
+        List[List[dict]]: The batches, in input order.
+    """
+    batch_size = batch_size or UPSERT_BATCH_SIZE
+    max_batch_bytes = max_batch_bytes or UPSERT_MAX_BATCH_BYTES
+    batches = []
+    current, current_bytes = [], 0
+    for vector in vectors:
+        size = _estimate_vector_bytes(vector)
+        if current and (len(current) >= batch_size or current_bytes + size > max_batch_bytes):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(vector)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+def _is_transient(error):
+    """Whether a failed upsert is worth retrying: a timeout, a dropped connection, 429 or a 5xx."""
+    # Pinecone's API exceptions carry the HTTP status (`status`, or `status_code` on some clients)
+    status = getattr(error, "status", None) or getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in (408, 429) or status >= 500
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    try:
+        from urllib3.exceptions import MaxRetryError, ProtocolError, TimeoutError as Urllib3Timeout
+    except ImportError:
+        return False
+    return isinstance(error, (MaxRetryError, ProtocolError, Urllib3Timeout))
+
+def _upsert_batch(index, batch, namespace, max_retries):
+    attempt = 0
+    start = time.perf_counter()
+    while True:
+        try:
+            index.upsert(vectors=batch, namespace=namespace)
+            return {"size": len(batch), "latency_s": time.perf_counter() - start, "retries": attempt}
+        except Exception as error:
+            # Bad requests (wrong dimension, oversized payload, auth) fail the same way every time
+            if attempt >= max_retries or not _is_transient(error):
+                raise
+            attempt += 1
+            time.sleep(min(0.5 * 2 ** (attempt - 1), 8))
+
+def upsert_vectors_batched(index, vectors, namespace, batch_size=None, max_workers=None, max_retries=None):
+    """
+    Upsert vectors in size-bounded batches, sending batches concurrently.
+
+    Args:
+        index: A Pinecone `Index` as returned by `init_pinecone()`.
+        vectors (List[dict]): Pinecone vector dicts with `id`, `values` and optional `metadata`.
+        namespace (str): Target namespace.
+        batch_size (int): Maximum vectors per request (env `PINECONE_UPSERT_BATCH_SIZE`).
+        max_workers (int): Maximum batches in flight (env `PINECONE_UPSERT_CONCURRENCY`).
+        max_retries (int): Retries per batch with exponential backoff, for timeouts, 429s and 5xx
+            responses only (env `PINECONE_UPSERT_MAX_RETRIES`).
+
+    Returns:
+        dict: Upsert report with totals and per-batch latency and retry counts.
+    """
+    max_workers = max_workers or UPSERT_MAX_WORKERS
+    max_retries = UPSERT_MAX_RETRIES if max_retries is None else max_retries
+    batches = make_upsert_batches(vectors, batch_size)
+    start = time.perf_counter()
+    results = [None] * len(batches)
+    if batches:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            futures = {
+                executor.submit(_upsert_batch, index, batch, namespace, max_retries): i
+                for i, batch in enumerate(batches)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+    latencies = [r["latency_s"] for r in results]
+    return {
+        "vectors": len(vectors),
+        "batches": len(batches),
+        "total_retries": sum(r["retries"] for r in results),
+        "wall_time_s": time.perf_counter() - start,
+        "max_batch_latency_s": max(latencies) if latencies else 0.0,
+        "batch_stats": results
+    }
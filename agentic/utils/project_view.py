@@ -0,0 +1,286 @@
+import asyncio
+import copy
+import datetime
+import os
+import threading
+import time
+from collections import OrderedDict
+from agentic.logger.metrics import observe_firestore
+from agentic.utils.ticket_store import OPEN_STATUSES, TICKETS_COLLECTION, cycle_ticket_queries, standup_query, ticket_query
+
+# Project views kept in memory; the least recently used one is dropped past this
+PROJECT_VIEW_MAX_PROJECTS = int(os.getenv("PROJECT_VIEW_MAX_PROJECTS", "256"))
+# Slices cached per collection of a view; the least recently used one is dropped past this
+PROJECT_VIEW_MAX_SLICES = int(os.getenv("PROJECT_VIEW_MAX_SLICES", "16"))
+
+VIEW_COLLECTIONS = (TICKETS_COLLECTION, "standups")
+
+def _as_utc(value):
+    """Firestore timestamps are datetimes; naive ones are UTC."""
+    if isinstance(value, datetime.datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value
+
+def _ticket_filter(status=None, assigned_dev_id=None, open_only=False, updated_since=None):
+    """The filter of `ticket_query()` with the same arguments, applied to one ticket."""
+    updated_since = _as_utc(updated_since)
+
+    def keep(ticket):
+        if assigned_dev_id and ticket.get("assigned_dev_id") != assigned_dev_id:
+            return False
+        if status and ticket.get("status") != status:
+            return False
+        if not status and open_only and ticket.get("status") not in OPEN_STATUSES:
+            return False
+        if updated_since is not None:
+            updated_at = _as_utc(ticket.get("updated_at"))
+            return isinstance(updated_at, datetime.datetime) and updated_at >= updated_since
+        return True
+
+    return keep
+
+def _standup_filter(cycle_number=None):
+    """The filter of `standup_query()` with the same argument, applied to one standup."""
+    return lambda standup: cycle_number is None or standup.get("cycle") == cycle_number
+
+class ProjectView:
+    """
+    In-memory cache of one project's ticket and standup slices, kept current with delta reads.
+
+    A slice (one developer's open tickets, one cycle's standups, ...) is read once
+    with its indexed query from `ticket_store`. After that, a refresh reads only the
+    collection's documents whose `updated_at` is at or after its watermark (the
+    `read_time` of the last read that returned anything) and files each into every
+    cached slice it now matches, or out of those it no longer matches. A cycle
+    costs reads in proportion to what changed plus the slices it asks for the
+    first time.
+
+    Every writer of these collections sets `updated_at` with `server_stamped()`, so
+    the watermark and the timestamps share the server's clock. Documents are
+    deleted by tombstoning them (`deleted: True`, see `delete_ticket()`), which a
+    delta read sees like any other change; after deleting a document outright,
+    call `reset()`.
+    """
+
+    def __init__(self, project_id):
+        self.project_id = project_id
+        self._docs = {name: {} for name in VIEW_COLLECTIONS}  # doc id -> data, for documents in some slice
+        self._slices = {name: OrderedDict() for name in VIEW_COLLECTIONS}  # slice key -> (keep, doc ids)
+        self._watermarks = {name: None for name in VIEW_COLLECTIONS}
+        self._lock = threading.Lock()
+        self.slice_reads = 0
+        self.delta_reads = 0
+        self.docs_read = 0
+
+    def _delta_query(self, db, name):
+        """The query for documents changed since the last read, or None before the collection's first slice."""
+        with self._lock:
+            watermark = self._watermarks[name]
+        if watermark is None:
+            return None
+        collection = db.collection("projects").document(self.project_id).collection(name)
+        return collection.where("updated_at", ">=", watermark)
+
+    @staticmethod
+    def _read_time(docs):
+        """The server time a query's results are consistent at (None if it returned nothing)."""
+        return max((doc.read_time for doc in docs if getattr(doc, "read_time", None)), default=None)
+
+    def _apply_delta(self, name, snapshots, read_time):
+        with self._lock:
+            docs, slices = self._docs[name], self._slices[name]
+            for doc_id, data in snapshots:
+                member = False
+                for keep, ids in slices.values():
+                    if keep(data) and not data.get("deleted"):
+                        ids.add(doc_id)
+                        member = True
+                    else:
+                        ids.discard(doc_id)
+                if member:
+                    docs[doc_id] = data
+                else:
+                    docs.pop(doc_id, None)
+            if read_time is not None:
+                # Every write committed before read_time was in this read; an empty read moves nothing
+                self._watermarks[name] = read_time
+            self.delta_reads += 1
+            self.docs_read += len(snapshots)
+        return len(snapshots)
+
+    def _add_slice(self, name, key, keep, snapshots, read_time):
+        with self._lock:
+            self.slice_reads += 1
+            self.docs_read += len(snapshots)
+            if self._watermarks[name] is None:
+                if read_time is None:
+                    # Nothing read, so nothing to take a watermark from: read the slice again next time
+                    return False
+                self._watermarks[name] = read_time
+            docs, slices = self._docs[name], self._slices[name]
+            live = [(doc_id, data) for doc_id, data in snapshots if not data.get("deleted")]
+            for doc_id, data in live:
+                docs[doc_id] = data
+            slices[key] = (keep, {doc_id for doc_id, _ in live})
+            while len(slices) > PROJECT_VIEW_MAX_SLICES:
+                slices.popitem(last=False)
+                kept = set().union(*(ids for _, ids in slices.values()))
+                for doc_id in [doc_id for doc_id in docs if doc_id not in kept]:
+                    del docs[doc_id]
+            return True
+
+    def _cached(self, name, key):
+        with self._lock:
+            cached = self._slices[name].get(key)
+            if cached is None:
+                return None
+            self._slices[name].move_to_end(key)
+            return [copy.deepcopy(self._docs[name][doc_id]) for doc_id in cached[1]]
+
+    def refresh(self, db, names=VIEW_COLLECTIONS):
+        """
+        Bring the cached slices up to date with delta reads.
+
+        Returns:
+            Dict[str, int]: Documents read per collection (collections with no slice yet are skipped).
+        """
+        changed = {}
+        for name in names:
+            query = self._delta_query(db, name)
+            if query is None:
+                continue
+            start = time.perf_counter()
+            results = list(query.stream())
+            observe_firestore("query", start, len(results))
+            changed[name] = self._apply_delta(name, [(doc.id, doc.to_dict()) for doc in results], self._read_time(results))
+        return changed
+
+    async def arefresh(self, db, names=VIEW_COLLECTIONS):
+        """`refresh()` with the async Firestore client; the collections are read concurrently."""
+        async def read(name):
+            query = self._delta_query(db, name)
+            if query is None:
+                return name, None
+            start = time.perf_counter()
+            results = [doc async for doc in query.stream()]
+            observe_firestore("query", start, len(results))
+            return name, self._apply_delta(name, [(doc.id, doc.to_dict()) for doc in results], self._read_time(results))
+
+        counts = await asyncio.gather(*(read(name) for name in names))
+        return {name: count for name, count in counts if count is not None}
+
+    def _slice(self, db, name, key, query, keep, refresh=True):
+        if refresh:
+            self.refresh(db, (name,))
+        cached = self._cached(name, key)
+        if cached is not None:
+            return cached
+        start = time.perf_counter()
+        results = list(query.stream())
+        observe_firestore("query", start, len(results))
+        snapshots = [(doc.id, doc.to_dict()) for doc in results]
+        if not self._add_slice(name, key, keep, snapshots, self._read_time(results)):
+            return [copy.deepcopy(data) for _, data in snapshots if not data.get("deleted")]
+        return self._cached(name, key)
+
+    async def _aslice(self, db, name, key, query, keep, refresh=True):
+        if refresh:
+            await self.arefresh(db, (name,))
+        cached = self._cached(name, key)
+        if cached is not None:
+            return cached
+        start = time.perf_counter()
+        results = [doc async for doc in query.stream()]
+        observe_firestore("query", start, len(results))
+        snapshots = [(doc.id, doc.to_dict()) for doc in results]
+        if not self._add_slice(name, key, keep, snapshots, self._read_time(results)):
+            return [copy.deepcopy(data) for _, data in snapshots if not data.get("deleted")]
+        return self._cached(name, key)
+
+    def reset(self):
+        """Forget everything, so every slice is read again with its query."""
+        with self._lock:
+            for name in VIEW_COLLECTIONS:
+                self._docs[name] = {}
+                self._slices[name] = OrderedDict()
+                self._watermarks[name] = None
+
+    def tickets(self, db, status=None, assigned_dev_id=None, open_only=False, updated_since=None, refresh=True):
+        """
+        One slice of the project's tickets, read with `ticket_query()` the first time.
+
+        Args:
+            db: Sync Firestore client.
+            status, assigned_dev_id, open_only, updated_since: The slice, as for `ticket_query()`.
+            refresh (bool): Read the changes since the last call first.
+
+        Returns:
+            List[dict]: The tickets of the slice.
+        """
+        _, key, query = ticket_query(db, self.project_id, status, assigned_dev_id, open_only, updated_since)
+        keep = _ticket_filter(status, assigned_dev_id, open_only, updated_since)
+        return self._slice(db, TICKETS_COLLECTION, key, query, keep, refresh)
+
+    async def atickets(self, db, status=None, assigned_dev_id=None, open_only=False, updated_since=None, refresh=True):
+        """`tickets()` with the async Firestore client."""
+        _, key, query = ticket_query(db, self.project_id, status, assigned_dev_id, open_only, updated_since)
+        keep = _ticket_filter(status, assigned_dev_id, open_only, updated_since)
+        return await self._aslice(db, TICKETS_COLLECTION, key, query, keep, refresh)
+
+    def cycle_tickets(self, db, since=None):
+        """The slices of `cycle_ticket_queries()`: open tickets plus those completed since `since`."""
+        self.refresh(db, (TICKETS_COLLECTION,))
+        return [
+            ticket
+            for (_, key, query), keep in zip(cycle_ticket_queries(db, self.project_id, since), self._cycle_filters(since))
+            for ticket in self._slice(db, TICKETS_COLLECTION, key, query, keep, refresh=False)
+        ]
+
+    async def acycle_tickets(self, db, since=None):
+        """`cycle_tickets()` with the async Firestore client; both slices are read concurrently."""
+        await self.arefresh(db, (TICKETS_COLLECTION,))
+        slices = await asyncio.gather(*(
+            self._aslice(db, TICKETS_COLLECTION, key, query, keep, refresh=False)
+            for (_, key, query), keep in zip(cycle_ticket_queries(db, self.project_id, since), self._cycle_filters(since))
+        ))
+        return [ticket for tickets in slices for ticket in tickets]
+
+    @staticmethod
+    def _cycle_filters(since):
+        return [_ticket_filter(open_only=True), _ticket_filter(status="completed", updated_since=since)]
+
+    def standups(self, db, cycle_number=None, refresh=True):
+        """One cycle's standups (every standup without `cycle_number`), read with `standup_query()` the first time."""
+        _, key, query = standup_query(db, self.project_id, cycle_number)
+        return self._slice(db, "standups", key, query, _standup_filter(cycle_number), refresh)
+
+    async def astandups(self, db, cycle_number=None, refresh=True):
+        """`standups()` with the async Firestore client."""
+        _, key, query = standup_query(db, self.project_id, cycle_number)
+        return await self._aslice(db, "standups", key, query, _standup_filter(cycle_number), refresh)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "tickets": len(self._docs[TICKETS_COLLECTION]),
+                "standups": len(self._docs["standups"]),
+                "slices": sum(len(slices) for slices in self._slices.values()),
+                "slice_reads": self.slice_reads,
+                "delta_reads": self.delta_reads,
+                "docs_read": self.docs_read
+            }
+
+_views = OrderedDict()
+_views_lock = threading.Lock()
+
+def get_project_view(project_id):
+    """The process-wide `ProjectView` for a project (least recently used views are evicted)."""
+    with _views_lock:
+        view = _views.get(project_id)
+        if view is None:
+            view = _views[project_id] = ProjectView(project_id)
+            while len(_views) > PROJECT_VIEW_MAX_PROJECTS:
+                _views.popitem(last=False)
+        else:
+            _views.move_to_end(project_id)
+        return view
@@ -0,0 +1,111 @@
+import math
+import os
+import threading
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional; fall back to the ~4 chars/token rule of thumb
+    _encoding = None
+
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+LLM_LATENCY_TARGET_S = float(os.getenv("LLM_LATENCY_TARGET_S", "20"))
+PROMPT_MIN_BUDGET_RATIO = float(os.getenv("PROMPT_MIN_BUDGET_RATIO", "0.5"))
+# Sections that would be cut below this many tokens are dropped instead
+MIN_SECTION_TOKENS = 32
+
+_stats_lock = threading.Lock()
+_stats = {"packed_prompts": 0, "truncated_sections": 0, "dropped_sections": 0, "dropped_tokens": 0}
+_latency_ewma = None
+
+def count_tokens(text):
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / 4)
+
+def _truncate(text, max_tokens):
+    """Keep the head of `text` within `max_tokens`, cutting at a line boundary where possible."""
+    if _encoding is not None:
+        head = _encoding.decode(_encoding.encode(text, disallowed_special=())[:max_tokens])
+    else:
+        head = text[:max_tokens * 4]
+    if "\n" in head:
+        head = head.rsplit("\n", 1)[0]
+    return head
+
+def record_llm_latency(seconds, alpha=0.3):
+    """Feed one LLM call duration into the moving average that drives budget tightening."""
+    global _latency_ewma
+    with _stats_lock:
+        _latency_ewma = seconds if _latency_ewma is None else alpha * seconds + (1 - alpha) * _latency_ewma
+
+def effective_budget(budget=None):
+    """
+    The token budget after latency-aware degradation.
+
+    While the moving average of recent LLM latency is above `LLM_LATENCY_TARGET_S`,
+    the budget shrinks proportionally, down to `PROMPT_MIN_BUDGET_RATIO` of the base.
+    """
+    budget = budget or PROMPT_TOKEN_BUDGET
+    if _latency_ewma is None or _latency_ewma <= LLM_LATENCY_TARGET_S:
+        return budget
+    ratio = max(PROMPT_MIN_BUDGET_RATIO, LLM_LATENCY_TARGET_S / _latency_ewma)
+    return int(budget * ratio)
+
+def pack_sections(sections, fixed_text="", budget=None):
+    """
+    Fit prompt sections into a token budget, cutting the least important first.
+
+    Args:
+        sections (List[dict]): Each has `name`, `text` and `priority` (higher is more important).
+        fixed_text (str): Instructions and formatting that are always sent; counted against the budget.
+        budget (int): Base token budget (env `PROMPT_TOKEN_BUDGET`), before latency degradation.
+
+    Returns:
+        Tuple[dict, dict]: Packed text keyed by section name, and a report with the
+        budget, tokens used and tokens dropped per section.
+    """
+    budget = effective_budget(budget)
+    tokens = {s["name"]: count_tokens(s["text"]) for s in sections}
+    packed = {s["name"]: s["text"] for s in sections}
+    overflow = count_tokens(fixed_text) + sum(tokens.values()) - budget
+    dropped = {s["name"]: 0 for s in sections}
+    truncated_sections = dropped_sections = 0
+
+    for section in sorted(sections, key=lambda s: s["priority"]):
+        if overflow <= 0:
+            break
+        name = section["name"]
+        marker = f"\n[... {name} truncated to fit the prompt budget]"
+        keep = tokens[name] - overflow - count_tokens(marker)
+        if keep < MIN_SECTION_TOKENS:
+            packed[name] = f"[{name} omitted to fit the prompt budget]"
+            dropped_sections += 1
+        else:
+            packed[name] = _truncate(section["text"], keep) + marker
+            truncated_sections += 1
+        dropped[name] = max(0, tokens[name] - count_tokens(packed[name]))
+        overflow -= dropped[name]
+
+    dropped_tokens = sum(dropped.values())
+    with _stats_lock:
+        _stats["packed_prompts"] += 1
+        _stats["truncated_sections"] += truncated_sections
+        _stats["dropped_sections"] += dropped_sections
+        _stats["dropped_tokens"] += dropped_tokens
+    return packed, {
+        "budget": budget,
+        "used_tokens": count_tokens(fixed_text) + sum(count_tokens(t) for t in packed.values()),
+        "dropped_tokens": dropped_tokens,
+        "dropped_by_section": {name: n for name, n in dropped.items() if n}
+    }
+
+def get_packer_stats():
+    """Cumulative packing counters plus the current latency average and effective budget."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["llm_latency_ewma_s"] = _latency_ewma
+    stats["effective_budget"] = effective_budget()
+    return stats
@@ -0,0 +1,259 @@
+import hashlib
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from langchain_core.documents import Document
+from agentic.logger.metrics import RETRIEVAL_QUERY_EMBEDDINGS, RETRIEVAL_SECONDS
+from agentic.utils.vector_index import chunk_ids
+
+# Weight of the vector score in the fused score: 1 is vector only, 0 is BM25 only
+RETRIEVAL_HYBRID_ALPHA = float(os.getenv("RETRIEVAL_HYBRID_ALPHA", "0.5"))
+# Each side of a hybrid search fetches this many times k candidates before fusing
+RETRIEVAL_CANDIDATE_FACTOR = int(os.getenv("RETRIEVAL_CANDIDATE_FACTOR", "4"))
+RETRIEVAL_QUERY_CACHE_SIZE = int(os.getenv("RETRIEVAL_QUERY_CACHE_SIZE", "1024"))
+RETRIEVAL_MAX_PROJECTS = int(os.getenv("RETRIEVAL_MAX_PROJECTS", "256"))
+
+_TOKEN = re.compile(r"\w+")
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+def matches_filter(metadata, filter):
+    """Equality filter on metadata, as `LocalVectorStore.query()` applies it."""
+    return all(metadata.get(key) == value for key, value in (filter or {}).items())
+
+class BM25Index:
+    """Okapi BM25 over a fixed set of chunks, keyed by their vector ids."""
+
+    def __init__(self, ids, docs, k1=1.5, b=0.75):
+        self.ids = list(ids)
+        self.docs = list(docs)
+        self.k1 = k1
+        self.b = b
+        self.postings = {}  # term -> [(position, term frequency)]
+        self.lengths = []
+        for position, doc in enumerate(self.docs):
+            terms = Counter(tokenize(doc.page_content))
+            self.lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                self.postings.setdefault(term, []).append((position, tf))
+        self.avg_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+        n = len(self.docs)
+        self.idf = {term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for term, p in self.postings.items()}
+
+    def search(self, query, top_k, filter=None):
+        """
+        Returns:
+            List[Tuple[str, float, Document]]: (id, BM25 score, chunk), best first.
+        """
+        scores = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for position, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[position] / self.avg_length)
+                scores[position] = scores.get(position, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        if filter:
+            scores = {p: s for p, s in scores.items() if matches_filter(self.docs[p].metadata, filter)}
+        top = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(self.ids[p], score, self.docs[p]) for p, score in top]
+
+class QueryEmbeddingCache:
+    """LRU cache of query vectors keyed by (namespace, embedding model, query)."""
+
+    def __init__(self, max_entries=RETRIEVAL_QUERY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(namespace, model_name, query):
+        return namespace, model_name, hashlib.sha256(" ".join(query.split()).encode("utf-8")).hexdigest()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                RETRIEVAL_QUERY_EMBEDDINGS.inc(1, "hit")
+                return vector
+            self.misses += 1
+        RETRIEVAL_QUERY_EMBEDDINGS.inc(1, "miss")
+        vector = compute()
+        with self._lock:
+            self._entries[key] = vector
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return vector
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+_query_cache = QueryEmbeddingCache()
+
+def _normalized(results):
+    """Min-max scale scores to [0, 1] within one result list (a single result scores 1)."""
+    if not results:
+        return {}
+    scores = [score for _, score in results]
+    low, high = min(scores), max(scores)
+    return {vector_id: (score - low) / (high - low) if high > low else 1.0 for vector_id, score in results}
+
+class RetrievalEngine:
+    """
+    Top-k retrieval for one project: vector search in the configured store, fused
+    with BM25 over the same chunks.
+
+    `k` and metadata filters are passed to the store, so only the candidates leave
+    it. Query vectors come from a process-wide cache, so asking the same question
+    every cycle embeds it once. The BM25 side needs the chunks; `index_text()`
+    builds it from the project description with the ids the vector index uses.
+    Without it, results are vector-only.
+    """
+
+    def __init__(self, project_id, store=None, embedder=None, embedding_model=None, alpha=None, query_cache=None):
+        self.project_id = project_id
+        self.namespace = project_id
+        self._store = store
+        self._embedder = embedder
+        self._embedding_model = embedding_model
+        self.alpha = RETRIEVAL_HYBRID_ALPHA if alpha is None else alpha
+        self.query_cache = query_cache or _query_cache
+        self.lexical = None
+        self._corpus_key = None
+        self._lock = threading.Lock()
+
+    @property
+    def store(self):
+        if self._store is None:
+            from agentic.utils.vector_store import get_vector_store
+            self._store = get_vector_store()
+        return self._store
+
+    def _embedding(self):
+        if self._embedder is None:
+            from agentic.utils.embedding import EMBEDDING_MODEL_NAME, get_embedder
+            self._embedder = get_embedder()
+            self._embedding_model = self._embedding_model or EMBEDDING_MODEL_NAME
+        return self._embedder, self._embedding_model or type(self._embedder).__name__
+
+    def index_documents(self, docs):
+        """Build the BM25 side over chunks (as `split_project_markdown()` returns them)."""
+        lexical = BM25Index(chunk_ids(self.namespace, docs), docs)
+        with self._lock:
+            self.lexical = lexical
+        return lexical
+
+    def index_text(self, text):
+        """Chunk and index `text` for BM25, unless it is the text already indexed."""
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if key == self._corpus_key:
+            return self.lexical
+        from agentic.utils.text_splitter import split_project_markdown
+        lexical = self.index_documents(split_project_markdown(text))
+        self._corpus_key = key
+        return lexical
+
+    def embed_query(self, query):
+        embedder, model_name = self._embedding()
+        return self.query_cache.get_or_compute(
+            self.query_cache.make_key(self.namespace, model_name, query), lambda: embedder.embed_query(query)
+        )
+
+    def search(self, query, k=4, filter=None, alpha=None):
+        """
+        The top `k` chunks for `query`.
+
+        Args:
+            query (str): Search text.
+            k (int): Chunks to return.
+            filter (dict): Metadata equality filter, applied in the store and to BM25.
+            alpha (float): Vector weight for this search (default RETRIEVAL_HYBRID_ALPHA).
+
+        Returns:
+            List[Document]: Chunks best first, with `id`, `score` (fused),
+            `vector_score` and `bm25_score` in their metadata.
+        """
+        start = time.perf_counter()
+        alpha = self.alpha if alpha is None else alpha
+        lexical = self.lexical if alpha < 1 else None
+        if alpha <= 0 and lexical is None:
+            alpha = 1.0  # nothing to rank by but vectors
+        candidates = k * RETRIEVAL_CANDIDATE_FACTOR if lexical is not None and alpha > 0 else k
+
+        vector_hits = []
+        if alpha > 0:
+            with RETRIEVAL_SECONDS.time("embed"):
+                query_vector = self.embed_query(query)
+            with RETRIEVAL_SECONDS.time("vector"):
+                vector_hits = self.store.query(query_vector, top_k=candidates, namespace=self.namespace, filter=filter)
+        lexical_hits = []
+        if lexical is not None:
+            with RETRIEVAL_SECONDS.time("lexical"):
+                lexical_hits = lexical.search(query, candidates, filter)
+
+        found = {}
+        for match in vector_hits:
+            metadata = match.get("metadata") or {}
+            found[match["id"]] = (metadata.get("text", ""), metadata)
+        for vector_id, _, doc in lexical_hits:
+            if vector_id not in found:
+                found[vector_id] = (doc.page_content, {"text": doc.page_content, **doc.metadata})
+
+        vector_scores = {m["id"]: m["score"] for m in vector_hits}
+        bm25_scores = {vector_id: score for vector_id, score, _ in lexical_hits}
+        vector_norm = _normalized(list(vector_scores.items()))
+        bm25_norm = _normalized(list(bm25_scores.items()))
+        if lexical is None:
+            fused = vector_scores
+        else:
+            fused = {
+                vector_id: alpha * vector_norm.get(vector_id, 0.0) + (1 - alpha) * bm25_norm.get(vector_id, 0.0)
+                for vector_id in found
+            }
+        ranked = sorted(fused, key=fused.get, reverse=True)[:k]
+        RETRIEVAL_SECONDS.observe(time.perf_counter() - start, "total")
+        return [
+            Document(
+                page_content=found[vector_id][0],
+                metadata={
+                    **found[vector_id][1],
+                    "id": vector_id,
+                    "score": fused[vector_id],
+                    "vector_score": vector_scores.get(vector_id),
+                    "bm25_score": bm25_scores.get(vector_id)
+                }
+            )
+            for vector_id in ranked
+        ]
+
+_engines = OrderedDict()
+_engines_lock = threading.Lock()
+
+def get_retrieval_engine(project_id):
+    """The process-wide `RetrievalEngine` for a project (least recently used engines are evicted)."""
+    with _engines_lock:
+        engine = _engines.get(project_id)
+        if engine is None:
+            engine = _engines[project_id] = RetrievalEngine(project_id)
+            while len(_engines) > RETRIEVAL_MAX_PROJECTS:
+                _engines.popitem(last=False)
+        else:
+            _engines.move_to_end(project_id)
+        return engine
+
+def get_query_cache_stats():
+    return _query_cache.stats()
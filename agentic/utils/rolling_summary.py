@@ -0,0 +1,211 @@
+import datetime
+import os
+import re
+from agentic.utils.firestore_batch import adoc_set, adoc_update, doc_set, doc_update
+from agentic.utils.firestore_cache import astream_dicts, cached_aquery, cached_query
+
+SCRUM_SUMMARY_MODE = os.getenv("SCRUM_SUMMARY_MODE", "rolling")  # rolling | full
+SCRUM_ROLLUP_EVERY = int(os.getenv("SCRUM_ROLLUP_EVERY", "5"))
+SCRUM_DIGEST_MAX_CHARS = int(os.getenv("SCRUM_DIGEST_MAX_CHARS", "1200"))
+
+# A line that opens a section: markdown heading, "1. **Title**...", "**Title**" or "Title:"
+_SECTION_HEADING = re.compile(
+    r"^\s*(?:#{1,6}\s+(?P<markdown>.+)|\d+[.)]\s+\*\*(?P<numbered>[^*]+)\*\*.*"
+    r"|\*\*(?P<bold>[^*]+)\*\*:?|(?P<label>[A-Z][\w /&,-]{0,60}):)\s*$"
+)
+# Sections (or sentences) the next cycle's prompt needs most
+_DIGEST_PRIORITY = re.compile(r"block|risk|issue|impediment|next step|action|priorit|follow[- ]up", re.IGNORECASE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_OMITTED = "..."
+
+def _digest_units(summary):
+    """
+    Split a summary into sections, or into sentences when it has no headings.
+
+    Returns:
+        Tuple[List[Tuple[str, bool]], str]: (text, is priority) units in order, and
+        the separator to join them with.
+    """
+    sections = []
+    for line in summary.splitlines():
+        match = _SECTION_HEADING.match(line)
+        if match or not sections:
+            sections.append((next((title for title in match.groups() if title), "") if match else "", []))
+        sections[-1][1].append(line)
+    sections = [(title, "\n".join(lines).strip()) for title, lines in sections]
+    sections = [(title, text) for title, text in sections if text]
+    if len(sections) > 1:
+        return [(text, bool(_DIGEST_PRIORITY.search(title))) for title, text in sections], "\n"
+    sentences = [sentence for sentence in _SENTENCE_END.split(summary) if sentence]
+    return [(sentence, bool(_DIGEST_PRIORITY.search(sentence))) for sentence in sentences], " "
+
+def _clip(text, max_chars):
+    return text[:max(0, max_chars - len(_OMITTED) - 1)].rsplit(" ", 1)[0] + " " + _OMITTED
+
+def make_digest(summary, max_chars=None):
+    """
+    Compact per-cycle digest stored next to the full cycle summary.
+
+    Keeps what the next prompt needs within `max_chars`: first the blocker, risk
+    and next-step sections, then the other sections from the last (newest) back.
+    Kept sections stay in their original order, and "..." marks what was dropped.
+    A summary without headings is handled the same way, sentence by sentence.
+
+    Args:
+        summary (str): A cycle summary or roll-up.
+        max_chars (int): Digest budget (env `SCRUM_DIGEST_MAX_CHARS`).
+
+    Returns:
+        str: The summary itself when it fits, otherwise the digest.
+    """
+    max_chars = max_chars or SCRUM_DIGEST_MAX_CHARS
+    summary = summary.strip()
+    if len(summary) <= max_chars:
+        return summary
+    units, separator = _digest_units(summary)
+    priority = [i for i, (_, is_priority) in enumerate(units) if is_priority]
+    rest = [i for i in reversed(range(len(units))) if not units[i][1]]
+    kept, used = {}, 0
+    for i in priority + rest:
+        # Each kept unit may also need a separator and an omission marker
+        cost = len(units[i][0]) + 2 * len(separator) + len(_OMITTED)
+        if used + cost <= max_chars:
+            kept[i] = units[i][0]
+            used += cost
+        elif units[i][1] and max_chars - used > 80:
+            # A priority section that does not fit whole keeps its start
+            kept[i] = _clip(units[i][0], max_chars - used - 2 * len(separator) - len(_OMITTED))
+            used = max_chars
+    parts = []
+    for i in range(len(units)):
+        if i in kept:
+            parts.append(kept[i])
+        elif not parts or parts[-1] != _OMITTED:
+            parts.append(_OMITTED)
+    return separator.join(parts)
+
+def get_rolling_context(db, project_id):
+    """
+    Load the compact history used by rolling summarization.
+
+    Returns:
+        dict: `rollups` - open (not yet rolled up further) roll-ups, oldest first;
+        `digests` - digests of the cycles after the last level-1 roll-up, oldest first.
+    """
+    project_ref = db.collection("projects").document(project_id)
+    rollup_collection = project_ref.collection("scrum_rollups")
+    rollup_query = rollup_collection.where("rolled_up", "==", False)
+    rollups = cached_query(rollup_collection, ("open",), lambda: [doc.to_dict() for doc in rollup_query.stream()])
+    rollups.sort(key=lambda r: (r["start_cycle"], -r["level"]))
+
+    covered = max((r["end_cycle"] for r in rollups), default=-1)
+    cycle_collection = project_ref.collection("scrum_cycles")
+    cycle_query = cycle_collection.where("cycle_number", ">", covered).order_by("cycle_number")
+    cycles = cached_query(cycle_collection, ("after", covered), lambda: [doc.to_dict() for doc in cycle_query.stream()])
+    return {"rollups": rollups, "digests": _digests(cycles)}
+
+async def aget_rolling_context(db, project_id):
+    """`get_rolling_context()` on the async Firestore client."""
+    project_ref = db.collection("projects").document(project_id)
+    rollup_collection = project_ref.collection("scrum_rollups")
+    rollup_query = rollup_collection.where("rolled_up", "==", False)
+    rollups = await cached_aquery(rollup_collection, ("open",), lambda: astream_dicts(rollup_query))
+    rollups.sort(key=lambda r: (r["start_cycle"], -r["level"]))
+
+    covered = max((r["end_cycle"] for r in rollups), default=-1)
+    cycle_collection = project_ref.collection("scrum_cycles")
+    cycle_query = cycle_collection.where("cycle_number", ">", covered).order_by("cycle_number")
+    cycles = await cached_aquery(cycle_collection, ("after", covered), lambda: astream_dicts(cycle_query))
+    return {"rollups": rollups, "digests": _digests(cycles)}
+
+def _digests(cycles):
+    return [
+        {"cycle_number": c["cycle_number"], "digest": c.get("digest") or make_digest(c.get("summary", ""))}
+        for c in cycles
+    ]
+
+def format_rolling_history(context):
+    rollup_lines = [
+        f"Cycles {r['start_cycle']}-{r['end_cycle']} (roll-up level {r['level']}): {r['summary']}"
+        for r in context["rollups"]
+    ]
+    digest_lines = [f"Cycle {d['cycle_number']}: {d['digest']}" for d in context["digests"]]
+    return "\n".join(rollup_lines + digest_lines) or "No previous cycles."
+
+def _roll_up_prompt(entries):
+    history = "\n".join(f"Cycles {e['start_cycle']}-{e['end_cycle']}: {e['text']}" for e in entries)
+    return f"""
+Condense the following scrum history into one short roll-up for the team. Keep completed milestones, recurring blockers, velocity trends and open risks. Drop per-developer detail.
+
+{history}
+"""
+
+def _roll_up(entries, level, response):
+    summary = make_digest(response.content)
+    return {
+        "level": level,
+        "start_cycle": entries[0]["start_cycle"],
+        "end_cycle": entries[-1]["end_cycle"],
+        "summary": summary,
+        "rolled_up": False,
+        "created_at": datetime.datetime.now(datetime.timezone.utc)
+    }
+
+def _rollup_id(rollup):
+    return f"L{rollup['level']}_{rollup['start_cycle']}_{rollup['end_cycle']}"
+
+def _rollup_entry(rollup):
+    return {"start_cycle": rollup["start_cycle"], "end_cycle": rollup["end_cycle"],
+            "text": rollup["summary"], "doc_id": _rollup_id(rollup)}
+
+def _pending_entries(context, cycle_number, digest):
+    return [
+        {"start_cycle": d["cycle_number"], "end_cycle": d["cycle_number"], "text": d["digest"]}
+        for d in context["digests"] if d["cycle_number"] < cycle_number
+    ] + [{"start_cycle": cycle_number, "end_cycle": cycle_number, "text": digest}]
+
+def update_rollups(llm, db, project_id, context, cycle_number, digest):
+    """
+    Fold the just-finished cycle into the roll-up hierarchy.
+
+    Every `SCRUM_ROLLUP_EVERY` cycle digests become one level-1 roll-up, and every
+    `SCRUM_ROLLUP_EVERY` open roll-ups of a level become one roll-up of the next
+    level, so the prompt history stays bounded however many cycles have run.
+    Writes go through `doc_set`/`doc_update`, so they join the caller's write buffer.
+
+    Returns:
+        List[dict]: The roll-ups created for this cycle (usually empty).
+    """
+    rollup_collection = db.collection("projects").document(project_id).collection("scrum_rollups")
+    pending = _pending_entries(context, cycle_number, digest)
+    created = []
+    level = 1
+    while len(pending) >= SCRUM_ROLLUP_EVERY:
+        rollup = _roll_up(pending, level, llm.invoke(_roll_up_prompt(pending)))
+        doc_set(rollup_collection.document(_rollup_id(rollup)), rollup)
+        created.append(rollup)
+        # Level-0 entries are cycle digests; roll-ups that were folded in are closed
+        for entry in pending:
+            if "doc_id" in entry:
+                doc_update(rollup_collection.document(entry["doc_id"]), {"rolled_up": True})
+        # The new roll-up may complete a group at the next level
+        pending = [_rollup_entry(r) for r in context["rollups"] if r["level"] == level] + [_rollup_entry(rollup)]
+        level += 1
+    return created
+
+async def aupdate_rollups(llm, db, project_id, context, cycle_number, digest):
+    """`update_rollups()` on the async Firestore client, with `llm.ainvoke`."""
+    rollup_collection = db.collection("projects").document(project_id).collection("scrum_rollups")
+    pending = _pending_entries(context, cycle_number, digest)
+    created = []
+    level = 1
+    while len(pending) >= SCRUM_ROLLUP_EVERY:
+        rollup = _roll_up(pending, level, await llm.ainvoke(_roll_up_prompt(pending)))
+        await adoc_set(rollup_collection.document(_rollup_id(rollup)), rollup)
+        created.append(rollup)
+        for entry in pending:
+            if "doc_id" in entry:
+                await adoc_update(rollup_collection.document(entry["doc_id"]), {"rolled_up": True})
+        pending = [_rollup_entry(r) for r in context["rollups"] if r["level"] == level] + [_rollup_entry(rollup)]
+        level += 1
+    return created
@@ -0,0 +1,211 @@
+import asyncio
+import os
+import threading
+import time
+from agentic.utils.firestore_cache import cached_query
+
+STANDUP_WATCH_MODE = os.getenv("STANDUP_WATCH_MODE", "listener")  # listener | local
+# 0 keeps the demo behaviour: report the current status without waiting
+STANDUP_WAIT_TIMEOUT_SECONDS = float(os.getenv("STANDUP_WAIT_TIMEOUT_SECONDS", "0"))
+# Longest wait for a listener's first snapshot, which Firestore delivers on a background thread
+STANDUP_SNAPSHOT_TIMEOUT_SECONDS = float(os.getenv("STANDUP_SNAPSHOT_TIMEOUT_SECONDS", "10"))
+
+def standup_status(cycle_number, dev_ids, submitted_dev_ids):
+    """The status report returned by `get_standup_status`, from dev ids and the set of devs who submitted."""
+    missing = [dev_id for dev_id in dev_ids if dev_id not in submitted_dev_ids]
+    return {
+        "cycle_number": cycle_number,
+        "total_developers": len(dev_ids),
+        "submitted_standups": len(submitted_dev_ids),
+        "missing_standups": len(missing),
+        "submitted_devs": sorted(submitted_dev_ids, key=str),
+        "missing_devs": missing,
+        "is_complete": not missing
+    }
+
+class CycleWatch:
+    """
+    The set of developers who have submitted a standup for one project cycle.
+
+    `wait()` (or `await_complete()` from async code) returns as soon as every
+    expected developer has submitted, or when the timeout passes. Either one first
+    waits for the initial read (`mark_ready()`), so even a zero timeout reports
+    the standups already stored rather than an empty set.
+    """
+
+    def __init__(self, project_id, cycle_number, dev_ids):
+        self.project_id = project_id
+        self.cycle_number = cycle_number
+        self.dev_ids = list(dev_ids)
+        self._expected = set(self.dev_ids)
+        self.submitted = set()
+        self.completed_at = None
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._ready = threading.Event()
+        self._async_waiters = []  # (loop, asyncio.Event)
+        self._unsubscribe = None
+        self._refs = 0
+        if not self._expected:
+            self._complete()
+
+    def add(self, dev_ids):
+        with self._lock:
+            # Standups without a dev_id (drafts, malformed documents) count for nobody
+            self.submitted.update(dev_id for dev_id in dev_ids if dev_id is not None)
+            complete = not self._event.is_set() and self._expected <= self.submitted
+        if complete:
+            self._complete()
+
+    def mark_ready(self):
+        """The cycle's stored standups have been added (initial snapshot or one-shot read)."""
+        self._ready.set()
+
+    def _complete(self):
+        self.completed_at = time.time()
+        self._event.set()
+        with self._lock:
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    @property
+    def is_complete(self):
+        return self._event.is_set()
+
+    def status(self):
+        with self._lock:
+            submitted = set(self.submitted)
+        return standup_status(self.cycle_number, self.dev_ids, submitted)
+
+    def wait(self, timeout=None):
+        """Block until the cycle's standups are complete or `timeout` seconds pass; returns the status."""
+        timeout = STANDUP_WAIT_TIMEOUT_SECONDS if timeout is None else timeout
+        if not self._event.is_set():
+            self._wait_ready()
+        if timeout > 0:
+            self._event.wait(timeout)
+        return self.status()
+
+    def _wait_ready(self):
+        if not self._ready.wait(STANDUP_SNAPSHOT_TIMEOUT_SECONDS):
+            print(f"[STANDUPS] No snapshot for {self.project_id} cycle {self.cycle_number} "
+                  f"after {STANDUP_SNAPSHOT_TIMEOUT_SECONDS}s; reporting what has arrived")
+
+    async def await_complete(self, timeout=None):
+        """`wait()` for the event loop: suspends instead of blocking a thread."""
+        timeout = STANDUP_WAIT_TIMEOUT_SECONDS if timeout is None else timeout
+        if not self._event.is_set() and not self._ready.is_set():
+            await asyncio.to_thread(self._wait_ready)
+        if timeout > 0 and not self._event.is_set():
+            event = asyncio.Event()
+            with self._lock:
+                self._async_waiters.append((asyncio.get_running_loop(), event))
+            if self._event.is_set():
+                event.set()
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.status()
+
+class StandupWatcher:
+    """
+    Process-wide registry of `CycleWatch`es, fed by Firestore or by local notifications.
+
+    In "listener" mode each watched cycle gets one snapshot listener on
+    `standups where cycle == n`; its initial snapshot and every later change
+    update the submitted set, and waits start once the initial snapshot is in.
+    In "local" mode (or when the client has no listeners) the cycle's standups
+    are read once and `notify()` - called by `save_standup` - feeds later
+    submissions in-process.
+    """
+
+    def __init__(self, db=None, mode=STANDUP_WATCH_MODE):
+        self.db = db
+        self.mode = mode
+        self._watches = {}  # (project_id, cycle_number) -> CycleWatch
+        self._lock = threading.Lock()
+
+    def _get_db(self):
+        if self.db is None:
+            from agentic.utils.firebase_client import get_firestore
+            self.db = get_firestore()
+        return self.db
+
+    def watch(self, project_id, cycle_number, dev_ids):
+        """
+        Start (or share) the watch for a cycle. Pair every call that returns with
+        `release()`; if subscribing raises, the watch is not registered.
+        """
+        key = (project_id, cycle_number)
+        with self._lock:
+            cycle_watch = self._watches.get(key)
+            if cycle_watch is None:
+                cycle_watch = CycleWatch(project_id, cycle_number, dev_ids)
+                self._watches[key] = cycle_watch
+                new = True
+            else:
+                new = False
+            cycle_watch._refs += 1
+        if new:
+            try:
+                self._subscribe(cycle_watch)
+            except BaseException:
+                # Unregister, so the next watch() subscribes afresh; callers already
+                # sharing this watch stop waiting for a snapshot that will not come
+                with self._lock:
+                    if self._watches.get(key) is cycle_watch:
+                        del self._watches[key]
+                cycle_watch.mark_ready()
+                raise
+        return cycle_watch
+
+    def _subscribe(self, cycle_watch):
+        collection = self._get_db().collection("projects").document(cycle_watch.project_id).collection("standups")
+        query = collection.where("cycle", "==", cycle_watch.cycle_number)
+        if self.mode == "listener" and hasattr(query, "on_snapshot"):
+            def on_snapshot(_docs, changes, _read_time):
+                dev_ids = (change.document.to_dict().get("dev_id") for change in changes if change.type.name != "REMOVED")
+                cycle_watch.add(dev_id for dev_id in dev_ids if dev_id is not None)
+                cycle_watch.mark_ready()
+            cycle_watch._unsubscribe = query.on_snapshot(on_snapshot).unsubscribe
+        else:
+            standups = cached_query(collection, ("cycle", cycle_watch.cycle_number),
+                                    lambda: [doc.to_dict() for doc in query.stream()])
+            cycle_watch.add(s.get("dev_id") for s in standups)
+            cycle_watch.mark_ready()
+
+    def notify(self, project_id, cycle_number, dev_id):
+        """Record a standup submitted in this process; releases the cycle if it was the last one."""
+        with self._lock:
+            cycle_watch = self._watches.get((project_id, cycle_number))
+        if cycle_watch is not None:
+            cycle_watch.add([dev_id])
+
+    def release(self, cycle_watch):
+        with self._lock:
+            cycle_watch._refs -= 1
+            if cycle_watch._refs > 0:
+                return
+            key = (cycle_watch.project_id, cycle_watch.cycle_number)
+            # A watch whose subscription failed may already be replaced by a newer one
+            if self._watches.get(key) is cycle_watch:
+                del self._watches[key]
+        if cycle_watch._unsubscribe is not None:
+            cycle_watch._unsubscribe()
+
+    def active_watches(self):
+        with self._lock:
+            return len(self._watches)
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+def get_standup_watcher():
+    global _watcher
+    if _watcher is None:
+        with _watcher_lock:
+            if _watcher is None:
+                _watcher = StandupWatcher()
+    return _watcher
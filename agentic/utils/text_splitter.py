@@ -1,9 +1,248 @@
+import io
+import os
 import re
-from langchain.schema import Document
+from langchain_core.documents import Document
+from agentic.utils.prompt_packer import count_tokens
+
+# The default embedding model (all-MiniLM-L6-v2) truncates input past 256 word pieces;
+# the default window stays below that even where token counts are estimated
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "200"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "32"))
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^(```|~~~)")
+_LIST_ITEM = re.compile(r"^([-*+]|\d+[.)])\s+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def _section_name(section):
+    return " > ".join(section)
+
+def _cut_point(line, max_chars):
+    """Where to cut an over-long line: after its last sentence end within `max_chars`, else its last space."""
+    window = line[:max_chars + 1]
+    ends = [match.start() for match in _SENTENCE_END.finditer(window)]
+    if ends:
+        return ends[-1]
+    space = window.rfind(" ")
+    return space if space > 0 else max_chars
+
+def iter_blocks(lines, max_block_chars=None):
+    """
+    Group markdown lines into headings, paragraphs, lists and fenced code blocks.
+
+    Blocks longer than `max_block_chars` are cut at a line boundary (a single longer
+    line is cut at a sentence end or space), so memory stays bounded whatever the input.
+
+    Args:
+        lines (Iterable[str]): Lines of markdown, e.g. an open file.
+        max_block_chars (int): Longest block emitted (default: 8 x CHUNK_MAX_TOKENS).
+
+    Yields:
+        dict: `kind` (heading | paragraph | list | code), `text`, and `section`
+        (tuple of the enclosing heading titles).
+    """
+    max_block_chars = max_block_chars or CHUNK_MAX_TOKENS * 8
+    headings = []  # (level, title)
+    kind, buffer, size = None, [], 0
+    fence = None
+
+    def flush():
+        nonlocal kind, buffer, size
+        block = None
+        if buffer:
+            block = {"kind": kind, "text": "\n".join(buffer), "section": tuple(title for _, title in headings)}
+        kind, buffer, size = None, [], 0
+        return block
+
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+
+        if fence is not None:
+            buffer.append(line)
+            size += len(line) + 1
+            if stripped.startswith(fence):
+                fence = None
+                yield flush()
+            elif size >= max_block_chars:
+                yield flush()
+                kind = "code"
+            continue
+
+        match = _FENCE.match(stripped)
+        if match:
+            if buffer:
+                yield flush()
+            fence, kind, buffer, size = match.group(1), "code", [line], len(line) + 1
+            continue
+
+        if not stripped:
+            if buffer:
+                yield flush()
+            continue
+
+        match = _HEADING.match(stripped)
+        if match:
+            if buffer:
+                yield flush()
+            level, title = len(match.group(1)), match.group(2)
+            while headings and headings[-1][0] >= level:
+                headings.pop()
+            headings.append((level, title))
+            kind, buffer = "heading", [stripped]
+            yield flush()
+            continue
+
+        line_kind = "list" if _LIST_ITEM.match(stripped) else "paragraph"
+        if buffer and kind == "paragraph" and line_kind == "list":
+            yield flush()
+        if not buffer:
+            kind = line_kind
+        while len(stripped) > max_block_chars:
+            # One very long line: emit it in pieces, cut at a sentence end or else a space
+            if buffer:
+                yield flush()
+                kind = line_kind
+            cut = _cut_point(stripped, max_block_chars)
+            buffer.append(stripped[:cut].rstrip())
+            yield flush()
+            kind = line_kind
+            stripped = stripped[cut:].lstrip()
+        buffer.append(stripped)
+        size += len(stripped) + 1
+        if size >= max_block_chars:
+            yield flush()
+
+    if buffer:
+        yield flush()
+
+def _split_words(text, max_tokens):
+    """Cut text that is one unit (no sentence or line breaks) into windows of at most `max_tokens`."""
+    pieces, current, current_tokens = [], [], 0
+    for word in text.split(" "):
+        while count_tokens(word) > max_tokens:
+            # No spaces to cut at: fall back to characters
+            cut = max(1, len(word) * max_tokens // count_tokens(word))
+            if current:
+                pieces.append(" ".join(current))
+                current, current_tokens = [], 0
+            pieces.append(word[:cut])
+            word = word[cut:]
+        tokens = count_tokens(word + " ")
+        if current and current_tokens + tokens > max_tokens:
+            pieces.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+def _units(block, max_tokens):
+    """
+    Break a block into packable units with the separator that precedes each.
+
+    Paragraphs split into sentences and lists into lines, so windows can end and
+    overlap between them. Headings and code blocks that fit a window stay whole;
+    larger code splits into lines. Pieces still over the window split at words.
+    """
+    text = block["text"]
+    if block["kind"] == "heading" or (block["kind"] == "code" and count_tokens(text) <= max_tokens):
+        return [("\n\n", text, count_tokens(text))]
+    if block["kind"] in ("code", "list"):
+        pieces, separator = text.split("\n"), "\n"
+    else:
+        pieces, separator = _SENTENCE_END.split(text), " "
+    units = []
+    for piece in pieces:
+        if not piece:
+            continue
+        for part in ([piece] if count_tokens(piece) <= max_tokens else _split_words(piece, max_tokens)):
+            units.append((separator if units else "\n\n", part, count_tokens(part)))
+    return units
+
+def iter_chunks(lines, max_tokens=None, overlap_tokens=None, metadata=None):
+    """
+    Stream token-bounded chunks of a markdown document.
+
+    Blocks from `iter_blocks()` are packed whole into windows of up to `max_tokens`.
+    A window never spans two sections. Consecutive windows of one section share
+    up to `overlap_tokens` of trailing text. Only the current block and window
+    are held in memory.
+
+    Args:
+        lines (Iterable[str]): Lines of markdown.
+        max_tokens (int): Window size (env `CHUNK_MAX_TOKENS`).
+        overlap_tokens (int): Overlap between windows of a section (env `CHUNK_OVERLAP_TOKENS`).
+        metadata (dict): Extra metadata for every chunk, e.g. the source path.
+
+    Yields:
+        Document: Chunk text, with `section` (heading path) and `block_types` metadata.
+    """
+    max_tokens = max_tokens or CHUNK_MAX_TOKENS
+    overlap_tokens = CHUNK_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+    overlap_tokens = min(overlap_tokens, max_tokens // 2)
+    window, window_tokens, kinds = [], 0, set()
+    section = None
+    fresh = False  # the window holds text not yet emitted (not only overlap)
+
+    def emit():
+        content = "".join(separator + text for separator, text, _ in window)[len(window[0][0]):]
+        return Document(
+            page_content=content,
+            metadata={**(metadata or {}), "section": _section_name(section), "block_types": sorted(kinds)}
+        )
+
+    def carry_overlap():
+        carried, carried_tokens = [], 0
+        for unit in reversed(window):
+            if carried_tokens + unit[2] > overlap_tokens:
+                break
+            carried.insert(0, unit)
+            carried_tokens += unit[2]
+        return carried, carried_tokens
+
+    for block in iter_blocks(lines, max_block_chars=max_tokens * 8):
+        if block["section"] != section:
+            # A section's chunks start fresh, except that a heading with no text of
+            # its own is kept as the start of the next section's first chunk
+            if kinds != {"heading"}:
+                if fresh:
+                    yield emit()
+                window, window_tokens, kinds, fresh = [], 0, set(), False
+            section = block["section"]
+        for unit in _units(block, max_tokens):
+            if window and window_tokens + unit[2] > max_tokens:
+                if fresh:
+                    yield emit()
+                window, window_tokens = carry_overlap()
+                kinds = set()
+                while window and window_tokens + unit[2] > max_tokens:
+                    window_tokens -= window.pop(0)[2]
+            window.append(unit)
+            window_tokens += unit[2]
+            kinds.add(block["kind"])
+            fresh = True
+    if fresh:
+        yield emit()
+
+def chunk_text(text, max_tokens=None, overlap_tokens=None, metadata=None):
+    """`iter_chunks()` over a string."""
+    return iter_chunks(io.StringIO(text), max_tokens, overlap_tokens, metadata)
+
+def chunk_file(path, max_tokens=None, overlap_tokens=None, encoding="utf-8"):
+    """`iter_chunks()` over a file, read line by line; chunks carry its path as `source`."""
+    with open(path, encoding=encoding) as f:
+        yield from iter_chunks(f, max_tokens, overlap_tokens, metadata={"source": os.fspath(path)})
 
 def split_project_markdown(text: str):
-    # Split text into sentences using regex
-    sentences = re.split(r'(?<=[.!?])\s+', text.strip())
-    # Create a Document for each sentence
-    docs = [Document(page_content=sentence) for sentence in sentences if sentence.strip()]
-    return docs
+    """
+    Chunk a project description for embedding (see `iter_chunks()`).
+
+    Args:
+        text (str): The project description, in markdown or plain text.
+
+    Returns:
+        List[Document]: Token-bounded chunks with section metadata.
+    """
+    return list(chunk_text(text.strip()))
@@ -0,0 +1,143 @@
+import datetime
+import sys
+from agentic.utils.firestore_batch import doc_set, write_buffer
+
+# The one ticket store: projects/{project_id}/tickets/{ticket_id}. Composite indexes
+# for the ticket slices below are declared in firestore.indexes.json; the standup
+# slice filters on one field and needs none.
+TICKETS_COLLECTION = "tickets"
+OPEN_STATUSES = ["todo", "in_progress"]
+
+def server_stamped(data):
+    """
+    `data` with `updated_at` set by Firestore when the write commits.
+
+    Every writer of tickets and standups stamps them this way: `ProjectView` reads
+    what changed since its last read by `updated_at`, and only the server's clock
+    orders those timestamps against the read times it keeps.
+    """
+    from google.cloud.firestore import SERVER_TIMESTAMP
+    return {**data, "updated_at": SERVER_TIMESTAMP}
+
+def tickets_collection(db, project_id):
+    return db.collection("projects").document(project_id).collection(TICKETS_COLLECTION)
+
+def ticket_ref(db, project_id, ticket_id):
+    return tickets_collection(db, project_id).document(ticket_id)
+
+def ticket_query(db, project_id, status=None, assigned_dev_id=None, open_only=False, updated_since=None):
+    """
+    Build a ticket query that reads only the requested slice.
+
+    Works with the sync and async Firestore clients alike.
+
+    Returns:
+        Tuple: (collection, cache key, query) - pass them to `cached_query`/`cached_aquery`.
+    """
+    collection = tickets_collection(db, project_id)
+    query = collection
+    if assigned_dev_id:
+        query = query.where("assigned_dev_id", "==", assigned_dev_id)
+    if status:
+        query = query.where("status", "==", status)
+    elif open_only:
+        query = query.where("status", "in", OPEN_STATUSES)
+    if updated_since is not None:
+        if isinstance(updated_since, datetime.datetime) and updated_since.tzinfo is None:
+            # Naive timestamps (datetime.utcnow()) are UTC, as Firestore stores them
+            updated_since = updated_since.replace(tzinfo=datetime.timezone.utc)
+        query = query.where("updated_at", ">=", updated_since)
+    if status is None and not open_only and assigned_dev_id is None and updated_since is None:
+        # Same key get_project_tickets has always used for the whole collection
+        return collection, ("status", None), query
+    return collection, ("slice", status, assigned_dev_id, open_only, updated_since), query
+
+def cycle_ticket_queries(db, project_id, since=None):
+    """
+    The tickets a standup summary needs: every open ticket, plus tickets completed
+    since `since` (the previous cycle's end). Without `since`, every completed ticket.
+    """
+    return [
+        ticket_query(db, project_id, open_only=True),
+        ticket_query(db, project_id, status="completed", updated_since=since)
+    ]
+
+def standup_query(db, project_id, cycle_number=None):
+    """
+    Build the query for one cycle's standups (every standup without `cycle_number`).
+
+    Returns:
+        Tuple: (collection, cache key, query), like `ticket_query()`.
+    """
+    collection = db.collection("projects").document(project_id).collection("standups")
+    if cycle_number is None:
+        return collection, "all", collection
+    return collection, ("cycle", cycle_number), collection.where("cycle", "==", cycle_number)
+
+def delete_ticket(db, project_id, ticket_id):
+    """
+    Delete a ticket by tombstoning it (`deleted: True`) and take it off its developer's
+    workload counters, in one transaction.
+
+    The document stays so `ProjectView` delta reads see the deletion; every ticket
+    reader skips tombstones.
+
+    Returns:
+        bool: False if there was no such ticket.
+    """
+    from google.cloud.firestore import transactional
+    from agentic.utils.firestore_cache import invalidate
+    from agentic.utils.workload_aggregates import record_ticket_deleted
+    ref = ticket_ref(db, project_id, ticket_id)
+
+    @transactional
+    def tombstone(transaction):
+        doc = ref.get(transaction=transaction)
+        if not doc.exists or doc.to_dict().get("deleted"):
+            return False
+        transaction.update(ref, server_stamped({"deleted": True}))
+        record_ticket_deleted(db, project_id, doc.to_dict(), transaction=transaction)
+        return True
+
+    deleted = tombstone(db.transaction())
+    invalidate(ref.path)
+    return deleted
+
+def migrate_dev_tickets(project_id, db=None, delete_legacy=False):
+    """
+    Copy tickets from the legacy `dev_profiles/{dev_id}/tickets` subcollections into
+    the canonical `projects/{project_id}/tickets` store, then rebuild the project's
+    workload counters. Safe to re-run: tickets keep their ids.
+
+    Returns:
+        int: The number of tickets copied.
+    """
+    from agentic.utils.workload_aggregates import rebuild_workload_aggregates
+    if db is None:
+        from agentic.utils.firebase_client import get_firestore
+        db = get_firestore()
+    project_ref = db.collection("projects").document(project_id)
+    copied = 0
+    with write_buffer(db):
+        for dev in project_ref.collection("dev_profiles").stream():
+            for legacy in dev.reference.collection("tickets").stream():
+                ticket = legacy.to_dict()
+                ticket.setdefault("id", legacy.id)
+                ticket.setdefault("assigned_dev_id", dev.to_dict().get("id") or dev.id)
+                # Stamped at the copy, not with created_at: a project view whose watermark
+                # is past created_at would otherwise never read the copied ticket
+                doc_set(ticket_ref(db, project_id, ticket["id"]), server_stamped(ticket))
+                copied += 1
+    if delete_legacy:
+        for dev in project_ref.collection("dev_profiles").stream():
+            for legacy in dev.reference.collection("tickets").stream():
+                legacy.reference.delete()
+    rebuild_workload_aggregates(project_id, db)
+    return copied
+
+if __name__ == "__main__":
+    # python -m agentic.utils.ticket_store [--delete-legacy] <project_id> [<project_id> ...]
+    delete_legacy = "--delete-legacy" in sys.argv
+    for project_id in [arg for arg in sys.argv[1:] if arg != "--delete-legacy"]:
+        copied = migrate_dev_tickets(project_id, delete_legacy=delete_legacy)
+        print(f"Migrated {copied} tickets into projects/{project_id}/tickets")
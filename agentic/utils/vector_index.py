@@ -0,0 +1,187 @@
+import asyncio
+import datetime
+import hashlib
+import json
+import os
+from agentic.utils.firestore_batch import atomic_writes, doc_set, adoc_set
+from agentic.utils.firestore_cache import cached_get, cached_aget
+
+MANIFEST_COLLECTION = "vector_index"
+MANIFEST_DOCUMENT = "manifest"
+# Vector ids per manifest shard; ids are ~60 bytes, so a shard stays far below Firestore's 1 MiB document limit
+MANIFEST_SHARD_SIZE = int(os.getenv("MANIFEST_SHARD_SIZE", "5000"))
+
+def manifest_ref(db, project_id):
+    """projects/{project_id}/vector_index/manifest: the embedding model and shard count of the project's index."""
+    return db.collection("projects").document(project_id).collection(MANIFEST_COLLECTION).document(MANIFEST_DOCUMENT)
+
+def manifest_shard_ref(db, project_id, shard):
+    """projects/{project_id}/vector_index/manifest_{shard}: the next `MANIFEST_SHARD_SIZE` indexed vector ids."""
+    return db.collection("projects").document(project_id).collection(MANIFEST_COLLECTION).document(f"{MANIFEST_DOCUMENT}_{shard}")
+
+def _assemble_manifest(header, shards):
+    if "ids" in header:
+        # Written before the manifest was sharded
+        return header
+    return {**header, "ids": [vector_id for shard in shards for vector_id in (shard or {}).get("ids", [])]}
+
+def load_manifest(db, project_id):
+    """
+    Read a project's manifest: its header plus every id shard.
+
+    Returns:
+        dict | None: The header fields with `ids` holding all shards' ids in order,
+        or None if the project has no manifest yet.
+    """
+    snapshot = cached_get(manifest_ref(db, project_id))
+    if not snapshot.exists:
+        return None
+    header = snapshot.to_dict()
+    shards = [cached_get(manifest_shard_ref(db, project_id, n)).to_dict() for n in range(header.get("shards", 0))]
+    return _assemble_manifest(header, shards)
+
+async def aload_manifest(db, project_id):
+    """`load_manifest()` with the async Firestore client; the shards are read concurrently."""
+    snapshot = await cached_aget(manifest_ref(db, project_id))
+    if not snapshot.exists:
+        return None
+    header = snapshot.to_dict()
+    shards = await asyncio.gather(*(cached_aget(manifest_shard_ref(db, project_id, n)) for n in range(header.get("shards", 0))))
+    return _assemble_manifest(header, [shard.to_dict() for shard in shards])
+
+def chunk_ids(namespace, docs):
+    """
+    Stable vector ids derived from each chunk's content and metadata.
+
+    An unchanged chunk keeps its id wherever it moves in the description; a chunk
+    that appears more than once gets an occurrence suffix so each copy is kept.
+
+    Returns:
+        List[str]: `{namespace}-{sha256[:32]}` (plus `-{n}` for repeats), one per doc.
+    """
+    seen = {}
+    ids = []
+    for doc in docs:
+        payload = json.dumps([doc.page_content, getattr(doc, "metadata", None) or {}], sort_keys=True, default=str)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+        occurrence = seen.get(digest, 0)
+        seen[digest] = occurrence + 1
+        ids.append(f"{namespace}-{digest}" + (f"-{occurrence}" if occurrence else ""))
+    return ids
+
+def plan_reindex(manifest, namespace, docs, embedding_model):
+    """
+    Diff a project's chunks against its stored manifest.
+
+    A manifest written for a different embedding model is ignored, so every chunk
+    is re-embedded (the old vectors are still deleted).
+
+    Args:
+        manifest (dict | None): The stored manifest, from `load_manifest()`.
+        namespace (str): Vector store namespace of the project.
+        docs (List[Document]): The chunks of the current description.
+        embedding_model (str): Model the vectors are (to be) embedded with.
+
+    Returns:
+        dict: `ids` (all chunk ids, in order), `added` ([(id, doc)] to embed and
+        upsert), `removed` (ids to delete), `unchanged` (count), `rebuild`,
+        `write_manifest` (whether the manifest needs saving afterwards) and
+        `previous_shards` (the stored manifest's shard count).
+    """
+    manifest = manifest or {}
+    indexed = manifest.get("ids") or []
+    rebuild = bool(indexed) and manifest.get("embedding_model") != embedding_model
+    ids = chunk_ids(namespace, docs)
+    current = set(ids)
+    keep = set() if rebuild else set(indexed)
+    added = [(vector_id, doc) for vector_id, doc in zip(ids, docs) if vector_id not in keep]
+    removed = [vector_id for vector_id in indexed if vector_id not in current]
+    return {
+        "ids": ids,
+        "added": added,
+        "removed": removed,
+        "unchanged": len(current & keep),
+        "rebuild": rebuild,
+        "write_manifest": bool(added or removed or rebuild or "shards" not in manifest),
+        "previous_shards": manifest.get("shards", 0)
+    }
+
+def apply_reindex(plan, store, namespace, embed):
+    """
+    Delete the removed vectors, then embed and upsert only the added chunks, and
+    flush the namespace so the vectors are persisted before the manifest is saved.
+
+    Returns:
+        dict: The store's upsert report plus `added`, `removed`, `unchanged` and `rebuild`.
+    """
+    if plan["removed"]:
+        store.delete(plan["removed"], namespace=namespace)
+    added_docs = [doc for _, doc in plan["added"]]
+    vectors = embed(added_docs) if added_docs else []
+    records = [
+        {"id": vector_id, "values": vector.tolist(), "metadata": {"text": doc.page_content, **(doc.metadata or {})}}
+        for (vector_id, doc), vector in zip(plan["added"], vectors)
+    ]
+    report = store.upsert(records, namespace=namespace)
+    store.flush(namespace)
+    return {**report, "added": len(records), "removed": len(plan["removed"]),
+            "unchanged": plan["unchanged"], "rebuild": plan["rebuild"]}
+
+def manifest_documents(plan, embedding_model):
+    """
+    The manifest documents for an applied plan.
+
+    Returns:
+        Tuple[dict, List[Tuple[int, dict]]]: The header, and (shard number, data)
+        per shard; shards past the new count are written empty.
+    """
+    ids = plan["ids"]
+    shards = [ids[start:start + MANIFEST_SHARD_SIZE] for start in range(0, len(ids), MANIFEST_SHARD_SIZE)]
+    header = {
+        "embedding_model": embedding_model,
+        "chunks": len(ids),
+        "shards": len(shards),
+        "updated_at": datetime.datetime.now(datetime.timezone.utc)
+    }
+    documents = [(n, {"ids": shard}) for n, shard in enumerate(shards)]
+    documents += [(n, {"ids": []}) for n in range(len(shards), plan["previous_shards"])]
+    return header, documents
+
+def save_manifest(db, project_id, plan, embedding_model):
+    """Save the manifest for an applied plan, if it changed; the header and shards are committed in one batch."""
+    if not plan["write_manifest"]:
+        return
+    header, documents = manifest_documents(plan, embedding_model)
+    with atomic_writes(db):
+        for shard, data in documents:
+            doc_set(manifest_shard_ref(db, project_id, shard), data)
+        doc_set(manifest_ref(db, project_id), header)
+
+def reindex_project(db, project_id, docs, store, embed, embedding_model, namespace=None):
+    """
+    Bring a project's vectors in line with `docs`, embedding only what changed.
+
+    The manifest is written after the vector store has been updated, so an
+    interrupted run is redone (idempotently) next time.
+
+    Returns:
+        dict: See `apply_reindex()`.
+    """
+    namespace = namespace or project_id
+    plan = plan_reindex(load_manifest(db, project_id), namespace, docs, embedding_model)
+    report = apply_reindex(plan, store, namespace, embed)
+    save_manifest(db, project_id, plan, embedding_model)
+    return report
+
+async def aplan_reindex(db, project_id, docs, embedding_model, namespace=None):
+    """`plan_reindex()` against the manifest read with the async Firestore client."""
+    return plan_reindex(await aload_manifest(db, project_id), namespace or project_id, docs, embedding_model)
+
+async def asave_manifest(db, project_id, plan, embedding_model):
+    """`save_manifest()` with the async Firestore client; call it inside an `async_write_buffer` so it commits in one batch."""
+    if not plan["write_manifest"]:
+        return
+    header, documents = manifest_documents(plan, embedding_model)
+    for shard, data in documents:
+        await adoc_set(manifest_shard_ref(db, project_id, shard), data)
+    await adoc_set(manifest_ref(db, project_id), header)
@@ -0,0 +1,240 @@
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "pinecone")  # pinecone | local
+LOCAL_VECTOR_STORE_DIR = os.getenv("LOCAL_VECTOR_STORE_DIR", os.path.join(".cache", "vector_store"))
+LOCAL_VECTOR_STORE_DTYPE = os.getenv("LOCAL_VECTOR_STORE_DTYPE", "float32")  # float32 | float16 | int8
+
+class VectorStore(ABC):
+    """
+    Minimal vector store interface shared by the Pinecone and local backends.
+
+    Vectors use the Pinecone dict shape: {"id": str, "values": List[float], "metadata": dict}.
+    Query results are dicts with `id`, `score` (cosine similarity) and `metadata`.
+    """
+
+    @abstractmethod
+    def upsert(self, vectors, namespace):
+        ...
+
+    @abstractmethod
+    def query(self, vector, top_k=3, namespace=None, filter=None):
+        ...
+
+    @abstractmethod
+    def delete(self, ids, namespace):
+        ...
+
+    def flush(self, namespace=None):
+        """Persist buffered upserts and deletes (all namespaces by default); a no-op for write-through backends."""
+
+class PineconeVectorStore(VectorStore):
+    """Remote backend: thin wrapper over a Pinecone index from `init_pinecone()`."""
+
+    def __init__(self, index=None):
+        from agentic.utils.pinecone_client import init_pinecone
+        self.index = index or init_pinecone()
+
+    def upsert(self, vectors, namespace):
+        from agentic.utils.pinecone_client import upsert_vectors_batched
+        return upsert_vectors_batched(self.index, vectors, namespace=namespace)
+
+    def query(self, vector, top_k=3, namespace=None, filter=None):
+        response = self.index.query(
+            vector=list(map(float, vector)),
+            top_k=top_k,
+            namespace=namespace,
+            filter=filter,
+            include_metadata=True
+        )
+        return [
+            {"id": m["id"], "score": m["score"], "metadata": m.get("metadata") or {}}
+            for m in response["matches"]
+        ]
+
+    def delete(self, ids, namespace):
+        ids = list(ids)
+        # Pinecone accepts at most 1000 ids per delete request
+        for start in range(0, len(ids), 1000):
+            self.index.delete(ids=ids[start:start + 1000], namespace=namespace)
+
+class _Namespace:
+    """Rows for one namespace: normalized vectors stored in the configured dtype."""
+
+    def __init__(self, dtype):
+        self.dtype = dtype
+        self.ids = []
+        self.positions = {}
+        self.metadata = []
+        self.matrix = None
+        self.scales = None  # per-row dequantization scale, int8 only
+
+    def encode(self, values):
+        values = np.asarray(values, dtype=np.float32)
+        norms = np.linalg.norm(values, axis=1, keepdims=True)
+        values = values / np.where(norms == 0, 1, norms)
+        if self.dtype == "int8":
+            scales = np.abs(values).max(axis=1) / 127
+            scales = np.where(scales == 0, 1, scales).astype(np.float32)
+            return np.round(values / scales[:, None]).astype(np.int8), scales
+        return values.astype(self.dtype), None
+
+    def scores(self, query):
+        if self.dtype == "int8":
+            return (self.matrix.astype(np.float32) @ query) * self.scales
+        return self.matrix.astype(np.float32, copy=False) @ query
+
+class LocalVectorStore(VectorStore):
+    """
+    In-process backend: brute-force cosine top-k over NumPy matrices.
+
+    Each namespace is kept in memory and persisted to one `.npz` file under
+    `directory` by `flush()` (and at exit), not by every upsert or delete, so a
+    batch of writes rewrites the file once. Vectors are L2-normalized on insert so
+    a query is a single matrix-vector product. `dtype` may be float32, float16 or
+    int8 (symmetric per-row quantization).
+    """
+
+    def __init__(self, directory=LOCAL_VECTOR_STORE_DIR, dtype=LOCAL_VECTOR_STORE_DTYPE):
+        if dtype not in ("float32", "float16", "int8"):
+            raise ValueError(f"Unsupported local vector store dtype: {dtype}")
+        self.directory = directory
+        self.dtype = dtype
+        self._namespaces = {}
+        self._dirty = set()
+        self._lock = threading.RLock()
+        atexit.register(self.flush)
+
+    def _path(self, namespace):
+        # Namespaces are project ids: keep a readable prefix, and let the hash keep
+        # separators and ".." out of the path and distinct namespaces apart
+        namespace = namespace or "__default__"
+        slug = re.sub(r"[^A-Za-z0-9_-]", "_", namespace)[:64]
+        digest = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{slug}-{digest}.npz")
+
+    def _namespace(self, namespace):
+        ns = self._namespaces.get(namespace)
+        if ns is None:
+            ns = _Namespace(self.dtype)
+            path = self._path(namespace)
+            if os.path.exists(path):
+                with np.load(path, allow_pickle=False) as data:
+                    ns.ids = [str(i) for i in data["ids"]]
+                    ns.metadata = json.loads(str(data["metadata"]))
+                    ns.matrix = data["matrix"]
+                    ns.scales = data["scales"] if "scales" in data.files else None
+                    ns.dtype = str(ns.matrix.dtype)
+                ns.positions = {vid: i for i, vid in enumerate(ns.ids)}
+            self._namespaces[namespace] = ns
+        return ns
+
+    def _save(self, namespace, ns):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(namespace)
+        arrays = {
+            "ids": np.array(ns.ids, dtype=str),
+            "metadata": np.array(json.dumps(ns.metadata)),
+            "matrix": ns.matrix if ns.matrix is not None else np.zeros((0, 0), dtype=ns.dtype)
+        }
+        if ns.scales is not None:
+            arrays["scales"] = ns.scales
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    def upsert(self, vectors, namespace):
+        start = time.perf_counter()
+        if not vectors:
+            return {"vectors": 0, "batches": 0, "total_retries": 0, "wall_time_s": 0.0, "max_batch_latency_s": 0.0}
+        with self._lock:
+            ns = self._namespace(namespace)
+            rows, scales = ns.encode([v["values"] for v in vectors])
+            if ns.matrix is None or len(ns.ids) == 0:
+                ns.matrix = np.empty((0, rows.shape[1]), dtype=rows.dtype)
+                ns.scales = np.empty(0, dtype=np.float32) if scales is not None else None
+            new_rows, new_scales = [], []
+            for i, vector in enumerate(vectors):
+                position = ns.positions.get(vector["id"])
+                if position is not None:
+                    ns.matrix[position] = rows[i]
+                    if scales is not None:
+                        ns.scales[position] = scales[i]
+                    ns.metadata[position] = vector.get("metadata") or {}
+                    continue
+                ns.positions[vector["id"]] = len(ns.ids)
+                ns.ids.append(vector["id"])
+                ns.metadata.append(vector.get("metadata") or {})
+                new_rows.append(i)
+            if new_rows:
+                ns.matrix = np.concatenate([ns.matrix, rows[new_rows]])
+                if scales is not None:
+                    ns.scales = np.concatenate([ns.scales, scales[new_rows]])
+            self._dirty.add(namespace)
+        elapsed = time.perf_counter() - start
+        return {"vectors": len(vectors), "batches": 1, "total_retries": 0, "wall_time_s": elapsed, "max_batch_latency_s": elapsed}
+
+    def query(self, vector, top_k=3, namespace=None, filter=None):
+        with self._lock:
+            ns = self._namespace(namespace)
+            if not ns.ids:
+                return []
+            query = np.asarray(vector, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            scores = ns.scores(query / norm if norm else query)
+            if filter:
+                mask = np.array([all(m.get(k) == v for k, v in filter.items()) for m in ns.metadata])
+                scores = np.where(mask, scores, -np.inf)
+            k = min(top_k, len(ns.ids))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                {"id": ns.ids[i], "score": float(scores[i]), "metadata": ns.metadata[i]}
+                for i in top if np.isfinite(scores[i])
+            ]
+
+    def delete(self, ids, namespace):
+        with self._lock:
+            ns = self._namespace(namespace)
+            doomed = {ns.positions[i] for i in ids if i in ns.positions}
+            if not doomed:
+                return
+            keep = [p for p in range(len(ns.ids)) if p not in doomed]
+            ns.ids = [ns.ids[p] for p in keep]
+            ns.metadata = [ns.metadata[p] for p in keep]
+            ns.matrix = ns.matrix[keep]
+            if ns.scales is not None:
+                ns.scales = ns.scales[keep]
+            ns.positions = {vid: i for i, vid in enumerate(ns.ids)}
+            self._dirty.add(namespace)
+
+    def flush(self, namespace=None):
+        with self._lock:
+            for name in [namespace] if namespace is not None else list(self._dirty):
+                if name in self._dirty:
+                    self._save(name, self._namespaces[name])
+                    self._dirty.discard(name)
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_vector_store():
+    """Return the process-wide vector store for the backend named by `VECTOR_STORE_BACKEND`."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if VECTOR_STORE_BACKEND == "pinecone":
+                    _store = PineconeVectorStore()
+                elif VECTOR_STORE_BACKEND == "local":
+                    _store = LocalVectorStore()
+                else:
+                    raise ValueError(f"Unknown vector store backend: {VECTOR_STORE_BACKEND}")
+    return _store
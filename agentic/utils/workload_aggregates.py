@@ -0,0 +1,179 @@
+import datetime
+import sys
+from agentic.utils.firestore_batch import doc_set, write_buffer
+from agentic.utils.firestore_cache import invalidate
+from agentic.utils.ticket_store import tickets_collection
+
+# Ticket statuses with their own counter; anything else only counts towards total_tickets
+COUNTED_STATUSES = ("todo", "in_progress", "completed")
+
+def workload_ref(db, project_id, dev_id):
+    return db.collection("projects").document(project_id).collection("dev_workloads").document(dev_id)
+
+def _status_field(status):
+    return f"{status}_tickets" if status in COUNTED_STATUSES else None
+
+def record_ticket_created(db, project_id, ticket):
+    """
+    Add a new ticket to its developer's workload counters.
+
+    Call inside the `write_buffer` that writes the ticket, so the ticket and the
+    counters are committed in the same batch.
+    """
+    from google.cloud.firestore_v1.transforms import Increment
+    dev_id = ticket.get("assigned_dev_id")
+    if not dev_id:
+        return
+    hours = ticket.get("estimated_hours", 0) or 0
+    update = {
+        "dev_id": dev_id,
+        "total_tickets": Increment(1),
+        "total_estimated_hours": Increment(hours),
+        "updated_at": datetime.datetime.now(datetime.timezone.utc)
+    }
+    field = _status_field(ticket.get("status"))
+    if field:
+        update[field] = Increment(1)
+    if ticket.get("status") == "completed":
+        update["completed_hours"] = Increment(hours)
+    doc_set(workload_ref(db, project_id, dev_id), update, merge=True)
+
+def record_ticket_status_change(db, project_id, ticket, new_status, transaction=None):
+    """
+    Move a ticket between status counters (and completed hours).
+
+    Pass the `transaction` that read `ticket` and writes its new status, so the
+    counters move once per actual change even when two changes race; without
+    one the counters join the active write buffer.
+    """
+    from google.cloud.firestore_v1.transforms import Increment
+    dev_id = ticket.get("assigned_dev_id")
+    old_status = ticket.get("status")
+    if not dev_id or old_status == new_status:
+        return
+    hours = ticket.get("estimated_hours", 0) or 0
+    update = {"dev_id": dev_id, "updated_at": datetime.datetime.now(datetime.timezone.utc)}
+    if _status_field(old_status):
+        update[_status_field(old_status)] = Increment(-1)
+    if _status_field(new_status):
+        update[_status_field(new_status)] = Increment(1)
+    if old_status == "completed":
+        update["completed_hours"] = Increment(-hours)
+    elif new_status == "completed":
+        update["completed_hours"] = Increment(hours)
+    ref = workload_ref(db, project_id, dev_id)
+    if transaction is None:
+        doc_set(ref, update, merge=True)
+    else:
+        invalidate(ref.path)
+        transaction.set(ref, update, merge=True)
+
+def record_ticket_deleted(db, project_id, ticket, transaction=None):
+    """Take a deleted ticket off its developer's counters; pass the `transaction` that tombstones it."""
+    from google.cloud.firestore_v1.transforms import Increment
+    dev_id = ticket.get("assigned_dev_id")
+    if not dev_id:
+        return
+    hours = ticket.get("estimated_hours", 0) or 0
+    update = {
+        "dev_id": dev_id,
+        "total_tickets": Increment(-1),
+        "total_estimated_hours": Increment(-hours),
+        "updated_at": datetime.datetime.now(datetime.timezone.utc)
+    }
+    field = _status_field(ticket.get("status"))
+    if field:
+        update[field] = Increment(-1)
+    if ticket.get("status") == "completed":
+        update["completed_hours"] = Increment(-hours)
+    ref = workload_ref(db, project_id, dev_id)
+    if transaction is None:
+        doc_set(ref, update, merge=True)
+    else:
+        invalidate(ref.path)
+        transaction.set(ref, update, merge=True)
+
+def record_standup(db, project_id, dev_id, cycle_number, doc_id, timestamp):
+    """Point the developer's workload document at their latest standup; call in the standup's buffer."""
+    doc_set(workload_ref(db, project_id, dev_id), {
+        "dev_id": dev_id,
+        "last_standup": {"doc_id": doc_id, "cycle": cycle_number, "timestamp": timestamp},
+        "updated_at": datetime.datetime.now(datetime.timezone.utc)
+    }, merge=True)
+
+def workload_summary(aggregate, dev_id):
+    """The `analyze_developer_workload` report from a workload document (None: no tickets yet)."""
+    aggregate = aggregate or {}
+    total = aggregate.get("total_tickets", 0)
+    completed = aggregate.get("completed_tickets", 0)
+    todo = aggregate.get("todo_tickets", 0)
+    total_hours = aggregate.get("total_estimated_hours", 0)
+    completed_hours = aggregate.get("completed_hours", 0)
+    return {
+        "dev_id": dev_id,
+        "total_tickets": total,
+        "completed_tickets": completed,
+        "in_progress_tickets": aggregate.get("in_progress_tickets", 0),
+        "todo_tickets": todo,
+        "completion_rate": (completed / total * 100) if total > 0 else 0,
+        "total_estimated_hours": total_hours,
+        "completed_hours": completed_hours,
+        "hours_completion_rate": (completed_hours / total_hours * 100) if total_hours > 0 else 0,
+        "last_standup": aggregate.get("last_standup"),
+        "current_workload": "high" if todo > 3 else "medium" if todo > 1 else "low"
+    }
+
+def rebuild_workload_aggregates(project_id, db=None):
+    """
+    Recompute every developer's workload document from the tickets and standups,
+    for when the counters have drifted (failed writes, manual edits).
+
+    Returns:
+        Dict[str, dict]: The rebuilt documents keyed by dev id.
+    """
+    if db is None:
+        from agentic.utils.firebase_client import get_firestore
+        db = get_firestore()
+    project_ref = db.collection("projects").document(project_id)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    aggregates = {}
+
+    def aggregate_for(dev_id):
+        return aggregates.setdefault(dev_id, {
+            "dev_id": dev_id, "total_tickets": 0, "total_estimated_hours": 0, "completed_hours": 0,
+            **{_status_field(status): 0 for status in COUNTED_STATUSES}, "last_standup": None, "updated_at": now
+        })
+
+    for dev in project_ref.collection("dev_profiles").stream():
+        aggregate_for(dev.to_dict().get("id") or dev.id)
+    for ticket in (doc.to_dict() for doc in tickets_collection(db, project_id).stream()):
+        if not ticket.get("assigned_dev_id") or ticket.get("deleted"):
+            continue
+        aggregate = aggregate_for(ticket["assigned_dev_id"])
+        hours = ticket.get("estimated_hours", 0) or 0
+        aggregate["total_tickets"] += 1
+        aggregate["total_estimated_hours"] += hours
+        field = _status_field(ticket.get("status"))
+        if field:
+            aggregate[field] += 1
+        if ticket.get("status") == "completed":
+            aggregate["completed_hours"] += hours
+    for standup in project_ref.collection("standups").stream():
+        data = standup.to_dict()
+        if not data.get("dev_id"):
+            continue
+        aggregate = aggregate_for(data["dev_id"])
+        latest = aggregate["last_standup"]
+        if latest is None or (data.get("cycle", -1), str(data.get("timestamp"))) > (latest["cycle"], str(latest["timestamp"])):
+            aggregate["last_standup"] = {"doc_id": standup.id, "cycle": data.get("cycle", -1), "timestamp": data.get("timestamp")}
+
+    with write_buffer(db):
+        for dev_id, aggregate in aggregates.items():
+            doc_set(workload_ref(db, project_id, dev_id), aggregate)
+    return aggregates
+
+if __name__ == "__main__":
+    # python -m agentic.utils.workload_aggregates <project_id> [<project_id> ...]
+    for project_id in sys.argv[1:]:
+        rebuilt = rebuild_workload_aggregates(project_id)
+        print(f"Rebuilt workload aggregates for {len(rebuilt)} developers in {project_id}")
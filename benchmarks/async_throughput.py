@@ -0,0 +1,122 @@
+"""
+Throughput of the sync and async workflow graphs on simulated Firestore and LLM latency.
+
+Every project runs one full cycle (StoreProjectContext through ManageCycle). The sync
+graph handles projects one after another, as main.py does; the async graph runs them
+all concurrently on one event loop. Prints a JSON report.
+
+    python -m benchmarks.async_throughput --projects 200 --firestore-latency 0.02 --llm-latency 0.5
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeChatModel, FakeStore, install_fakes, seed_project, seed_standups
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--devs", type=int, default=5)
+    parser.add_argument("--sync-projects", type=int, default=None,
+                        help="Projects for the sync run (default: same as --projects); throughput is per project")
+    parser.add_argument("--firestore-latency", type=float, default=0.02, help="Seconds per simulated Firestore RPC")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds per simulated LLM call")
+    parser.add_argument("--verbose", action="store_true", help="Show the workflow's own log output")
+    return parser.parse_args()
+
+
+def make_state(project_id):
+    return {
+        "project_id": project_id,
+        "project_description": (
+            "Build a collaboration platform. It has real-time chat and video calls. "
+            "Teams manage work on Kanban boards. A bot collects and summarizes daily standups."
+        ),
+        "scrum_cycle": 0,
+        "done": False
+    }
+
+
+def prepare(store, prefix, count, devs):
+    project_ids = [f"{prefix}-{n}" for n in range(count)]
+    for project_id in project_ids:
+        seed_project(store, project_id, devs)
+        seed_standups(store, project_id, 0, devs)
+    return project_ids
+
+
+def run_sync(builder, project_ids):
+    start = time.perf_counter()
+    for project_id in project_ids:
+        builder.invoke(make_state(project_id))
+    return time.perf_counter() - start
+
+
+async def run_async(builder, project_ids):
+    start = time.perf_counter()
+    await asyncio.gather(*(builder.ainvoke(make_state(project_id)) for project_id in project_ids))
+    return time.perf_counter() - start
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("VECTOR_STORE_BACKEND", "local")
+    os.environ.setdefault("LOCAL_VECTOR_STORE_DIR", tempfile.mkdtemp(prefix="scrum-bench-vectors-"))
+    os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+    os.environ.setdefault("CHECKPOINT_PATH", os.path.join(tempfile.mkdtemp(prefix="scrum-bench-checkpoints-"), "checkpoints.sqlite"))
+
+    store = FakeStore(latency_s=args.firestore_latency)
+    install_fakes(store)
+    llm = FakeChatModel(latency_s=args.llm_latency)
+
+    import agent.agenticworkflow as workflow_module
+    workflow_module.load_model = lambda: llm
+    from agent.agenticworkflow import ScrumGraphBuilder
+    from agent.async_agenticworkflow import AsyncScrumGraphBuilder
+
+    sync_ids = prepare(store, "sync", args.sync_projects or args.projects, args.devs)
+    async_ids = prepare(store, "async", args.projects, args.devs)
+    sync_builder, async_builder = ScrumGraphBuilder(), AsyncScrumGraphBuilder()
+    sync_builder.build_graph()
+    async_builder.build_graph()
+
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        reads, writes, calls = store.reads, store.writes, llm.calls
+        sync_s = run_sync(sync_builder, sync_ids)
+        sync_counts = (store.reads - reads, store.writes - writes, llm.calls - calls)
+        reads, writes, calls = store.reads, store.writes, llm.calls
+        async_s = asyncio.run(run_async(async_builder, async_ids))
+        async_counts = (store.reads - reads, store.writes - writes, llm.calls - calls)
+
+    def report(count, seconds, counts):
+        return {
+            "projects": count,
+            "wall_time_s": round(seconds, 3),
+            "projects_per_s": round(count / seconds, 2),
+            "firestore_reads": counts[0],
+            "firestore_writes": counts[1],
+            "llm_calls": counts[2]
+        }
+
+    sync_report = report(len(sync_ids), sync_s, sync_counts)
+    async_report = report(len(async_ids), async_s, async_counts)
+    print(json.dumps({
+        "config": vars(args),
+        "sync": sync_report,
+        "async": async_report,
+        "speedup": round(async_report["projects_per_s"] / sync_report["projects_per_s"], 1)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,521 @@
+"""
+In-memory stand-ins for Firestore, the embedding model and the chat model, so the
+workflow can be benchmarked offline. Every fake simulates service latency with
+`time.sleep` (sync) or `asyncio.sleep` (async) and counts the calls it serves.
+
+`install_fakes()` must run before anything under `agent` or `agentic.tool` is imported.
+"""
+import asyncio
+import datetime
+import hashlib
+import json
+import operator
+import queue
+import re
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+from google.cloud.firestore_v1.transforms import SERVER_TIMESTAMP, Increment
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from agentic.utils.prompt_packer import count_tokens
+
+_OPERATORS = {
+    "==": operator.eq, "!=": operator.ne, ">": operator.gt, ">=": operator.ge,
+    "<": operator.lt, "<=": operator.le, "in": lambda value, options: value in options
+}
+
+
+class FakeStore:
+    """Documents keyed by path, shared by the sync and async clients, with RPC counters."""
+
+    def __init__(self, latency_s=0.0):
+        self.latency_s = latency_s
+        self.docs = {}
+        self.reads = 0
+        self.writes = 0
+        self.listeners = []
+        self.transaction_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def count(self, reads=0, writes=0):
+        with self._lock:
+            self.reads += reads
+            self.writes += writes
+
+    def apply(self, kind, path, data):
+        with self._lock:
+            current = self.docs.get(path) or {}
+            now = datetime.datetime.now(datetime.timezone.utc)
+            # Resolve Increment transforms against the stored values, and server timestamps to the commit time
+            data = {
+                field: current.get(field, 0) + value.value if isinstance(value, Increment)
+                else now if value is SERVER_TIMESTAMP else value
+                for field, value in data.items()
+            }
+            if kind == "update":
+                if path not in self.docs:
+                    raise KeyError(f"No document to update: {path}")
+                self.docs[path].update(data)
+            elif kind == "merge":
+                self.docs.setdefault(path, {}).update(data)
+            else:
+                self.docs[path] = dict(data)
+        self._changed(path)
+
+    def delete(self, path):
+        with self._lock:
+            self.docs.pop(path, None)
+        self._changed(path)
+
+    def _changed(self, path):
+        with self._lock:
+            listeners = list(self.listeners)
+        for listener in listeners:
+            listener.changed(path)
+
+    def matches(self, path, filters):
+        """The document at `path`, if it exists and passes `filters`, else None."""
+        with self._lock:
+            data = self.docs.get(path)
+            if data is None or not all(field in data and op(data[field], value) for field, op, value in filters):
+                return None
+            return dict(data)
+
+    def run_query(self, path, filters, order, limit):
+        """The matching (path, data) rows, and the time they were read at, like a query's `read_time`."""
+        with self._lock:
+            read_time = datetime.datetime.now(datetime.timezone.utc)
+            rows = [
+                (doc_path, dict(data)) for doc_path, data in self.docs.items()
+                if doc_path.rsplit("/", 1)[0] == path
+                and all(field in data and op(data[field], value) for field, op, value in filters)
+            ]
+        if order:
+            rows.sort(key=lambda row: row[1].get(order[0]), reverse=order[1] == "DESCENDING")
+        return (rows[:limit] if limit else rows), read_time
+
+
+class FakeSnapshot:
+    def __init__(self, reference, data, read_time=None):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self.exists = data is not None
+        self.read_time = read_time
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class _DocumentBase:
+    def __init__(self, client, path):
+        self._client = client
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name):
+        return self._client.collection(f"{self.path}/{name}")
+
+
+class _QueryBase:
+    def __init__(self, client, path, filters=(), order=None, limit=None):
+        self._client = client
+        self._path = tuple(path.split("/"))
+        self._filters = filters
+        self._order = order
+        self._limit = limit
+
+    def _derive(self, **changes):
+        args = {"filters": self._filters, "order": self._order, "limit": self._limit, **changes}
+        return type(self)(self._client, "/".join(self._path), **args)
+
+    def where(self, field, op, value):
+        return self._derive(filters=self._filters + ((field, _OPERATORS[op], value),))
+
+    def order_by(self, field, direction="ASCENDING"):
+        return self._derive(order=(field, direction))
+
+    def limit(self, count):
+        return self._derive(limit=count)
+
+    def document(self, doc_id):
+        return self._client.document(f"{'/'.join(self._path)}/{doc_id}")
+
+    def _rows(self):
+        rows, read_time = self._client.store.run_query("/".join(self._path), self._filters, self._order, self._limit)
+        self._client.store.count(reads=max(1, len(rows)))
+        return [FakeSnapshot(self._client.document(path), data, read_time) for path, data in rows]
+
+
+class FakeDocument(_DocumentBase):
+    def get(self, transaction=None):
+        time.sleep(self._client.store.latency_s)
+        self._client.store.count(reads=1)
+        return FakeSnapshot(self, self._client.store.docs.get(self.path))
+
+    def set(self, data, merge=False):
+        time.sleep(self._client.store.latency_s)
+        self._client.store.count(writes=1)
+        self._client.store.apply("merge" if merge else "set", self.path, data)
+
+    def update(self, data):
+        time.sleep(self._client.store.latency_s)
+        self._client.store.count(writes=1)
+        self._client.store.apply("update", self.path, data)
+
+    def delete(self):
+        time.sleep(self._client.store.latency_s)
+        self._client.store.count(writes=1)
+        self._client.store.delete(self.path)
+
+
+class FakeChange:
+    def __init__(self, kind, document):
+        self.type = types.SimpleNamespace(name=kind)
+        self.document = document
+
+
+class FakeWatch:
+    """
+    Snapshot listener on a `FakeQuery`. Like Firestore's, it calls back on its own
+    thread: first the initial snapshot (after the store latency), then each change
+    to a document of the queried collection, in write order.
+    """
+
+    def __init__(self, query, callback):
+        self._query = query
+        self._callback = callback
+        self._changes = queue.Queue()
+        self._matched = {}  # path -> snapshot
+        store = query._client.store
+        with store._lock:
+            store.listeners.append(self)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def changed(self, path):
+        if path.rsplit("/", 1)[0] == "/".join(self._query._path):
+            self._changes.put(path)
+
+    def _deliver(self, changes):
+        self._callback(list(self._matched.values()), changes, datetime.datetime.now(datetime.timezone.utc))
+
+    def _run(self):
+        store = self._query._client.store
+        time.sleep(store.latency_s)
+        snapshots = self._query._rows()
+        self._matched = {snapshot.reference.path: snapshot for snapshot in snapshots}
+        self._deliver([FakeChange("ADDED", snapshot) for snapshot in snapshots])
+        for path in iter(self._changes.get, None):
+            data = store.matches(path, self._query._filters)
+            if data is not None:
+                kind = "MODIFIED" if path in self._matched else "ADDED"
+                snapshot = self._matched[path] = FakeSnapshot(self._query._client.document(path), data)
+            elif path in self._matched:
+                kind, snapshot = "REMOVED", self._matched.pop(path)
+            else:
+                continue
+            self._deliver([FakeChange(kind, snapshot)])
+
+    def unsubscribe(self):
+        store = self._query._client.store
+        with store._lock:
+            if self in store.listeners:
+                store.listeners.remove(self)
+        self._changes.put(None)
+
+
+class FakeQuery(_QueryBase):
+    def stream(self):
+        time.sleep(self._client.store.latency_s)
+        return iter(self._rows())
+
+    def on_snapshot(self, callback):
+        return FakeWatch(self, callback)
+
+
+class FakeBatch:
+    def __init__(self, client):
+        self._client = client
+        self._ops = []
+
+    def set(self, ref, data, merge=False):
+        self._ops.append(("merge" if merge else "set", ref.path, dict(data)))
+
+    def update(self, ref, data):
+        self._ops.append(("update", ref.path, dict(data)))
+
+    def _apply(self):
+        self._client.store.count(writes=len(self._ops))
+        for kind, path, data in self._ops:
+            self._client.store.apply(kind, path, data)
+
+    def commit(self):
+        time.sleep(self._client.store.latency_s)
+        self._apply()
+
+
+class FakeTransaction(FakeBatch):
+    """
+    Works with `google.cloud.firestore.transactional`. Transactions on a store run
+    one at a time, from begin to commit or rollback, like Firestore's locks on the
+    documents they read; writes are applied at commit.
+    """
+
+    _read_only = False
+    _max_attempts = 5
+    _ids = iter(range(1, 1 << 62))
+
+    def __init__(self, client):
+        super().__init__(client)
+        self._id = None
+
+    def _begin(self, retry_id=None):
+        self._client.store.transaction_lock.acquire()
+        self._id = str(next(self._ids)).encode()
+        self._ops = []
+
+    def _clean_up(self):
+        self._ops = []
+        if self._id is not None:
+            self._id = None
+            self._client.store.transaction_lock.release()
+
+    def _commit(self):
+        time.sleep(self._client.store.latency_s)
+        self._apply()
+        self._clean_up()
+
+    def _rollback(self):
+        self._clean_up()
+
+
+class FakeFirestore:
+    """Sync client: `collection()`, `document()`, `batch()` and `transaction()`, like `google.cloud.firestore.Client`."""
+
+    document_class = FakeDocument
+    query_class = FakeQuery
+    batch_class = FakeBatch
+
+    def __init__(self, store):
+        self.store = store
+
+    def collection(self, path):
+        return self.query_class(self, path)
+
+    def document(self, path):
+        return self.document_class(self, path)
+
+    def batch(self):
+        return self.batch_class(self)
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+
+class FakeAsyncDocument(_DocumentBase):
+    async def get(self):
+        await asyncio.sleep(self._client.store.latency_s)
+        self._client.store.count(reads=1)
+        return FakeSnapshot(self, self._client.store.docs.get(self.path))
+
+    async def set(self, data, merge=False):
+        await asyncio.sleep(self._client.store.latency_s)
+        self._client.store.count(writes=1)
+        self._client.store.apply("merge" if merge else "set", self.path, data)
+
+    async def update(self, data):
+        await asyncio.sleep(self._client.store.latency_s)
+        self._client.store.count(writes=1)
+        self._client.store.apply("update", self.path, data)
+
+
+class FakeAsyncQuery(_QueryBase):
+    async def stream(self):
+        await asyncio.sleep(self._client.store.latency_s)
+        for snapshot in self._rows():
+            yield snapshot
+
+
+class FakeAsyncBatch(FakeBatch):
+    async def commit(self):
+        await asyncio.sleep(self._client.store.latency_s)
+        self._apply()
+
+
+class FakeAsyncFirestore(FakeFirestore):
+    """Async client over the same `FakeStore`, like `google.cloud.firestore.AsyncClient`."""
+
+    document_class = FakeAsyncDocument
+    query_class = FakeAsyncQuery
+    batch_class = FakeAsyncBatch
+
+
+class FakeChatModel:
+    """
+    Chat model with fixed per-call latency. Ticket prompts get a JSON ticket map for
+    every dev id in the prompt; any other prompt gets a canned summary.
+    """
+
+    def __init__(self, latency_s=0.0, chunks=8, tickets_per_dev=2):
+        self.latency_s = latency_s
+        self.chunks = chunks
+        self.tickets_per_dev = tickets_per_dev
+        self.calls = 0
+        self.prompt_chars = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def bind_tools(self, tools=None, **kwargs):
+        return self
+
+    def _respond(self, prompt):
+        text = prompt if isinstance(prompt, str) else str(prompt)
+        content = self._content(text)
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += len(text)
+            self.prompt_tokens += count_tokens(text)
+            self.completion_tokens += count_tokens(content)
+        return content
+
+    def _content(self, text):
+        if "mapping dev_id to a list of tickets" in text:
+            dev_ids = list(dict.fromkeys(re.findall(r'"id": "([^"]+)"', text)))
+            return json.dumps({
+                dev_id: [
+                    {"title": f"Task {n} for {dev_id}", "description": "Generated offline",
+                     "priority": "medium", "estimated_hours": 4}
+                    for n in range(self.tickets_per_dev)
+                ]
+                for dev_id in dev_ids
+            })
+        return "Progress was steady. No blockers reported. Next steps: continue the assigned tickets."
+
+    def _split(self, content):
+        size = max(1, -(-len(content) // self.chunks))
+        return [content[i:i + size] for i in range(0, len(content), size)]
+
+    def invoke(self, prompt, config=None, **kwargs):
+        time.sleep(self.latency_s)
+        return AIMessage(content=self._respond(prompt))
+
+    def stream(self, prompt, config=None, **kwargs):
+        content = self._respond(prompt)
+        for part in self._split(content):
+            time.sleep(self.latency_s / self.chunks)
+            yield AIMessageChunk(content=part)
+
+    async def ainvoke(self, prompt, config=None, **kwargs):
+        await asyncio.sleep(self.latency_s)
+        return AIMessage(content=self._respond(prompt))
+
+    async def astream(self, prompt, config=None, **kwargs):
+        content = self._respond(prompt)
+        for part in self._split(content):
+            await asyncio.sleep(self.latency_s / self.chunks)
+            yield AIMessageChunk(content=part)
+
+
+class FakeEmbedder:
+    """Deterministic hash-seeded unit vectors; no model download."""
+
+    def __init__(self, dimension=64):
+        self.dimension = dimension
+
+    def embed_query(self, text):
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:4], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimension).astype(np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+class HashingEmbedder:
+    """
+    Feature-hashed word and character-trigram vectors: texts that share words or
+    word pieces land close together, so retrieval quality can be measured offline.
+    `latency_s` simulates the model's per-call cost.
+    """
+
+    def __init__(self, dimension=384, latency_s=0.0):
+        self.dimension = dimension
+        self.latency_s = latency_s
+        self.calls = 0
+
+    def _features(self, text):
+        words = re.findall(r"\w+", text.lower())
+        for word in words:
+            yield word, 1.0
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                yield padded[i:i + 3], 0.5
+
+    def embed_query(self, text):
+        self.calls += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for feature, weight in self._features(text):
+            digest = hashlib.md5(feature.encode("utf-8")).digest()
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[int.from_bytes(digest[:4], "little") % self.dimension] += sign * weight
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+def install_fakes(store, embedder=None):
+    """
+    Register fake `agentic.utils.firebase_client` and `agentic.utils.embedding`
+    modules backed by `store`, so no credentials or model downloads are needed.
+
+    Returns:
+        Tuple[FakeFirestore, FakeAsyncFirestore]: The sync and async clients.
+    """
+    db, async_db = FakeFirestore(store), FakeAsyncFirestore(store)
+    embedder = embedder or FakeEmbedder()
+
+    firebase_client = types.ModuleType("agentic.utils.firebase_client")
+    firebase_client.db = db
+    firebase_client.get_firestore = lambda: db
+    firebase_client.get_async_firestore = lambda: async_db
+    sys.modules["agentic.utils.firebase_client"] = firebase_client
+
+    embedding = types.ModuleType("agentic.utils.embedding")
+    embedding.EMBEDDING_MODEL_NAME = f"fake-embedder-{embedder.dimension}"
+    embedding.get_embedder = lambda: embedder
+    embedding.embed_documents = lambda docs: [
+        np.asarray(v, dtype=np.float32) for v in embedder.embed_documents([d.page_content for d in docs])
+    ]
+    sys.modules["agentic.utils.embedding"] = embedding
+    return db, async_db
+
+
+def seed_project(store, project_id, dev_count):
+    """Create a project document with `dev_count` developer profiles."""
+    store.docs[f"projects/{project_id}"] = {"id": project_id, "status": "active"}
+    skills = ["Python", "React", "Firebase", "FastAPI", "CSS", "TypeScript", "Figma", "WebRTC"]
+    for n in range(dev_count):
+        dev_id = f"dev{n}"
+        store.docs[f"projects/{project_id}/dev_profiles/{dev_id}"] = {
+            "id": dev_id, "name": f"Developer {n}", "role": "Engineer",
+            "tech": [skills[n % len(skills)], skills[(n + 3) % len(skills)]], "experience_years": 1 + n % 6
+        }
+
+
+def seed_standups(store, project_id, cycle, dev_count):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for n in range(dev_count):
+        store.docs[f"projects/{project_id}/standups/dev{n}_cycle_{cycle}"] = {
+            "dev_id": f"dev{n}", "cycle": cycle, "status": "completed", "updated_at": now,
+            "text": "Yesterday I worked on my assigned tickets. Today I will continue. No blockers."
+        }
@@ -0,0 +1,110 @@
+"""
+Import-time budget check for the workflow's entry points.
+
+Imports each target in a fresh interpreter under `python -X importtime`, takes the
+cumulative time of the target module (median over --repeat runs) and fails when it
+exceeds its budget, or when a module that should be deferred until first use
+(Firebase, provider SDKs, embeddings, langgraph) was imported eagerly. Prints the
+report as JSON; exits 1 on any violation, so it can gate CI.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget benchmarks/import_budget.json --repeat 5
+    python -m benchmarks.import_time --target agent.agenticworkflow --budget-ms 1500
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET = os.path.join(ROOT, "benchmarks", "import_budget.json")
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", default=DEFAULT_BUDGET, help="JSON file with per-target budgets and deferred modules")
+    parser.add_argument("--target", action="append", help="Module to import (repeatable); defaults to the budget file's targets")
+    parser.add_argument("--budget-ms", type=float, help="Budget for every target, overriding the budget file")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per target; the median is reported")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list per target")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args()
+
+
+def load_budget(path):
+    if not path or not os.path.exists(path):
+        return {"targets": {}, "deferred_modules": []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def import_profile(target):
+    """
+    Import `target` in a new interpreter with `-X importtime`.
+
+    Returns:
+        Dict[str, tuple]: Module name -> (self µs, cumulative µs, nesting depth).
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    profile = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            profile[name] = (int(own), int(cumulative), (len(indent) - 1) // 2)
+    return profile
+
+
+def measure(target, repeat, deferred, top):
+    runs = [import_profile(target) for _ in range(repeat)]
+    totals = [run[target][1] / 1000 for run in runs if target in run]
+    last = runs[-1]
+    # The target's direct dependencies (one level below it) show where the time goes
+    slowest = sorted(((name, cumulative / 1000) for name, (_, cumulative, depth) in last.items() if depth == 1),
+                     key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "import_ms": round(statistics.median(totals), 1),
+        "runs_ms": [round(ms, 1) for ms in totals],
+        "modules": len(last),
+        "eager_deferred_modules": sorted(m for m in deferred if m in last),
+        "slowest_imports_ms": [[name, round(ms, 1)] for name, ms in slowest]
+    }
+
+
+def main():
+    args = parse_args()
+    budget = load_budget(args.budget)
+    targets = args.target or list(budget.get("targets", {})) or ["agent.agenticworkflow"]
+    deferred = budget.get("deferred_modules", [])
+
+    report = {"python": sys.version.split()[0], "targets": {}, "violations": []}
+    for target in targets:
+        stats = measure(target, max(1, args.repeat), deferred, args.top)
+        limit = args.budget_ms if args.budget_ms is not None else budget.get("targets", {}).get(target)
+        stats["budget_ms"] = limit
+        report["targets"][target] = stats
+        if limit is not None and stats["import_ms"] > limit:
+            report["violations"].append(f"{target}: import took {stats['import_ms']} ms, budget {limit} ms")
+        for module in stats["eager_deferred_modules"]:
+            report["violations"].append(f"{target}: imports {module} eagerly")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    print(json.dumps(report, indent=2, sort_keys=True))
+    sys.exit(1 if report["violations"] else 0)
+
+
+if __name__ == "__main__":
+    main()
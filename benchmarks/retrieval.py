@@ -0,0 +1,143 @@
+"""
+Retrieval quality and latency benchmark on a small labeled spec, fully offline.
+
+Chunks benchmarks/retrieval_labels.json's document (plus optional distractor
+sections), indexes it in a local vector store and asks each labeled query in
+vector-only, BM25-only and hybrid mode. A hit is a chunk from the query's labeled
+section. Reports recall@k (queries with a hit in the top k), MRR, and search
+latency with a cold and a warm query-embedding cache, as JSON.
+
+    python -m benchmarks.retrieval
+    python -m benchmarks.retrieval --chunk-tokens 48 --distractors 500 --embed-latency 0.02
+    python -m benchmarks.retrieval --embedder model   # the configured HuggingFace model
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import HashingEmbedder
+
+DEFAULT_LABELS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "retrieval_labels.json")
+DISTRACTOR_WORDS = (
+    "ledger warehouse inventory shipment courier pallet freight invoice tariff customs supplier forklift "
+    "barcode dock manifest route depot carrier parcel tracking refund catalogue vendor procurement audit"
+).split()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--labels", default=DEFAULT_LABELS, help="JSON with `document` (markdown) and labeled `queries`")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5], help="Cutoffs for recall@k")
+    parser.add_argument("--chunk-tokens", type=int, default=48, help="Chunk window; small windows give several chunks per section")
+    parser.add_argument("--overlap-tokens", type=int, default=8)
+    parser.add_argument("--distractors", type=int, default=0, help="Unrelated sections added to the index")
+    parser.add_argument("--alpha", type=float, default=None, help="Hybrid vector weight (default RETRIEVAL_HYBRID_ALPHA)")
+    parser.add_argument("--embedder", choices=["hashing", "model"], default="hashing")
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="Simulated seconds per query embedding (hashing embedder)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    return parser.parse_args()
+
+
+def distractor_sections(count, seed):
+    rng = random.Random(seed)
+    sections = []
+    for n in range(count):
+        sentences = [" ".join(rng.choices(DISTRACTOR_WORDS, k=rng.randint(8, 16))).capitalize() + "." for _ in range(4)]
+        sections.append(f"## Operations Note {n}\n\n" + " ".join(sentences) + "\n")
+    return sections
+
+
+def latency_stats(seconds):
+    ms = np.asarray(seconds) * 1000
+    return {"p50_ms": round(float(np.percentile(ms, 50)), 3), "p95_ms": round(float(np.percentile(ms, 95)), 3),
+            "mean_ms": round(float(ms.mean()), 3)}
+
+
+def evaluate(engine, queries, ks, alpha):
+    """Ask every query once with a cold cache and once warm; score the warm results."""
+    top_k = max(ks)
+    engine.query_cache.clear()
+    cold, warm, hits, reciprocal_ranks = [], [], {k: 0 for k in ks}, []
+    for item in queries:
+        start = time.perf_counter()
+        engine.search(item["query"], k=top_k, alpha=alpha)
+        cold.append(time.perf_counter() - start)
+    for item in queries:
+        start = time.perf_counter()
+        results = engine.search(item["query"], k=top_k, alpha=alpha)
+        warm.append(time.perf_counter() - start)
+        rank = next((i + 1 for i, doc in enumerate(results)
+                     if doc.metadata.get("section", "").split(" > ")[-1] == item["section"]), None)
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+        for k in ks:
+            hits[k] += rank is not None and rank <= k
+    return {
+        **{f"recall@{k}": round(hits[k] / len(queries), 3) for k in ks},
+        "mrr": round(sum(reciprocal_ranks) / len(queries), 3),
+        "latency_cold": latency_stats(cold),
+        "latency_warm": latency_stats(warm)
+    }
+
+
+def run(args):
+    os.environ.setdefault("VECTOR_STORE_BACKEND", "local")
+    from agentic.utils.retrieval import RETRIEVAL_HYBRID_ALPHA, QueryEmbeddingCache, RetrievalEngine
+    from agentic.utils.text_splitter import chunk_text
+    from agentic.utils.vector_index import apply_reindex, plan_reindex
+    from agentic.utils.vector_store import LocalVectorStore
+
+    with open(args.labels) as f:
+        labels = json.load(f)
+    document = labels["document"] + "\n" + "\n".join(distractor_sections(args.distractors, args.seed))
+    docs = list(chunk_text(document, max_tokens=args.chunk_tokens, overlap_tokens=args.overlap_tokens))
+
+    if args.embedder == "model":
+        from agentic.utils.embedding import EMBEDDING_MODEL_NAME, embed_documents, get_embedder
+        embedder, model_name, embed = get_embedder(), EMBEDDING_MODEL_NAME, embed_documents
+    else:
+        embedder = HashingEmbedder()
+        model_name = "hashing"
+        embed = lambda batch: [np.asarray(v, dtype=np.float32) for v in embedder.embed_documents([d.page_content for d in batch])]
+
+    namespace = "retrieval-bench"
+    store = LocalVectorStore(directory=tempfile.mkdtemp(prefix="scrum-bench-retrieval-"))
+    start = time.perf_counter()
+    apply_reindex(plan_reindex(None, namespace, docs, model_name), store, namespace, embed)
+    index_seconds = time.perf_counter() - start
+
+    engine = RetrievalEngine(namespace, store=store, embedder=embedder, embedding_model=model_name,
+                             query_cache=QueryEmbeddingCache())
+    engine.index_documents(docs)
+    if args.embedder == "hashing":
+        embedder.latency_s = args.embed_latency
+
+    hybrid_alpha = RETRIEVAL_HYBRID_ALPHA if args.alpha is None else args.alpha
+    modes = {"vector": 1.0, "bm25": 0.0, f"hybrid_alpha_{hybrid_alpha}": hybrid_alpha}
+    config = {key: value for key, value in vars(args).items() if key not in ("labels", "output")}
+    return {
+        "config": config,
+        "corpus": {"chunks": len(docs), "queries": len(labels["queries"]), "index_time_s": round(index_seconds, 3)},
+        "modes": {name: evaluate(engine, labels["queries"], args.k, alpha) for name, alpha in modes.items()}
+    }
+
+
+def main():
+    args = parse_args()
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    print(json.dumps(report, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+End-to-end workflow benchmark on a synthetic scrum workload, fully offline.
+
+Drives `ScrumGraphBuilder` (or `AsyncScrumGraphBuilder` with --mode async) through
+C cycles for N projects of D developers, against the fake Firestore, local vector
+store and fake chat model, each with configurable latency. Between cycles the
+developers move tickets along and submit standups, as in main.py; that setup is
+not measured. Reports per-node p50/p95 latency, Firestore reads and writes, prompt
+tokens and peak RSS as JSON, which can be saved and compared against a baseline.
+
+    python -m benchmarks.scrum_e2e --projects 10 --devs 8 --cycles 5 --output bench.json
+    python -m benchmarks.scrum_e2e --projects 10 --devs 8 --cycles 5 --compare bench.json
+"""
+import argparse
+import asyncio
+import contextlib
+import functools
+import inspect
+import io
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fakes import FakeChatModel, FakeStore, install_fakes
+from benchmarks.workload import SyntheticWorkload
+
+NODES = {
+    "store_project_context_node": "StoreProjectContext",
+    "gather_context_node": "GatherContext",
+    "generate_tickets_node": "GenerateTickets",
+    "wait_for_standups_node": "WaitForStandups",
+    "summarize_standups_node": "SummarizeStandups",
+    "manage_cycle_node": "ManageCycle"
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--devs", type=int, default=5)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync",
+                        help="sync runs projects one after another; async runs each cycle's projects concurrently")
+    parser.add_argument("--firestore-latency", type=float, default=0.002, help="Seconds per simulated Firestore RPC")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds per simulated LLM call")
+    parser.add_argument("--tickets-per-dev", type=int, default=2, help="Tickets the fake model proposes per developer")
+    parser.add_argument("--completion-rate", type=float, default=0.5, help="Chance an open ticket advances each cycle")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to diff the totals and node latencies against")
+    parser.add_argument("--metrics", action="store_true", help="Include the agentic.logger metrics snapshot in the report")
+    parser.add_argument("--verbose", action="store_true", help="Show the workflow's own log output")
+    return parser.parse_args()
+
+
+class Recorder:
+    """Per-node wall times, plus Firestore and LLM counters when nodes run one at a time."""
+
+    def __init__(self, store, llm, attribute_counts):
+        self.store = store
+        self.llm = llm
+        self.attribute_counts = attribute_counts
+        self.durations = {name: [] for name in NODES.values()}
+        self.counts = {name: {"firestore_reads": 0, "firestore_writes": 0, "prompt_tokens": 0} for name in NODES.values()}
+
+    def _counters(self):
+        return self.store.reads, self.store.writes, self.llm.prompt_tokens
+
+    def _record(self, name, seconds, before):
+        self.durations[name].append(seconds)
+        if self.attribute_counts:
+            after = self._counters()
+            for field, start, end in zip(("firestore_reads", "firestore_writes", "prompt_tokens"), before, after):
+                self.counts[name][field] += end - start
+
+    def instrument(self, builder):
+        """Wrap the builder's node methods; call before `build_graph()`."""
+        for attribute, name in NODES.items():
+            node = getattr(builder, attribute)
+            if inspect.iscoroutinefunction(node):
+                async def timed(state, node=node, name=name):
+                    before, start = self._counters(), time.perf_counter()
+                    try:
+                        return await node(state)
+                    finally:
+                        self._record(name, time.perf_counter() - start, before)
+            else:
+                def timed(state, node=node, name=name):
+                    before, start = self._counters(), time.perf_counter()
+                    try:
+                        return node(state)
+                    finally:
+                        self._record(name, time.perf_counter() - start, before)
+            setattr(builder, attribute, functools.wraps(node)(timed))
+
+    def report(self):
+        nodes = {}
+        for name, durations in self.durations.items():
+            if not durations:
+                continue
+            ms = np.asarray(durations) * 1000
+            nodes[name] = {
+                "calls": len(durations),
+                "p50_ms": round(float(np.percentile(ms, 50)), 3),
+                "p95_ms": round(float(np.percentile(ms, 95)), 3),
+                "mean_ms": round(float(ms.mean()), 3),
+                **(self.counts[name] if self.attribute_counts else {})
+            }
+        return nodes
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def prepare_cycle(db, workload, store, project_id, cycle, completion_rate):
+    """Developers move tickets along and submit this cycle's standups (unmeasured setup)."""
+    from agentic.tool.firebase_tool import update_ticket_status
+    from agentic.utils.firestore_batch import doc_set, write_buffer
+    from agentic.utils.workload_aggregates import record_standup
+
+    open_tickets = workload.open_tickets(store, project_id)
+    for ticket_id, status in workload.progress(project_id, open_tickets, completion_rate):
+        update_ticket_status.invoke({"project_id": project_id, "ticket_id": ticket_id, "status": status})
+    with write_buffer(db):
+        for standup in workload.standups(project_id, cycle, workload.open_tickets(store, project_id)):
+            doc_id = f"{standup['dev_id']}_cycle_{cycle}"
+            doc_set(db.collection("projects").document(project_id).collection("standups").document(doc_id), standup)
+            record_standup(db, project_id, standup["dev_id"], cycle, doc_id, standup["timestamp"])
+
+
+def cycle_state(workload, project_id, cycle):
+    if cycle == 0:
+        return workload.initial_state(project_id)
+    # Later cycles skip StoreProjectContext, as in main.py
+    return {**workload.cycle_state(project_id, cycle), "next_node": "GatherContext"}
+
+
+def run(args):
+    os.environ.setdefault("VECTOR_STORE_BACKEND", "local")
+    os.environ.setdefault("LOCAL_VECTOR_STORE_DIR", tempfile.mkdtemp(prefix="scrum-bench-vectors-"))
+    os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+    os.environ.setdefault("CHECKPOINT_PATH", os.path.join(tempfile.mkdtemp(prefix="scrum-bench-checkpoints-"), "checkpoints.sqlite"))
+
+    store = FakeStore(latency_s=args.firestore_latency)
+    db, _ = install_fakes(store)
+    llm = FakeChatModel(latency_s=args.llm_latency, tickets_per_dev=args.tickets_per_dev)
+
+    import agent.agenticworkflow as workflow_module
+    from agentic.logger.llm_metrics import MeteredChatModel
+    from agentic.logger.metrics import get_metrics
+    workflow_module.load_model = lambda: MeteredChatModel(llm)
+    if args.mode == "async":
+        from agent.async_agenticworkflow import AsyncScrumGraphBuilder as Builder
+    else:
+        from agent.agenticworkflow import ScrumGraphBuilder as Builder
+
+    workload = SyntheticWorkload(args.projects, args.devs, seed=args.seed)
+    workload.seed(store)
+    recorder = Recorder(store, llm, attribute_counts=args.mode == "sync")
+
+    totals = {"wall_time_s": 0.0, "firestore_reads": 0, "firestore_writes": 0,
+              "llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    cycles = []
+    with contextlib.ExitStack() as output:
+        if not args.verbose:
+            output.enter_context(contextlib.redirect_stdout(io.StringIO()))
+            output.enter_context(contextlib.redirect_stderr(io.StringIO()))
+        builder = Builder()
+        recorder.instrument(builder)
+        builder.build_graph()
+        for cycle in range(args.cycles):
+            for project_id in workload.project_ids:
+                prepare_cycle(db, workload, store, project_id, cycle, args.completion_rate)
+            before = (store.reads, store.writes, llm.calls, llm.prompt_tokens, llm.completion_tokens)
+            start = time.perf_counter()
+            if args.mode == "async":
+                async def run_cycle():
+                    await asyncio.gather(*(builder.ainvoke(cycle_state(workload, p, cycle)) for p in workload.project_ids))
+                asyncio.run(run_cycle())
+            else:
+                for project_id in workload.project_ids:
+                    builder.invoke(cycle_state(workload, project_id, cycle))
+            seconds = time.perf_counter() - start
+            after = (store.reads, store.writes, llm.calls, llm.prompt_tokens, llm.completion_tokens)
+            delta = dict(zip(("firestore_reads", "firestore_writes", "llm_calls", "prompt_tokens", "completion_tokens"),
+                             (end - begin for begin, end in zip(before, after))))
+            cycles.append({"cycle": cycle, "wall_time_s": round(seconds, 3), **delta})
+            totals["wall_time_s"] += seconds
+            for field, value in delta.items():
+                totals[field] += value
+
+    totals["wall_time_s"] = round(totals["wall_time_s"], 3)
+    totals["project_cycles_per_s"] = round(args.projects * args.cycles / totals["wall_time_s"], 2)
+    totals["peak_rss_mb"] = peak_rss_mb()
+    config = {key: value for key, value in vars(args).items() if key not in ("output", "compare", "verbose", "metrics")}
+    report = {"config": config, "totals": totals, "nodes": recorder.report(), "cycles": cycles}
+    if args.metrics:
+        report["metrics"] = get_metrics().snapshot()
+    return report
+
+
+def compare(report, baseline):
+    """Relative change of every total and node latency against a baseline report (positive: higher now)."""
+    def change(now, then):
+        if not isinstance(now, (int, float)) or not isinstance(then, (int, float)):
+            return None
+        return round((now - then) / then * 100, 1) if then else None
+
+    diff = {"totals": {}, "nodes": {}}
+    for field, value in report["totals"].items():
+        diff["totals"][field] = {"baseline": baseline["totals"].get(field), "current": value,
+                                 "change_pct": change(value, baseline["totals"].get(field))}
+    for name, stats in report["nodes"].items():
+        base = baseline.get("nodes", {}).get(name, {})
+        diff["nodes"][name] = {
+            field: {"baseline": base.get(field), "current": stats[field], "change_pct": change(stats[field], base.get(field))}
+            for field in ("p50_ms", "p95_ms")
+        }
+    if baseline.get("config") != report["config"]:
+        diff["warning"] = "Baseline was run with a different configuration"
+    return diff
+
+
+def main():
+    args = parse_args()
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            report["comparison"] = compare(report, json.load(f))
+    print(json.dumps(report, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
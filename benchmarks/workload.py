@@ -0,0 +1,135 @@
+"""
+Synthetic scrum workloads: `create_sample_dev_profiles` and `insert_sample_standups`
+from main.py, scaled to N projects x D developers x C cycles. Generation is
+seeded, so the same arguments always produce the same data.
+"""
+import datetime
+import random
+
+ROLES = {
+    "Frontend Developer": ["React", "TypeScript", "Next.js", "CSS", "Tailwind CSS"],
+    "Backend Developer": ["Python", "FastAPI", "Firebase", "SQL", "Docker"],
+    "Designer": ["UI/UX", "Figma", "CSS"],
+    "Mobile Developer": ["Kotlin", "Swift", "React Native"],
+    "DevOps Engineer": ["Docker", "Kubernetes", "Google Cloud", "GitHub Actions"],
+    "Realtime Engineer": ["WebRTC", "WebSockets", "Node.js"]
+}
+NAMES = ["Alice", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi", "Ivan", "Judy", "Mallory", "Niaj"]
+FEATURES = [
+    "User registration and authentication (Google, GitHub OAuth)",
+    "Team creation and invitation system",
+    "Real-time chat rooms and video calls (WebRTC)",
+    "Kanban board for project/task management",
+    "Automated daily standup bot (collects, summarizes, posts to channel)",
+    "GitHub integration: show open PRs/issues, link commits to tasks",
+    "Mood tracking: daily anonymous survey, team dashboard",
+    "Responsive UI/UX for desktop and mobile",
+    "Notification center with email and push delivery",
+    "Admin dashboard with usage analytics",
+    "Audit log and data export",
+    "Role-based access control for workspaces"
+]
+BLOCKERS = ["No blockers.", "Waiting on API credentials.", "Blocked by a failing CI pipeline.",
+            "Need design review before continuing.", "Flaky staging environment."]
+
+
+def dev_profiles(devs, rng):
+    """`devs` developer profiles shaped like `create_sample_dev_profiles()`."""
+    profiles = []
+    roles = list(ROLES)
+    for n in range(devs):
+        role = roles[n % len(roles)]
+        profiles.append({
+            "id": f"dev{n}",
+            "name": f"{NAMES[n % len(NAMES)]} {n}",
+            "tech": rng.sample(ROLES[role], min(3, len(ROLES[role]))),
+            "role": role,
+            "experience_years": rng.randint(1, 10)
+        })
+    return profiles
+
+
+def project_description(project_id, rng):
+    """A main.py-style project description with a random subset of features."""
+    features = rng.sample(FEATURES, rng.randint(5, len(FEATURES)))
+    lines = [
+        f"Project Title: Collaboration Platform {project_id}",
+        "",
+        "Project Summary:",
+        "Build a web-based platform to help distributed software teams collaborate efficiently.",
+        "",
+        "Features:"
+    ]
+    lines += [f"{n}. {feature}" for n, feature in enumerate(features, 1)]
+    lines += ["", "Tech Stack:", "- Frontend: React, Next.js, Tailwind CSS", "- Backend: FastAPI, Firebase Firestore"]
+    return "\n".join(lines)
+
+
+def standups(cycle, profiles, rng, open_tickets=None):
+    """One `insert_sample_standups()`-style standup per developer, mentioning their open tickets."""
+    open_tickets = open_tickets or {}
+    now = datetime.datetime.now(datetime.timezone.utc)
+    result = []
+    for dev in profiles:
+        titles = [ticket.get("title", "") for ticket in open_tickets.get(dev["id"], [])[:3]]
+        worked_on = ", ".join(titles) or "my assigned tickets"
+        result.append({
+            "dev_id": dev["id"],
+            "cycle": cycle,
+            "text": f"Yesterday I worked on {worked_on}. Today I will continue. {rng.choice(BLOCKERS)}",
+            "timestamp": now,
+            "updated_at": now,
+            "status": "completed"
+        })
+    return result
+
+
+class SyntheticWorkload:
+    """
+    Seeds projects straight into a `FakeStore` (setup is not measured) and produces
+    each cycle's standups and ticket progress.
+    """
+
+    def __init__(self, projects, devs, seed=0):
+        self.rng = random.Random(seed)
+        self.project_ids = [f"bench-{n}" for n in range(projects)]
+        self.profiles = {project_id: dev_profiles(devs, self.rng) for project_id in self.project_ids}
+        self.descriptions = {project_id: project_description(project_id, self.rng) for project_id in self.project_ids}
+
+    def seed(self, store):
+        for project_id in self.project_ids:
+            store.docs[f"projects/{project_id}"] = {"id": project_id, "status": "active"}
+            for dev in self.profiles[project_id]:
+                store.docs[f"projects/{project_id}/dev_profiles/{dev['id']}"] = dict(dev)
+
+    def initial_state(self, project_id):
+        return {
+            "project_id": project_id,
+            "project_description": self.descriptions[project_id],
+            "scrum_cycle": 0,
+            "done": False
+        }
+
+    def cycle_state(self, project_id, cycle):
+        """The state a scheduled cycle starts from, as `run_scheduler()` builds it."""
+        return {**self.initial_state(project_id), "scrum_cycle": cycle}
+
+    def open_tickets(self, store, project_id):
+        prefix = f"projects/{project_id}/tickets/"
+        by_dev = {}
+        for path, ticket in list(store.docs.items()):
+            if path.startswith(prefix) and ticket.get("status") in ("todo", "in_progress"):
+                by_dev.setdefault(ticket.get("assigned_dev_id"), []).append(ticket)
+        return by_dev
+
+    def progress(self, project_id, open_tickets, completion_rate=0.5):
+        """(ticket_id, new_status) moves for a cycle: open tickets advance with probability `completion_rate`."""
+        moves = []
+        for tickets in open_tickets.values():
+            for ticket in tickets:
+                if self.rng.random() < completion_rate:
+                    moves.append((ticket["id"], "completed" if ticket["status"] == "in_progress" else "in_progress"))
+        return moves
+
+    def standups(self, project_id, cycle, open_tickets=None):
+        return standups(cycle, self.profiles[project_id], self.rng, open_tickets)
@@ -1,7 +1,13 @@
+import os
 import uuid
 from agent.agenticworkflow import ScrumGraphBuilder
 from agentic.utils.firebase_client import get_firestore
+from agentic.utils.embedding import warmup_embedder
+from agentic.utils.cycle_scheduler import CycleScheduler
+from agentic.utils.firestore_batch import write_buffer, doc_set
+from agentic.utils.workload_aggregates import record_standup
 from agentic.tool.firebase_tool import get_project_tickets
+from agentic.logger.metrics import get_metrics, start_metrics_server
 import datetime
 
 # --- Project and Developer Setup ---
@@ -51,13 +57,17 @@ def insert_sample_standups(project_id, cycle, dev_profiles):
             "cycle": cycle,
             "text": f"Yesterday I worked on my assigned tickets. Today I will continue. No blockers.",
             "timestamp": datetime.datetime.now(datetime.timezone.utc),
+            "updated_at": datetime.datetime.now(datetime.timezone.utc),
             "status": "completed"
         }
         for dev in dev_profiles
     ]
-    for standup in standups:
-        doc_id = f"{standup['dev_id']}_cycle_{cycle}"
-        db.collection("projects").document(project_id).collection("standups").document(doc_id).set(standup)
+    # Standups and the developers' last-standup pointers go out in one batch
+    with write_buffer(db):
+        for standup in standups:
+            doc_id = f"{standup['dev_id']}_cycle_{cycle}"
+            doc_set(db.collection("projects").document(project_id).collection("standups").document(doc_id), standup)
+            record_standup(db, project_id, standup["dev_id"], cycle, doc_id, standup["timestamp"])
     print(f"Inserted {len(standups)} standups for cycle {cycle}.")
 
 # --- Main Workflow ---
@@ -108,8 +118,12 @@ Development Phases:
 7. Polish & deploy
 """
 
+    # Optionally load the embedding model up front instead of inside the first node
+    if os.getenv("EMBEDDING_WARMUP", "false").lower() in ("1", "true", "yes"):
+        print(f"Embedding model warmed up: {warmup_embedder()}")
+
     workflow = ScrumGraphBuilder()
-    graph = workflow()
+    workflow()  # builds and compiles the graph
     initial_state = {
         "project_id": project_id,
         "project_description": project_description,
@@ -124,14 +138,12 @@ Development Phases:
     state = initial_state
     for cycle in range(NUM_CYCLES):
         print(f"\n----- Starting cycle {cycle} -----")
-        if cycle == 0:
-            # First cycle: start from StoreProjectContext
-            state = graph.invoke(state)
-        else:
-            # Subsequent cycles: skip StoreProjectContext
-            state = graph.invoke({**state, "next_node": "GatherContext"})
+        # Up to the new tickets: cycle 0 onboards the project, later cycles take the
+        # cycle-only path (the previous run left next_node at GatherContext)
+        state = workflow.invoke({**state, "done": False, "stop_after": "GenerateTickets"})
         insert_sample_standups(project_id, cycle, dev_profiles)
-        state = graph.invoke({**state, "done": False})
+        # Then the same cycle continues at WaitForStandups, now that the standups are in
+        state = workflow.invoke({**state, "stop_after": None})
 
     # --- Print the summary for each cycle ---
     db = get_firestore()
@@ -145,5 +157,41 @@ Development Phases:
 
     print("\n✅ Workflow complete.\n")
 
+    # Optionally keep the run's node, tool, Firestore, embedding and LLM metrics
+    snapshot_path = os.getenv("METRICS_SNAPSHOT_PATH")
+    if snapshot_path:
+        with open(snapshot_path, "w") as f:
+            f.write(get_metrics().snapshot_json(indent=2))
+        print(f"📈 Metrics snapshot written to {snapshot_path}")
+
+# --- Scheduler mode: run cycles for every active project as they fall due ---
+def run_scheduler():
+    workflow = ScrumGraphBuilder()
+    workflow()  # builds and compiles the graph
+
+    def run_cycle(project_id, project):
+        print(f"\n⏰ Cycle {project['next_cycle']} due for project: {project_id}")
+        workflow.invoke({
+            "project_id": project_id,
+            "project_description": project.get("description") or project.get("summary", ""),
+            "scrum_cycle": project["next_cycle"],
+            "done": False
+        })
+
+    scheduler = CycleScheduler(run_cycle)
+    scheduler.watch()  # initial snapshot loads every active project; later changes reschedule them
+    print("🗓️  Scrum scheduler running (Ctrl+C to stop)")
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        scheduler.stop(wait=False)
+        print(f"Scheduler stopped: {scheduler.stats()}")
+
 if __name__ == "__main__":
-    main()
+    # Expose /metrics (Prometheus) and /metrics.json while the workflow runs
+    if os.getenv("METRICS_PORT"):
+        start_metrics_server(int(os.getenv("METRICS_PORT")))
+    if os.getenv("SCRUM_SCHEDULER", "false").lower() in ("1", "true", "yes"):
+        run_scheduler()
+    else:
+        main()
@@ -225,6 +225,536 @@ def test_imports():
     print("✅ All imports successful!")
     return True
 
+def test_scheduler_listener_update_mid_cycle():
+    """A listener update delivered while a cycle runs must not skip the next cycle"""
+
+    print("\n⏰ Testing Cycle Scheduler")
+    print("=" * 30)
+
+    import datetime
+    import threading
+    from agentic.utils.cycle_scheduler import CycleScheduler
+
+    cycles = []
+    config = {"status": "active", "scrum_cycle_duration_minutes": 0, "max_cycles": 4}
+
+    def dispatch(project_id, data):
+        cycles.append(data["next_cycle"])
+        # What the snapshot listener delivers once the cycle saves its project document
+        scheduler.update_project(project_id, dict(
+            config, current_cycle=data["next_cycle"], last_scrum_timestamp=datetime.datetime.now(datetime.timezone.utc)
+        ))
+
+    scheduler = CycleScheduler(dispatch, db=Mock(), max_workers=1)
+    scheduler.update_project("test-proj", dict(config))
+    runner = threading.Thread(target=scheduler.run, kwargs={"stop_after": 4}, daemon=True)
+    runner.start()
+    runner.join(timeout=10)
+    scheduler.stop()
+
+    assert not runner.is_alive(), "scheduler did not finish its cycles"
+    assert cycles == [0, 1, 2, 3], cycles
+    print("✓ Cycles dispatched in order:", cycles)
+    return True
+
+def test_standup_listener_initial_snapshot():
+    """With the default zero wait, the status reflects standups already stored when the listener starts"""
+
+    print("\n📝 Testing Standup Watcher")
+    print("=" * 30)
+
+    import asyncio
+    from benchmarks.fakes import FakeFirestore, FakeStore, seed_standups
+    from agentic.utils.standup_watcher import StandupWatcher
+
+    # The fake listener, like Firestore's, delivers its first snapshot later on its own thread
+    store = FakeStore(latency_s=0.05)
+    db = FakeFirestore(store)
+    seed_standups(store, "test-proj", 0, 2)
+    watcher = StandupWatcher(db=db, mode="listener")
+    dev_ids = ["dev0", "dev1", "dev2"]
+
+    standup_watch = watcher.watch("test-proj", 0, dev_ids)
+    status = standup_watch.wait(timeout=0)
+    assert status["submitted_devs"] == ["dev0", "dev1"], status
+    print("✓ Zero-timeout wait reports the initial snapshot")
+
+    # A later submission reaches the waiting cycle through the listener
+    db.collection("projects").document("test-proj").collection("standups").document("dev2_cycle_0").set(
+        {"dev_id": "dev2", "cycle": 0, "status": "completed"}
+    )
+    assert standup_watch.wait(timeout=5)["is_complete"]
+    watcher.release(standup_watch)
+    assert watcher.active_watches() == 0 and not store.listeners
+    print("✓ Listener delivers later standups and is removed on release")
+
+    async def await_status():
+        async_watch = watcher.watch("test-proj", 0, dev_ids + ["dev3"])
+        try:
+            return await async_watch.await_complete(timeout=0)
+        finally:
+            watcher.release(async_watch)
+
+    status = asyncio.run(await_status())
+    assert status["submitted_devs"] == dev_ids and status["missing_devs"] == ["dev3"], status
+    print("✓ await_complete() also waits for the initial snapshot")
+
+    # A standup without a dev_id counts for nobody
+    db.collection("projects").document("test-proj").collection("standups").document("draft_cycle_0").set(
+        {"cycle": 0, "status": "draft"}
+    )
+    standup_watch = watcher.watch("test-proj", 0, dev_ids)
+    assert None not in standup_watch.wait(timeout=0)["submitted_devs"]
+    watcher.release(standup_watch)
+    print("✓ Standups without a dev_id are ignored")
+
+    # A failed subscription leaves nothing registered, so the next watch subscribes again
+    with patch.object(watcher, "_subscribe", side_effect=RuntimeError("listen failed")):
+        try:
+            watcher.watch("test-proj", 1, dev_ids)
+            assert False, "watch() should re-raise the subscription error"
+        except RuntimeError:
+            pass
+    assert watcher.active_watches() == 0
+    standup_watch = watcher.watch("test-proj", 1, dev_ids)
+    assert standup_watch.wait(timeout=0)["submitted_devs"] == []
+    watcher.release(standup_watch)
+    assert watcher.active_watches() == 0 and not store.listeners
+    print("✓ A failed subscription is unregistered")
+    return True
+
+def test_concurrent_ticket_status_changes():
+    """Racing status changes on one ticket move the workload counters once per actual change"""
+
+    print("\n🎫 Testing Ticket Status Counters")
+    print("=" * 30)
+
+    import threading
+    from benchmarks.fakes import FakeFirestore, FakeStore
+    from agentic.tool.firebase_tool import update_ticket_status
+
+    store = FakeStore(latency_s=0.02)
+    db = FakeFirestore(store)
+    store.docs["projects/test-proj/tickets/t1"] = {
+        "id": "t1", "assigned_dev_id": "dev0", "status": "todo", "estimated_hours": 3
+    }
+    store.docs["projects/test-proj/dev_workloads/dev0"] = {
+        "dev_id": "dev0", "total_tickets": 1, "todo_tickets": 1, "in_progress_tickets": 0,
+        "completed_tickets": 0, "completed_hours": 0
+    }
+
+    statuses = ["in_progress", "completed", "in_progress", "completed", "completed"]
+    with patch('agentic.tool.firebase_tool.get_firestore', return_value=db):
+        threads = [
+            threading.Thread(target=update_ticket_status.invoke,
+                             args=({"project_id": "test-proj", "ticket_id": "t1", "status": status},))
+            for status in statuses
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    final = store.docs["projects/test-proj/tickets/t1"]["status"]
+    workload = store.docs["projects/test-proj/dev_workloads/dev0"]
+    counts = {status: workload[f"{status}_tickets"] for status in ("todo", "in_progress", "completed")}
+    assert counts == {status: int(status == final) for status in counts}, (final, counts)
+    assert workload["completed_hours"] == (3 if final == "completed" else 0), workload
+    print("✓ Counters match the final status:", counts)
+    return True
+
+def test_ticket_stream_parser_chunking():
+    """The ticket stream parser yields the same tickets however the response is split, and the complete ones of a cut-off response"""
+
+    print("\n📡 Testing Ticket Stream Parser")
+    print("=" * 30)
+
+    import json
+    from agentic.utils.json_stream import TicketStreamParser
+
+    tickets = {
+        "dev1": [{"title": 'Fix {braces} in "quoted" text', "estimated_hours": 3},
+                 {"title": "Nested", "tags": [{"a": 1}], "estimated_hours": 5}],
+        'dev "2"': [{"title": "Escaped key", "estimated_hours": 1}]
+    }
+    response = "Here are the tickets:\n```json\n" + json.dumps(tickets, indent=2) + "\n```"
+    expected = [(dev_id, ticket) for dev_id, dev_tickets in tickets.items() for ticket in dev_tickets]
+
+    for size in (1, 2, 3, 7, 64, len(response)):
+        parser = TicketStreamParser()
+        parsed = [pair for start in range(0, len(response), size) for pair in parser.feed(response[start:start + size])]
+        assert parsed == expected, (size, parsed)
+        assert parser.dev_ids == list(tickets) and parser.errors == 0
+    print("✓ Same tickets for chunk sizes 1 to the whole response")
+
+    cut = response.index("Escaped key")
+    parser = TicketStreamParser()
+    parsed = parser.feed(response[:cut]) + parser.feed("")
+    assert parsed == expected[:2], parsed
+    print("✓ A cut-off response yields its complete tickets")
+    return True
+
+def test_pack_sections_within_budget():
+    """Packed prompt sections stay within the token budget, cutting the least important section first"""
+
+    print("\n📦 Testing Prompt Packing")
+    print("=" * 30)
+
+    from agentic.utils.prompt_packer import count_tokens, pack_sections
+
+    fixed_text = "Summarize the scrum cycle for the team.\n"
+    sections = [
+        {"name": "standups", "priority": 3, "text": "\n".join(f"dev{n}: finished ticket {n}, no blockers" for n in range(40))},
+        {"name": "tickets", "priority": 2, "text": "\n".join(f"ticket {n}: todo, 5h" for n in range(200))},
+        {"name": "history", "priority": 1, "text": "\n".join(f"cycle {n}: steady progress" for n in range(300))}
+    ]
+    total = count_tokens(fixed_text) + sum(count_tokens(s["text"]) for s in sections)
+
+    for budget in (total, total // 2, count_tokens(sections[0]["text"]) + 200):
+        packed, report = pack_sections(sections, fixed_text=fixed_text, budget=budget)
+        used = count_tokens(fixed_text) + sum(count_tokens(text) for text in packed.values())
+        assert used == report["used_tokens"] <= report["budget"] <= budget, (budget, report)
+        assert packed["standups"] == sections[0]["text"], report
+        print(f"✓ Budget {budget}: used {used}, dropped {report['dropped_by_section']}")
+
+    packed, report = pack_sections(sections, fixed_text=fixed_text, budget=total // 2)
+    assert "tickets" not in report["dropped_by_section"] and "history" in report["dropped_by_section"], report
+    return True
+
+def test_write_buffer_merges_writes():
+    """The write buffer merges writes per document: Increments add up, and set/update combine into one operation"""
+
+    print("\n🧮 Testing Write Buffer")
+    print("=" * 30)
+
+    from google.cloud.firestore_v1.transforms import Increment
+    from benchmarks.fakes import FakeFirestore, FakeStore
+    from agentic.utils.firestore_batch import doc_set, doc_update, write_buffer
+
+    store = FakeStore()
+    db = FakeFirestore(store)
+    store.docs["projects/p/dev_workloads/dev0"] = {"todo_tickets": 2, "completed_tickets": 1}
+    workload = db.document("projects/p/dev_workloads/dev0")
+    project = db.document("projects/p")
+    ticket = db.document("projects/p/tickets/t1")
+
+    with write_buffer(db) as writes:
+        doc_update(workload, {"todo_tickets": Increment(-1), "completed_tickets": Increment(1)})
+        doc_set(workload, {"todo_tickets": Increment(-1), "updated_at": "later"}, merge=True)
+        doc_update(project, {"summary": "first"})
+        doc_set(project, {"current_cycle": 3}, merge=True)
+        doc_update(project, {"summary": "second"})
+        doc_set(ticket, {"status": "todo", "title": "old"})
+        doc_set(ticket, {"status": "in_progress"})
+
+    assert store.docs["projects/p/dev_workloads/dev0"] == {"todo_tickets": 0, "completed_tickets": 2, "updated_at": "later"}
+    assert store.docs["projects/p"] == {"summary": "second", "current_cycle": 3}
+    assert store.docs["projects/p/tickets/t1"] == {"status": "in_progress"}
+    stats = writes.stats()
+    assert (stats["requested_ops"], stats["committed_ops"], stats["saved_ops"], stats["batches"]) == (7, 3, 4, 1), stats
+    print("✓ 7 writes committed as 3 operations in 1 batch:", store.docs["projects/p"])
+    return True
+
+def test_local_vector_store_round_trip():
+    """The local vector store answers queries in every dtype, and a flushed namespace reloads with the same results"""
+
+    print("\n🧭 Testing Local Vector Store")
+    print("=" * 30)
+
+    import tempfile
+    import numpy as np
+    from agentic.utils.vector_store import LocalVectorStore
+
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(50, 32))
+    vectors = [{"id": f"v{i}", "values": row.tolist(), "metadata": {"team": "a" if i % 2 else "b"}} for i, row in enumerate(values)]
+    namespace = "../proj/1"
+
+    for dtype in ("float32", "float16", "int8"):
+        directory = tempfile.mkdtemp(prefix="scrum-test-vectors-")
+        store = LocalVectorStore(directory=directory, dtype=dtype)
+        store.upsert(vectors, namespace=namespace)
+        store.upsert([{"id": "v0", "values": values[1].tolist(), "metadata": {"team": "b"}}], namespace=namespace)
+        store.delete(["v2"], namespace=namespace)
+        assert os.listdir(directory) == [], "writes are persisted by flush(), not by each upsert"
+
+        matches = store.query(values[3], top_k=3, namespace=namespace)
+        assert matches[0]["id"] == "v3" and abs(matches[0]["score"] - 1) < 0.02, (dtype, matches)
+        assert {m["id"] for m in store.query(values[1], top_k=2, namespace=namespace)} == {"v0", "v1"}
+        assert "v2" not in {m["id"] for m in store.query(values[2], top_k=50, namespace=namespace)}
+        assert all(m["metadata"]["team"] == "a" for m in store.query(values[4], namespace=namespace, filter={"team": "a"}))
+
+        store.flush()
+        # The "../" in the namespace does not lead the file out of the store's directory
+        assert len(os.listdir(directory)) == 1 and not os.path.exists(os.path.join(directory, "..", "proj"))
+        reloaded = LocalVectorStore(directory=directory, dtype=dtype)
+        assert reloaded.query(values[3], top_k=5, namespace=namespace) == store.query(values[3], top_k=5, namespace=namespace)
+        assert reloaded.query(values[3], namespace="other") == []
+        print(f"✓ {dtype}: top match score {matches[0]['score']:.4f}, reloaded from {os.listdir(directory)[0]}")
+    return True
+
+def test_embedding_cache_hits_and_key_isolation():
+    """The embedding cache hits only for the same model, normalization and text, and reloads its index from disk"""
+
+    print("\n💾 Testing Embedding Cache")
+    print("=" * 30)
+
+    import tempfile
+    import numpy as np
+    from agentic.utils.embedding_cache import EmbeddingCache
+
+    directory = tempfile.mkdtemp(prefix="scrum-test-embeddings-")
+    cache = EmbeddingCache(cache_dir=directory, max_entries=4)
+    texts = ["alpha", "beta", "gamma"]
+    vectors = np.arange(12, dtype=np.float32).reshape(3, 4)
+    cache.put_many("model-a", texts, vectors)
+
+    found, missing = cache.get_many("model-a", texts + ["delta"])
+    assert missing == [3] and all(np.array_equal(found[i], vectors[i]) for i in range(3)), (found, missing)
+    assert cache.get_many("model-b", texts)[1] == [0, 1, 2]
+    assert cache.get_many("model-a", texts, normalize=True)[1] == [0, 1, 2]
+    assert (cache.hits, cache.misses) == (3, 7), cache.stats()
+    print("✓ Hits for the same key; other models and normalization miss")
+
+    # Two more entries than fit: the least recently used ("alpha", "beta") are evicted
+    cache.get_many("model-a", ["gamma"])
+    cache.put_many("model-a", ["delta", "epsilon", "zeta"], vectors + 100)
+    reopened = EmbeddingCache(cache_dir=directory, max_entries=4)
+    found, missing = reopened.get_many("model-a", texts + ["delta", "epsilon", "zeta"])
+    assert missing == [0, 1], missing
+    assert np.array_equal(found[2], vectors[2]) and all(np.array_equal(found[3 + i], vectors[i] + 100) for i in range(3))
+    print("✓ Evictions and vectors survive a reload:", reopened.stats()["entries"], "entries")
+    return True
+
+def test_plan_reindex_diffs_sharded_manifest():
+    """Reindexing embeds only added chunks, deletes removed ones, and keeps the manifest's ids in shards"""
+
+    print("\n🗃️ Testing Vector Reindex")
+    print("=" * 30)
+
+    import tempfile
+    import numpy as np
+    from langchain_core.documents import Document
+    from benchmarks.fakes import FakeFirestore, FakeStore
+    from agentic.utils.vector_index import load_manifest, plan_reindex, reindex_project
+    from agentic.utils.vector_store import LocalVectorStore
+
+    db = FakeFirestore(FakeStore())
+    store = LocalVectorStore(directory=tempfile.mkdtemp(prefix="scrum-test-reindex-"))
+    embedded = []
+
+    def embed(docs):
+        embedded.extend(doc.page_content for doc in docs)
+        return np.ones((len(docs), 8), dtype=np.float32)
+
+    def chunks(*texts):
+        return [Document(page_content=text, metadata={"section": "spec"}) for text in texts]
+
+    with patch('agentic.utils.vector_index.MANIFEST_SHARD_SIZE', 2):
+        report = reindex_project(db, "proj", chunks("a", "b", "c", "d", "e"), store, embed, "model-1")
+        manifest = load_manifest(db, "proj")
+        assert (report["added"], manifest["shards"], len(manifest["ids"])) == (5, 3, 5), (report, manifest)
+
+        plan = plan_reindex(manifest, "proj", chunks("e", "a", "c", "f", "d"), "model-1")
+        assert [doc.page_content for _, doc in plan["added"]] == ["f"] and plan["unchanged"] == 4
+        assert plan["removed"] == [manifest["ids"][1]] and not plan["rebuild"]
+        print("✓ Edited description: 1 added, 1 removed, 4 unchanged")
+
+        rebuild = plan_reindex(manifest, "proj", chunks("a", "b"), "model-2")
+        assert rebuild["rebuild"] and len(rebuild["added"]) == 2 and len(rebuild["removed"]) == 3
+
+        embedded.clear()
+        report = reindex_project(db, "proj", chunks("a"), store, embed, "model-1")
+        assert embedded == [] and report["removed"] == 4
+        manifest = load_manifest(db, "proj")
+        assert manifest["shards"] == 1 and manifest["ids"] == plan["ids"][1:2], manifest
+        assert db.document("projects/proj/vector_index/manifest_2").get().to_dict() == {"ids": []}
+        print("✓ Shrunk manifest rewrites its shards:", manifest["ids"])
+    return True
+
+def test_iter_chunks_covers_old_splitter_output():
+    """Chunks keep every sentence the old sentence splitter produced, within the token window and their section"""
+
+    print("\n✂️ Testing Markdown Chunker")
+    print("=" * 30)
+
+    import re
+    import tempfile
+    from agentic.utils.prompt_packer import count_tokens
+    from agentic.utils.text_splitter import chunk_file, chunk_text, split_project_markdown
+
+    text = "\n".join([
+        "# Inventory Service",
+        "Tracks stock for every warehouse. Each update is audited! Who reads it?",
+        "",
+        "## API",
+        "- GET /items returns the catalogue.",
+        "- POST /items adds an item.",
+        "",
+        "```python",
+        "def reserve(item_id, qty):",
+        "    return stock[item_id] >= qty",
+        "```",
+        "",
+        "## Roadmap",
+        " ".join(f"Milestone {n} ships feature {n} to the pilot customers." for n in range(60))
+    ])
+    # The splitter this chunker replaced: one document per sentence
+    old_sentences = [s for s in re.split(r"(?<=[.!?])\s+", text.strip()) if s.strip()]
+
+    chunks = split_project_markdown(text)
+    joined = "\n".join(chunk.page_content for chunk in chunks)
+    for sentence in old_sentences:
+        for piece in sentence.splitlines():
+            assert piece.strip() in joined, piece
+    assert len(chunks) < len(old_sentences), (len(chunks), len(old_sentences))
+    assert all(count_tokens(chunk.page_content) <= 200 for chunk in chunks)
+    roadmap = [chunk for chunk in chunks if chunk.metadata["section"] == "Inventory Service > Roadmap"]
+    assert len(roadmap) > 1 and all("Milestone" in chunk.page_content for chunk in roadmap)
+    assert any("code" in chunk.metadata["block_types"] for chunk in chunks)
+    print(f"✓ {len(old_sentences)} sentences kept in {len(chunks)} chunks")
+
+    with tempfile.NamedTemporaryFile("w", suffix=".md", delete=False) as f:
+        f.write(text)
+    streamed = list(chunk_file(f.name))
+    os.remove(f.name)
+    assert [c.page_content for c in streamed] == [c.page_content for c in chunk_text(text)]
+    assert all(c.metadata["source"] == f.name for c in streamed)
+    print("✓ Streaming a file gives the same chunks as the string")
+    return True
+
+def test_solve_assignment_respects_capacity():
+    """Ticket assignment keeps every developer within their hour capacity and explains each choice as it was made"""
+
+    print("\n⚖️ Testing Ticket Assignment")
+    print("=" * 30)
+
+    import re
+    from agentic.utils.assignment import solve_assignment
+
+    developers = [
+        {"id": "alice", "tech": ["Python", "FastAPI"]},
+        {"id": "bob", "tech": ["React"]},
+        {"id": "carol", "tech": ["python"]}
+    ]
+    workloads = {
+        "alice": {"todo_tickets": 1, "total_estimated_hours": 30, "completed_hours": 0},
+        "carol": {"todo_tickets": 0, "total_estimated_hours": 36, "completed_hours": 0}
+    }
+    tickets = [{"title": f"API {n}", "tech_requirements": ["python"], "estimated_hours": 6} for n in range(6)]
+    tickets += [{"title": "UI", "tech_requirements": ["react"], "estimated_hours": 12},
+                {"title": "Migration", "estimated_hours": 50}]
+
+    assignments, stats = solve_assignment(tickets, developers, workloads, capacity_hours=40)
+    assert [a["ticket"] for a in assignments] == tickets
+    load = {"alice": 30.0, "bob": 0.0, "carol": 36.0}
+    for assignment in assignments:
+        if assignment["assigned_dev_id"]:
+            load[assignment["assigned_dev_id"]] += assignment["ticket"]["estimated_hours"]
+    assert all(hours <= 40 for hours in load.values()), load
+    assert assignments[6]["assigned_dev_id"] == "bob" and assignments[7]["assigned_dev_id"] is None
+    assert stats["assigned"] + stats["unassigned"] == len(tickets) and stats["unassigned"] >= 1
+    print(f"✓ {stats['assigned']}/{stats['tickets']} assigned, loads {load} within 40h")
+
+    # Each reasoning reports the batch load its developer had when that ticket was placed
+    reported = {}
+    for assignment in assignments:
+        dev_id = assignment["assigned_dev_id"]
+        if dev_id:
+            reported.setdefault(dev_id, []).append(int(re.search(r"(\d+) already assigned", assignment["reasoning"]).group(1)))
+    assert all(sorted(values) == list(range(len(values))) for values in reported.values()), reported
+    print("✓ Per-ticket batch counts:", reported)
+    return True
+
+def test_llm_cache_hits_and_misses():
+    """The LLM cache serves repeated prompts without a model call, and misses for other models, temperatures and bypasses"""
+
+    print("\n🧠 Testing LLM Cache")
+    print("=" * 30)
+
+    import tempfile
+    from benchmarks.fakes import FakeChatModel
+    from agentic.utils.llm_cache import CachedChatModel, LLMResponseCache
+
+    cache = LLMResponseCache(path=os.path.join(tempfile.mkdtemp(prefix="scrum-test-llm-"), "cache.sqlite"), max_entries=2)
+    model = FakeChatModel()
+    llm = CachedChatModel(model, "model-a", 0.2, cache=cache)
+
+    first = llm.invoke("Summarize   the cycle.\n")
+    again = llm.invoke("Summarize the cycle.")
+    assert model.calls == 1 and again.content == first.content and again.response_metadata["cache_hit"]
+    streamed = "".join(chunk.content for chunk in llm.stream("Summarize the cycle."))
+    assert model.calls == 1 and streamed == first.content
+    print("✓ Re-indented prompt and stream served from the cache")
+
+    CachedChatModel(model, "model-b", 0.2, cache=cache).invoke("Summarize the cycle.")
+    CachedChatModel(model, "model-a", 0.7, cache=cache).invoke("Summarize the cycle.")
+    llm.invoke("Summarize the cycle.", bypass_cache=True)
+    assert model.calls == 4, model.calls
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["bypasses"], stats["entries"]) == (2, 3, 1, 2), stats
+    print("✓ Other model, temperature and bypass miss:", stats)
+    return True
+
+def test_project_view_reads_late_and_deleted_tickets():
+    """The project view picks up tickets stamped in the past (migrations) and drops tombstoned ones"""
+
+    print("\n🗂️ Testing Project View Deltas")
+    print("=" * 30)
+
+    import datetime
+    from benchmarks.fakes import FakeFirestore, FakeStore
+    from agentic.utils.project_view import ProjectView
+    from agentic.utils.ticket_store import delete_ticket, migrate_dev_tickets
+
+    store = FakeStore()
+    db = FakeFirestore(store)
+    long_ago = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    store.docs["projects/test-proj/dev_profiles/dev0"] = {"id": "dev0"}
+    store.docs["projects/test-proj/tickets/t1"] = {
+        "id": "t1", "assigned_dev_id": "dev0", "status": "todo", "estimated_hours": 3, "updated_at": long_ago
+    }
+    view = ProjectView("test-proj")
+    assert [t["id"] for t in view.tickets(db, open_only=True)] == ["t1"]
+
+    # A legacy ticket created long before the view's watermark
+    store.docs["projects/test-proj/dev_profiles/dev0/tickets/t2"] = {
+        "id": "t2", "status": "in_progress", "estimated_hours": 5, "created_at": long_ago
+    }
+    migrate_dev_tickets("test-proj", db)
+    assert sorted(t["id"] for t in view.tickets(db, open_only=True)) == ["t1", "t2"]
+    print("✓ Migrated ticket seen by the delta read")
+
+    assert delete_ticket(db, "test-proj", "t1")
+    assert not delete_ticket(db, "test-proj", "t1")
+    assert [t["id"] for t in view.tickets(db, open_only=True)] == ["t2"]
+    assert [t["id"] for t in ProjectView("test-proj").tickets(db, open_only=True)] == ["t2"]
+    workload = store.docs["projects/test-proj/dev_workloads/dev0"]
+    assert (workload["total_tickets"], workload["todo_tickets"], workload["in_progress_tickets"]) == (1, 0, 1), workload
+    print("✓ Tombstoned ticket dropped from the view and the counters")
+    return True
+
+def test_digest_keeps_blockers_and_next_steps():
+    """A long cycle summary's digest keeps the late blocker and next-step sections, not just its start"""
+
+    print("\n🗜️ Testing Cycle Digest")
+    print("=" * 30)
+
+    from agentic.utils.rolling_summary import make_digest
+
+    summary = (
+        "## Overall progress\n" + "Work continued on every open ticket. " * 40 +
+        "\n## Blockers and issues\n- The payment sandbox is down.\n"
+        "## Next steps and priorities\n1. Finish checkout.\n"
+        "## Team velocity insights\nVelocity was 24 points."
+    )
+    digest = make_digest(summary, max_chars=400)
+    assert len(digest) <= 400, len(digest)
+    for kept in ("The payment sandbox is down.", "Finish checkout.", "Velocity was 24 points."):
+        assert kept in digest, digest
+    print("✓ Digest keeps blockers, next steps and the newest section")
+    return True
+
 def main():
     """Run all tests"""
     
@@ -235,7 +765,21 @@ def main():
         ("Module Imports", test_imports),
         ("Workflow Components", test_workflow_components),
         ("Tool Functions", test_tools),
-        ("Utility Functions", test_utilities)
+        ("Utility Functions", test_utilities),
+        ("Cycle Scheduler", test_scheduler_listener_update_mid_cycle),
+        ("Standup Watcher", test_standup_listener_initial_snapshot),
+        ("Ticket Status Counters", test_concurrent_ticket_status_changes),
+        ("Ticket Stream Parser", test_ticket_stream_parser_chunking),
+        ("Prompt Packing", test_pack_sections_within_budget),
+        ("Write Buffer", test_write_buffer_merges_writes),
+        ("Local Vector Store", test_local_vector_store_round_trip),
+        ("Embedding Cache", test_embedding_cache_hits_and_key_isolation),
+        ("Vector Reindex", test_plan_reindex_diffs_sharded_manifest),
+        ("Markdown Chunker", test_iter_chunks_covers_old_splitter_output),
+        ("Ticket Assignment", test_solve_assignment_respects_capacity),
+        ("LLM Cache", test_llm_cache_hits_and_misses),
+        ("Project View Deltas", test_project_view_reads_late_and_deleted_tickets),
+        ("Cycle Digest", test_digest_keeps_blockers_and_next_steps)
     ]
     
     passed = 0